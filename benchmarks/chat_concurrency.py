@@ -0,0 +1,81 @@
+"""
+Concurrency benchmark for the /chat execution path.
+
+Compares N clients served by the old blocking call (send_message inside the event loop)
+against the aio path (send_message_async) on a local fake endpoint.
+
+Usage: python -m benchmarks.chat_concurrency --clients 20 --latency 0.2
+"""
+
+import time
+import asyncio
+import argparse
+
+from azure.ai.inference import ChatCompletionsClient
+from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+from azure.core.credentials import AzureKeyCredential
+
+from core.llm import AzureNovaSession, function_to_schema
+from benchmarks.fake_endpoint import start_fake_endpoint
+
+
+def bench_tool():
+    """Simulated blocking skill."""
+    time.sleep(0.05)
+    return "ok"
+
+
+def make_sessions(client, async_client, count: int):
+    tools = [bench_tool]
+    tools_map = {f.__name__: f for f in tools}
+    tool_definitions = [function_to_schema(f) for f in tools]
+    return [
+        AzureNovaSession(client, "fake-model", tools_map, tool_definitions, async_client=async_client)
+        for _ in range(count)
+    ]
+
+
+async def run_blocking(sessions):
+    async def handle(session):
+        # Mirrors the previous chat_endpoint: sync call on the event loop.
+        return session.send_message("run the tool")
+    return await asyncio.gather(*(handle(s) for s in sessions))
+
+
+async def run_async(sessions):
+    return await asyncio.gather(*(s.send_message_async("run the tool") for s in sessions))
+
+
+async def main(clients: int, latency: float):
+    server, endpoint = start_fake_endpoint(latency=latency, tool_name="bench_tool")
+    client = ChatCompletionsClient(endpoint=endpoint, credential=AzureKeyCredential("fake"))
+    async_client = AsyncChatCompletionsClient(endpoint=endpoint, credential=AzureKeyCredential("fake"))
+
+    try:
+        start = time.perf_counter()
+        await run_blocking(make_sessions(client, async_client, clients))
+        blocking = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await run_async(make_sessions(client, async_client, clients))
+        non_blocking = time.perf_counter() - start
+    finally:
+        client.close()
+        await async_client.close()
+        server.shutdown()
+
+    print("---------------------------------------")
+    print("   /chat CONCURRENCY BENCHMARK         ")
+    print("---------------------------------------")
+    print(f"   Clients: {clients}  |  Endpoint latency: {latency:.3f}s  |  2 LLM calls + 1 tool per request")
+    print(f"   Blocking : {blocking:7.3f}s  ({clients / blocking:6.2f} req/s)")
+    print(f"   Async    : {non_blocking:7.3f}s  ({clients / non_blocking:6.2f} req/s)")
+    print(f"   Speedup  : {blocking / non_blocking:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark blocking vs async /chat execution.")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.latency))
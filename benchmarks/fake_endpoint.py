@@ -0,0 +1,315 @@
+"""
+Local stand-in for an Azure AI inference deployment (and for any OpenAI-compatible server:
+the request path is ignored).
+
+Answers /chat/completions after a sampled delay so benchmarks can run without Azure quota.
+Requests with "stream": true are answered as server-sent events, word by word.
+
+Behaviour is configured with a FakeConfig:
+  * latency: fixed, uniform, normal or lognormal, from a seeded RNG so runs are repeatable
+  * scripts: regex on the last user message -> the exact assistant turns to play back
+    (tool calls, then a final answer)
+  * faults: a share of requests answered 429 + Retry-After, or left hanging until the client times out
+  * prompt caching: usage reports cached_tokens for the prefix shared with a recent request
+    (tools, then messages; 1024-token minimum, 128-token blocks, like the hosted services)
+
+Run standalone to point a real backend at it:
+    python -m benchmarks.fake_endpoint --port 8001 --latency lognormal:0.4:0.5 --rate-429 0.05 --script benchmarks/load_script.json
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import os.path
+import argparse
+import threading
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_ids = itertools.count(1)
+
+
+@dataclass
+class LatencyModel:
+    """Per-request delay in seconds. `spread` is the half-width (uniform), stddev (normal) or sigma (lognormal)."""
+    distribution: str = "fixed"
+    mean: float = 0.2
+    spread: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """'0.2', 'uniform:0.2:0.1', 'normal:0.4:0.1' or 'lognormal:0.4:0.5'."""
+        parts = spec.split(":")
+        if len(parts) == 1:
+            return cls("fixed", float(parts[0]))
+        return cls(parts[0], float(parts[1]), float(parts[2]) if len(parts) > 2 else 0.0)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(self.mean - self.spread, self.mean + self.spread))
+        if self.distribution == "normal":
+            return max(0.0, rng.gauss(self.mean, self.spread))
+        if self.distribution == "lognormal":
+            # mean is the median; a long right tail like real inference latency
+            return self.mean * rng.lognormvariate(0.0, self.spread)
+        return self.mean
+
+
+@dataclass
+class ScriptRule:
+    """When `match` finds the last user message, play `turns` in order (one per LLM call of that message)."""
+    match: str
+    turns: List[Dict[str, Any]]
+
+    def __post_init__(self):
+        self._pattern = re.compile(self.match, re.IGNORECASE)
+
+    def turn_for(self, user_text: str, turn: int) -> Optional[Dict[str, Any]]:
+        if not self._pattern.search(user_text or ""):
+            return None
+        return self.turns[min(turn, len(self.turns) - 1)]
+
+
+@dataclass
+class FakeConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    tool_name: Optional[str] = None
+    tool_arguments: str = "{}"
+    scripts: List[ScriptRule] = field(default_factory=list)
+    rate_429: float = 0.0
+    retry_after: float = 1.0
+    timeout_rate: float = 0.0
+    hang_seconds: float = 60.0
+    seed: int = 0
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._prompts = deque(maxlen=32)
+        self.stats = {"requests": 0, "throttled": 0, "hung": 0, "scripted": 0, "prompt_tokens": 0, "cached_tokens": 0}
+
+    def draw(self):
+        """(delay, fault) for the next request; one lock so concurrent requests stay deterministic in arrival order."""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+            delay = self.latency.sample(self._rng)
+            if roll < self.rate_429:
+                self.stats["throttled"] += 1
+                return delay, "429"
+            if roll < self.rate_429 + self.timeout_rate:
+                self.stats["hung"] += 1
+                return self.hang_seconds, "hang"
+            return delay, None
+
+    def usage(self, body: dict) -> dict:
+        """Token usage of a request, with the provider-style prompt cache applied."""
+        prompt = json.dumps(body.get("tools") or []) + json.dumps(body.get("messages") or [])
+        with self._lock:
+            shared = max((len(os.path.commonprefix([prompt, seen])) for seen in self._prompts), default=0)
+            self._prompts.append(prompt)
+            prompt_tokens = max(1, len(prompt) // 4)
+            cached = shared // 4 // 128 * 128 if shared // 4 >= 1024 else 0
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["cached_tokens"] += cached
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": 5, "total_tokens": prompt_tokens + 5,
+                "prompt_tokens_details": {"cached_tokens": cached}}
+
+    def count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    @classmethod
+    def load_scripts(cls, path: str) -> List[ScriptRule]:
+        with open(path, "r", encoding="utf-8") as f:
+            return [ScriptRule(rule["match"], rule["turns"]) for rule in json.load(f)]
+
+
+def _completion(message: dict, finish_reason: str) -> dict:
+    return {
+        "id": f"fake-{next(_ids)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "fake-model",
+        "choices": [{"index": 0, "finish_reason": finish_reason, "message": message}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def _tool_call_message(calls: List[Dict[str, Any]]) -> dict:
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{
+            "id": f"call_{next(_ids)}",
+            "type": "function",
+            "function": {
+                "name": call["name"],
+                "arguments": call["arguments"] if isinstance(call.get("arguments"), str) else json.dumps(call.get("arguments", {})),
+            },
+        } for call in calls],
+    }
+
+
+class FakeInferenceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real service
+    config = FakeConfig()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        config = self.config
+
+        delay, fault = config.draw()
+        time.sleep(delay)
+
+        if fault == "429":
+            self._send_json(429, {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                            {"Retry-After": f"{config.retry_after:g}"})
+            return
+        if fault == "hang":
+            self.close_connection = True
+            return
+
+        payload = self._reply(body)
+        payload["usage"] = config.usage(body)
+        if body.get("stream"):
+            self._send_stream(payload)
+            return
+        self._send_json(200, payload)
+
+    def _reply(self, body: dict) -> dict:
+        config = self.config
+        messages = body.get("messages", [])
+        last_role = messages[-1]["role"] if messages else "user"
+
+        user_index = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        user_text = messages[user_index].get("content") if user_index >= 0 else ""
+        turn = sum(1 for m in messages[user_index + 1:] if m.get("role") == "assistant")
+
+        for rule in config.scripts:
+            scripted = rule.turn_for(user_text if isinstance(user_text, str) else "", turn)
+            if scripted is not None:
+                config.count("scripted")
+                if scripted.get("tool_calls") and body.get("tools"):
+                    return _completion(_tool_call_message(scripted["tool_calls"]), "tool_calls")
+                return _completion({"role": "assistant", "content": scripted.get("content", "Done.")}, "stop")
+
+        if config.tool_name and body.get("tools") and last_role == "user":
+            return _completion(_tool_call_message([{"name": config.tool_name, "arguments": config.tool_arguments}]), "tool_calls")
+        return _completion({"role": "assistant", "content": "Done."}, "stop")
+
+    def _send_json(self, status: int, payload: dict, headers: Dict[str, str] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_HEAD(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_stream(self, payload: dict):
+        choice = payload["choices"][0]
+        message = choice["message"]
+        deltas = [{"role": "assistant"}]
+
+        if message.get("content"):
+            for word in message["content"].split(" "):
+                deltas.append({"content": word + " "})
+        for index, call in enumerate(message.get("tool_calls") or []):
+            arguments = call["function"]["arguments"]
+            deltas.append({"tool_calls": [{"index": index, "id": call["id"], "type": "function",
+                                           "function": {"name": call["function"]["name"], "arguments": ""}}]})
+            for start in range(0, len(arguments), 4):
+                deltas.append({"tool_calls": [{"index": index, "function": {"arguments": arguments[start:start + 4]}}]})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for position, delta in enumerate(deltas):
+            finish_reason = choice["finish_reason"] if position == len(deltas) - 1 else None
+            chunk = {"id": payload["id"], "created": payload["created"], "model": payload["model"],
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeInferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def handle_error(self, request, client_address):
+        # Clients hang up mid-response on purpose (hedged or cancelled calls).
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def start_fake_endpoint(latency=0.2, tool_name: str = None, port: int = 0, config: FakeConfig = None):
+    """
+    Starts the fake server on a daemon thread and returns (server, base_url).
+    `latency` may be seconds or a LatencyModel; pass a full FakeConfig for scripts and faults.
+    The server's FakeConfig (with live stats) is available as server.RequestHandlerClass.config.
+    """
+    if config is None:
+        model = latency if isinstance(latency, LatencyModel) else LatencyModel("fixed", latency)
+        config = FakeConfig(latency=model, tool_name=tool_name)
+    handler = type("Handler", (FakeInferenceHandler,), {"config": config})
+    server = FakeInferenceServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", default="0.2", help="'0.2', 'uniform:0.2:0.1', 'normal:0.4:0.1' or 'lognormal:0.4:0.5'")
+    parser.add_argument("--tool", default=None, help="Tool to call on every user turn when no script matches")
+    parser.add_argument("--script", default=None, help="JSON list of {match, turns} rules")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests answered 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of requests left hanging")
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_arguments(args) -> FakeConfig:
+    return FakeConfig(
+        latency=LatencyModel.parse(args.latency),
+        tool_name=args.tool,
+        scripts=FakeConfig.load_scripts(args.script) if args.script else [],
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Azure AI inference endpoint.")
+    parser.add_argument("--port", type=int, default=8001)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server, url = start_fake_endpoint(port=args.port, config=config_from_arguments(args))
+    print(f"Fake inference endpoint listening on {url} (set AZURE_INFERENCE_ENDPOINT={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark for request body serialization as the session history grows.
+
+"SDK" is what ChatCompletionsClient does with a plain message list: every message is converted and
+JSON-encoded on every call. "Cached" is the session path (core/encoding.py): each call encodes only
+the messages added since the previous one and joins the cached fragments.
+
+For each history size the history first grows to N messages, then `--calls` more turns are timed,
+each appending a user message and encoding the request, as a session does.
+
+Usage: python -m benchmarks.history_encoding --sizes 100 1000 10000
+"""
+
+import json
+import time
+import argparse
+
+from azure.ai.inference._model_base import SdkJSONEncoder
+from azure.ai.inference.models import (SystemMessage, UserMessage, AssistantMessage, ToolMessage,
+                                       ChatCompletionsToolCall, FunctionCall)
+
+from core.llm import SYSTEM_INSTRUCTION
+from core.encoding import FragmentCache, EncodedMessages, encode_body
+
+
+def turn(i: int):
+    """One tool-using exchange: 4 messages."""
+    call = ChatCompletionsToolCall(id=f"call_{i}", function=FunctionCall(name="get_weather", arguments=json.dumps({"city": f"City {i}"})))
+    return [
+        UserMessage(content=f"What's the weather like in City {i} today?"),
+        AssistantMessage(tool_calls=[call]),
+        ToolMessage(tool_call_id=call.id, content=f"City {i}: 21°C, light rain, humidity 70%, wind 12 km/h from the west."),
+        AssistantMessage(content=f"It's 21 degrees with light rain in City {i}."),
+    ]
+
+
+def build_history(size: int):
+    history = [SystemMessage(content=SYSTEM_INSTRUCTION)]
+    i = 0
+    while len(history) < size:
+        history.extend(turn(i))
+        i += 1
+    return history[:size]
+
+
+def sdk_body(history) -> bytes:
+    # Same call the SDK makes for complete(messages=..., model=...)
+    return json.dumps({"messages": history, "model": "gpt-4o"}, cls=SdkJSONEncoder, exclude_readonly=True).encode("utf-8")
+
+
+def cached_body(history, cache) -> bytes:
+    return encode_body(EncodedMessages(history, cache), model="gpt-4o")
+
+
+def measure(size: int, calls: int):
+    sdk_history = build_history(size)
+    cached_history = list(sdk_history)
+    cache = FragmentCache()
+    cached_body(cached_history, cache)  # the calls that grew the history already encoded it
+
+    assert json.loads(sdk_body(sdk_history)) == json.loads(cached_body(cached_history, cache)), "bodies differ"
+
+    sdk_total = cached_total = 0.0
+    for call in range(calls):
+        message = UserMessage(content=f"Follow-up question number {call}?")
+        sdk_history.append(message)
+        cached_history.append(message)
+
+        start = time.perf_counter()
+        sdk_body(sdk_history)
+        sdk_total += time.perf_counter() - start
+
+        start = time.perf_counter()
+        cached_body(cached_history, cache)
+        cached_total += time.perf_counter() - start
+
+    return sdk_total / calls, cached_total / calls
+
+
+def main(sizes, calls: int):
+    print("---------------------------------------")
+    print("   HISTORY SERIALIZATION BENCHMARK     ")
+    print("---------------------------------------")
+    print(f"   Per LLM call, averaged over {calls} calls")
+    for size in sizes:
+        sdk, cached = measure(size, calls)
+        print(f"   {size:>6} messages | SDK: {sdk * 1000:9.3f}ms | Cached: {cached * 1000:8.3f}ms | Speedup: {sdk / cached:6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark request body serialization against history size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sizes, args.calls)
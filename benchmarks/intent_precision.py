@@ -0,0 +1,86 @@
+"""
+Precision / coverage check for the local fast-path router.
+
+Replays benchmarks/intent_corpus.jsonl against the intents declared on the loaded skills.
+Entries with "skill": null must fall through to the LLM; any match on them is a false positive.
+
+Usage: python -m benchmarks.intent_precision [--corpus path] [--verbose]
+"""
+
+import os
+import json
+import time
+import pkgutil
+import argparse
+import importlib
+
+import skills
+from core.registry import SKILL_REGISTRY
+from core.router import IntentRouter
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "intent_corpus.jsonl")
+
+
+def load_skills():
+    for _, name, _ in pkgutil.iter_modules(skills.__path__, skills.__name__ + "."):
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"   (skipping {name}: {e})")
+
+
+def main(corpus_path: str, verbose: bool):
+    load_skills()
+    router = IntentRouter.from_tools(SKILL_REGISTRY)
+
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+
+    true_positive = false_positive = false_negative = skipped = 0
+    elapsed = 0.0
+    failures = []
+
+    for case in corpus:
+        expected = case.get("skill")
+        if expected and expected not in SKILL_REGISTRY:
+            skipped += 1
+            continue
+
+        start = time.perf_counter()
+        match = router.match(case["text"])
+        elapsed += time.perf_counter() - start
+
+        if match is None:
+            if expected:
+                false_negative += 1
+                failures.append(("MISS", case["text"], expected, None))
+        elif match.skill == expected and match.args == case.get("args", {}):
+            true_positive += 1
+        else:
+            false_positive += 1
+            failures.append(("WRONG", case["text"], expected, f"{match.skill} {match.args}"))
+
+    evaluated = len(corpus) - skipped
+    positives = true_positive + false_negative
+    routed = true_positive + false_positive
+
+    print("---------------------------------------")
+    print("   FAST PATH ROUTER PRECISION          ")
+    print("---------------------------------------")
+    print(f"   Intents: {len(router)}  |  Cases: {evaluated} (skipped {skipped}, skill not loaded)")
+    print(f"   Precision : {true_positive / routed:.3f}" if routed else "   Precision : n/a")
+    print(f"   Coverage  : {true_positive / positives:.3f}" if positives else "   Coverage  : n/a")
+    print(f"   False positives: {false_positive}  |  Misses: {false_negative}")
+    print(f"   Avg match time : {elapsed / max(evaluated, 1) * 1e6:.1f} µs")
+
+    if verbose or false_positive:
+        for kind, text, expected, got in failures:
+            print(f"   {kind:5} '{text}' expected={expected} got={got}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure fast-path router precision on a labelled corpus.")
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    main(args.corpus, args.verbose)
@@ -0,0 +1,201 @@
+"""
+Load generator for /chat.
+
+N concurrent simulated clients, each with its own session_id, send sequential requests and the run
+reports p50/p95/p99 latency, throughput, error rates (by X-Nova-Outcome and HTTP status) and the
+per-stage breakdown the backend returns in its Server-Timing header.
+
+By default everything runs in-process: the fake inference endpoint (see fake_endpoint.py) and the
+real main.py app on uvicorn, so no Azure quota is used. Pass --url to drive a running backend instead
+(point its AZURE_INFERENCE_ENDPOINT at `python -m benchmarks.fake_endpoint` for the same setup).
+
+Usage: python -m benchmarks.load_test --clients 20 --requests 10 --latency lognormal:0.4:0.5 --rate-429 0.02
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import asyncio
+import argparse
+import threading
+from collections import Counter, defaultdict
+
+import aiohttp
+
+from benchmarks.fake_endpoint import start_fake_endpoint, add_config_arguments, config_from_arguments
+
+DEFAULT_SCRIPT = os.path.join(os.path.dirname(__file__), "load_script.json")
+STAGES = ("session", "llm", "tools")
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))] if ordered else 0.0
+
+
+def parse_server_timing(header: str) -> dict:
+    """'llm;dur=412.3, total;dur=430.0' -> {'llm': 0.4123, 'total': 0.43} (seconds)."""
+    stages = {}
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and value:
+                stages[name] = float(value) / 1000
+    return stages
+
+
+def load_prompts(script_path: str):
+    """Example prompts declared next to each script rule, so every prompt exercises a known path."""
+    with open(script_path, "r", encoding="utf-8") as f:
+        return [prompt for rule in json.load(f) for prompt in rule.get("prompts", [])]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_backend(fake_url: str):
+    """Runs main.app on uvicorn in a daemon thread, wired to the fake endpoint. Returns (server, base_url)."""
+    import uvicorn
+
+    os.environ.update({
+        "NOVA_DOTENV_OVERRIDE": "false",
+        "LLM_BACKEND": "azure",
+        "LLM_FAST_BACKEND": "azure",
+        "AZURE_INFERENCE_ENDPOINT": fake_url,
+        "AZURE_INFERENCE_CREDENTIAL": "fake",
+        "LLM_MODEL": "fake-model",
+        "LLM_FAST_MODEL": "",
+    })
+    import main
+    logging.getLogger().setLevel(logging.WARNING)  # per-request INFO logs would drown the report
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def run_client(http: aiohttp.ClientSession, url: str, client_id: int, requests: int, prompts, use_cache: bool, results: list):
+    for i in range(requests):
+        payload = {
+            "text": prompts[(client_id + i) % len(prompts)],
+            "session_id": f"load-{client_id}",
+            "use_cache": use_cache,
+        }
+        start = time.perf_counter()
+        try:
+            async with http.post(f"{url}/chat", json=payload) as response:
+                await response.read()
+                results.append({
+                    "latency": time.perf_counter() - start,
+                    "status": response.status,
+                    "outcome": response.headers.get("X-Nova-Outcome", "http_error"),
+                    "stages": parse_server_timing(response.headers.get("Server-Timing")),
+                })
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            results.append({"latency": time.perf_counter() - start, "status": 0,
+                            "outcome": type(e).__name__, "stages": {}})
+
+
+def summarize(results: list, wall: float) -> dict:
+    latencies = [r["latency"] for r in results]
+    breakdown = defaultdict(list)
+    for r in results:
+        stages = r["stages"]
+        if "total" not in stages:
+            continue
+        for name in STAGES:
+            breakdown[name].append(stages.get(name, 0.0))
+        breakdown["other"].append(max(0.0, stages["total"] - sum(stages.get(name, 0.0) for name in STAGES)))
+        breakdown["network"].append(max(0.0, r["latency"] - stages["total"]))
+
+    return {
+        "requests": len(results),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(results) / wall, 2) if wall else 0.0,
+        "latency_ms": {f"p{q}": round(percentile(latencies, q) * 1000, 1) for q in (50, 95, 99)}
+                      | {"max": round(max(latencies, default=0.0) * 1000, 1)},
+        "outcomes": dict(Counter(r["outcome"] for r in results)),
+        "status": dict(Counter(str(r["status"]) for r in results)),
+        "stages_ms": {
+            name: {"mean": round(sum(samples) / len(samples) * 1000, 1), "p95": round(percentile(samples, 95) * 1000, 1)}
+            for name, samples in breakdown.items()
+        },
+    }
+
+
+async def main(args):
+    prompts = load_prompts(args.script)
+    server = fake = None
+    url = args.url
+    if url is None:
+        fake, fake_url = start_fake_endpoint(config=config_from_arguments(args))
+        server, url = start_backend(fake_url)
+
+    results = []
+    connector = aiohttp.TCPConnector(limit=args.clients)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                run_client(http, url.rstrip("/"), client_id, args.requests, prompts, not args.no_cache, results)
+                for client_id in range(args.clients)
+            ))
+            wall = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.should_exit = True
+        if fake is not None:
+            fake.shutdown()
+
+    summary = summarize(results, wall)
+    if fake is not None:
+        summary["fake_endpoint"] = dict(fake.RequestHandlerClass.config.stats)
+
+    total = summary["requests"] or 1
+    print("---------------------------------------")
+    print("   /chat LOAD TEST                     ")
+    print("---------------------------------------")
+    print(f"   Clients: {args.clients}  |  Requests: {summary['requests']}  |  Target: {args.url or 'in-process backend + fake endpoint'}")
+    if args.url is None:
+        print(f"   Endpoint latency: {args.latency}  |  429 rate: {args.rate_429:.0%}  |  Timeout rate: {args.timeout_rate:.0%}")
+    print(f"   Throughput : {summary['throughput_rps']:7.2f} req/s  ({summary['wall_seconds']:.2f}s wall)")
+    latency = summary["latency_ms"]
+    print(f"   Latency    : p50 {latency['p50']:.0f}ms  p95 {latency['p95']:.0f}ms  p99 {latency['p99']:.0f}ms  max {latency['max']:.0f}ms")
+    print("   Outcomes   : " + "  ".join(f"{name} {count} ({count / total:.1%})" for name, count in sorted(summary["outcomes"].items())))
+    print("   HTTP status: " + "  ".join(f"{status} x{count}" for status, count in sorted(summary["status"].items())))
+    print("   Stages (mean / p95):")
+    for name in (*STAGES, "other", "network"):
+        if name in summary["stages_ms"]:
+            stage = summary["stages_ms"][name]
+            print(f"     {name:<8}: {stage['mean']:8.1f}ms / {stage['p95']:8.1f}ms")
+    if "fake_endpoint" in summary:
+        print("   Fake endpoint: " + "  ".join(f"{k} {v}" for k, v in summary["fake_endpoint"].items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"arguments": vars(args), **summary}, f, indent=2)
+        print(f"   Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive /chat with concurrent simulated clients.")
+    parser.add_argument("--url", default=None, help="Running backend to load (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=10, help="Sequential requests per client")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client-side timeout per request")
+    parser.add_argument("--no-cache", action="store_true", help="Send use_cache=false")
+    parser.add_argument("--output", default=None, help="Write the summary as JSON (a baseline to compare against)")
+    add_config_arguments(parser)
+    parser.set_defaults(script=DEFAULT_SCRIPT)
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,230 @@
+"""
+Regression benchmark: replays recorded conversations (LLM cassettes, see core/cassettes.py) through
+the real session dispatch path, with no live LLM calls.
+
+Per cassette it reports:
+  * dispatch overhead per turn: wall time minus replayed LLM time minus skill time
+    (routing, tool selection, history handling, response parsing)
+  * history serialization cost: JSON-encoding the session history, as each LLM request does
+  * skill latency per skill (real skills by default, --stub-tools to use the recorded results)
+
+Every run is appended to a JSONL history file and compared with the previous run of the same
+cassette, so a prompt, tool or dispatch change can be checked offline.
+tests/test_replay.py replays the same cassettes under pytest and checks the outcomes (no misses,
+the recorded tool calls and replies); this script is for the timings.
+
+Record a cassette against the fake endpoint (or set NOVA_CASSETTE_MODE=record on a real backend):
+    python -m benchmarks.replay_suite --record benchmarks/cassettes/sample.jsonl
+Replay every cassette in benchmarks/cassettes:
+    python -m benchmarks.replay_suite --iterations 5
+"""
+
+import os
+import glob
+import json
+import time
+import asyncio
+import inspect
+import logging
+import argparse
+import functools
+import subprocess
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(__file__)
+DEFAULT_CASSETTES = os.path.join(BENCH_DIR, "cassettes", "*.jsonl")
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, "replay_history.jsonl")
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))] if ordered else 0.0
+
+
+def boot(endpoint: str, cassette_mode: str = "off", cassette_file: str = ""):
+    """Production-like base session (skills, fast path, tool index, history budget) wired to `endpoint`."""
+    os.environ.update({
+        "LLM_BACKEND": "azure",
+        "AZURE_INFERENCE_ENDPOINT": endpoint,
+        "AZURE_INFERENCE_CREDENTIAL": "fake",
+        "LLM_MODEL": "fake-model",
+        "LLM_FAST_MODEL": "",
+        "NOVA_CASSETTE_MODE": cassette_mode,
+        "NOVA_CASSETTE_FILE": cassette_file,
+    })
+    from main import load_plugins
+    from core.registry import get_all_skills
+    from core.llm import initialize_brain
+
+    load_plugins()
+    logging.getLogger().setLevel(logging.WARNING)
+    return initialize_brain(get_all_skills())
+
+
+def time_skills(timings):
+    """Wraps every loaded skill so its latency is collected in `timings[name]`."""
+    from core.llm import NOVA_TOOLS_MAP
+
+    def timed(name, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    timings[name].append(time.perf_counter() - started)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    timings[name].append(time.perf_counter() - started)
+        return wrapper
+
+    for name, func in list(NOVA_TOOLS_MAP.items()):
+        NOVA_TOOLS_MAP[name] = timed(name, func)
+
+
+def conversations(cassette):
+    """User-message sequences in the cassette: each request's user turns, dropping those that prefix a longer one."""
+    sequences = []
+    for interaction in cassette.interactions:
+        users = tuple(m.get("content") for m in interaction["request"]["messages"] if m.get("role") == "user")
+        if users and users not in sequences:
+            sequences.append(users)
+    return [s for s in sequences if not any(len(o) > len(s) and o[:len(s)] == s for o in sequences)]
+
+
+async def replay(base, path: str, iterations: int, stub_tools: bool, skills):
+    from core.cassettes import Cassette
+    from core.llm import history_to_dicts
+
+    cassette = Cassette(path, mode="replay", stub_tools=stub_tools)
+    corpus = conversations(cassette)
+    skills.clear()
+    samples = defaultdict(list)
+
+    for _ in range(iterations):
+        cassette.rewind()
+        for user_turns in corpus:
+            session = base.with_cassette(cassette)
+            for text in user_turns:
+                started = time.perf_counter()
+                await session.send_message_async(text, use_cache=False)
+                total = time.perf_counter() - started
+                samples["dispatch"].append(total - session.timings.get("llm", 0.0) - session.timings.get("tools", 0.0))
+                samples["replay"].append(session.timings.get("llm", 0.0))
+
+                started = time.perf_counter()
+                encoded = json.dumps(history_to_dicts(session.history))
+                samples["serialize"].append(time.perf_counter() - started)
+                samples["history_bytes"].append(len(encoded))
+
+    return {
+        "cassette": os.path.basename(path),
+        "conversations": len(corpus),
+        "turns": len(samples["dispatch"]),
+        "misses": cassette.stats["misses"],
+        "dispatch_ms": {"p50": round(percentile(samples["dispatch"], 50) * 1000, 3), "p95": round(percentile(samples["dispatch"], 95) * 1000, 3)},
+        "replay_ms": round(sum(samples["replay"]) / max(1, len(samples["replay"])) * 1000, 3),
+        "serialize_us": round(sum(samples["serialize"]) / max(1, len(samples["serialize"])) * 1e6, 1),
+        "history_bytes": max(samples["history_bytes"], default=0),
+        "skills_ms": {name: {"calls": len(t), "p50": round(percentile(t, 50) * 1000, 3)} for name, t in sorted(skills.items()) if t},
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BENCH_DIR).stdout.strip()
+    except OSError:
+        return ""
+
+
+def previous_runs(history_path: str):
+    if not os.path.exists(history_path):
+        return {}
+    last = {}
+    with open(history_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                run = json.loads(line)
+                last[(run["cassette"], run["stub_tools"])] = run
+    return last
+
+
+def delta(current: float, before: float) -> str:
+    if not before:
+        return ""
+    return f" ({(current - before) / before:+.0%} vs {before:g})"
+
+
+def report(result: dict, before: dict):
+    before = before or {}
+    print(f"   {result['cassette']}: {result['conversations']} conversations, {result['turns']} turns, {result['misses']} misses")
+    print(f"     dispatch p50 : {result['dispatch_ms']['p50']:8.3f}ms{delta(result['dispatch_ms']['p50'], before.get('dispatch_ms', {}).get('p50'))}")
+    print(f"     dispatch p95 : {result['dispatch_ms']['p95']:8.3f}ms{delta(result['dispatch_ms']['p95'], before.get('dispatch_ms', {}).get('p95'))}")
+    print(f"     serialize    : {result['serialize_us']:8.1f}us{delta(result['serialize_us'], before.get('serialize_us'))}  (history up to {result['history_bytes']} bytes)")
+    for name, skill in result["skills_ms"].items():
+        previous = before.get("skills_ms", {}).get(name, {}).get("p50")
+        print(f"     {name:<20}: {skill['p50']:8.3f}ms x{skill['calls']}{delta(skill['p50'], previous)}")
+
+
+async def record(path: str, turns: int):
+    """Records the load-test script (benchmarks/load_script.json) as conversations of `turns` messages."""
+    from benchmarks.fake_endpoint import start_fake_endpoint, FakeConfig, LatencyModel
+    from benchmarks.load_test import DEFAULT_SCRIPT, load_prompts
+
+    server, url = start_fake_endpoint(config=FakeConfig(latency=LatencyModel("fixed", 0.01), scripts=FakeConfig.load_scripts(DEFAULT_SCRIPT)))
+    if os.path.exists(path):
+        os.remove(path)
+    base = boot(url, cassette_mode="record", cassette_file=path)
+    prompts = load_prompts(DEFAULT_SCRIPT)
+    try:
+        for start in range(0, len(prompts), turns):
+            session = base.fork()
+            for text in prompts[start:start + turns]:
+                await session.send_message_async(text, use_cache=False)
+    finally:
+        server.shutdown()
+    print(f"Recorded {base.cassette.stats['recorded']} LLM calls to {path}")
+
+
+async def main(args):
+    if args.record:
+        await record(args.record, args.turns)
+        return
+
+    base = boot("http://127.0.0.1:9")  # never contacted: every LLM call is answered from a cassette
+    before = previous_runs(args.history)
+    paths = sorted(glob.glob(args.cassettes))
+    revision = git_revision()
+    skills = defaultdict(list)
+    time_skills(skills)
+
+    print("---------------------------------------")
+    print("   CASSETTE REPLAY BENCHMARK           ")
+    print("---------------------------------------")
+    print(f"   Iterations: {args.iterations}  |  Skills: {'recorded' if args.stub_tools else 'live'}  |  Revision: {revision or 'n/a'}")
+    with open(args.history, "a", encoding="utf-8") as history:
+        for path in paths:
+            result = await replay(base, path, args.iterations, args.stub_tools, skills)
+            report(result, before.get((result["cassette"], args.stub_tools)))
+            history.write(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": revision,
+                                      "iterations": args.iterations, "stub_tools": args.stub_tools, **result}) + "\n")
+    if not paths:
+        print(f"   No cassettes match {args.cassettes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded conversations and track dispatch overhead over time.")
+    parser.add_argument("--cassettes", default=DEFAULT_CASSETTES, help="Glob of cassette files to replay")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--stub-tools", action="store_true", help="Use recorded skill results instead of running skills")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSONL file the results are appended to")
+    parser.add_argument("--record", default=None, metavar="PATH", help="Record a cassette from the fake endpoint instead")
+    parser.add_argument("--turns", type=int, default=3, help="Messages per recorded conversation")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -1,10 +1,10 @@
 import os
 from dotenv import load_dotenv
-from azure.ai.inference import ChatCompletionsClient
 from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import HttpResponseError
 
+from core.transport import create_sync_client
+
 # Load env
 load_dotenv(override=True) 
 
@@ -28,10 +28,7 @@ else:
     full_endpoint = f"{endpoint.rstrip('/')}/deployments/{model}"
     
     try:
-        client = ChatCompletionsClient(
-            endpoint=full_endpoint,
-            credential=AzureKeyCredential(key)
-        )
+        client = create_sync_client(full_endpoint, key)
         
        
         print("\n🧠 Sending test message ('Hello')...")
@@ -1,3 +1,5 @@
+import re
+import json
 import requests
 import speech_recognition as sr
 import pyttsx3
@@ -8,8 +10,9 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
-SERVER_URL = "http://localhost:8000/chat"
+STREAM_URL = "http://localhost:8000/chat/stream"
 WAKE_WORD = "nova"
+SESSION_ID = os.getenv("NOVA_VOICE_SESSION_ID", "voice")
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("CLIENT")
@@ -45,6 +48,43 @@ def speak(text):
     except Exception as e:
         logger.error(f"TTS Error: {e}")
 
+SENTENCE_END = re.compile(r"[.!?]\s")
+
+def stream_reply(command):
+    """
+    Posts the command to /chat/stream and speaks each sentence as soon as it is complete,
+    so the first words are heard while the rest of the answer is still being generated.
+    """
+    buffer = ""
+    with requests.post(STREAM_URL, json={"text": command, "session_id": SESSION_ID}, stream=True) as response:
+        if response.status_code != 200:
+            error_detail = response.json().get("detail", "Unknown error")
+            logger.error(f"Server Error: {error_detail}")
+            speak(f"My brain is offline. {error_detail}")
+            return
+
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            event = json.loads(line[len("data:"):])
+
+            if event["type"] == "delta":
+                buffer += event["text"]
+                match = SENTENCE_END.search(buffer)
+                while match:
+                    speak(buffer[:match.end()].strip())
+                    buffer = buffer[match.end():]
+                    match = SENTENCE_END.search(buffer)
+
+            elif event["type"] == "final":
+                if buffer.strip():
+                    speak(buffer.strip())
+                elif not event.get("response"):
+                    speak("I heard you, but I didn't have a response.")
+
+            elif event["type"] == "error":
+                speak(event.get("response"))
+
 def listen_for_command():
     load_dotenv(override=True)
     threshold = int(os.getenv("MIC_ENERGY_THRESHOLD", 800))
@@ -84,20 +124,7 @@ def main_loop():
                 continue
 
             try:
-                response = requests.post(SERVER_URL, json={"text": clean_command})
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    reply = data.get("response")
-                    
-                    if reply:
-                        speak(reply)
-                    else:
-                        speak("I heard you, but I didn't have a response.")
-                else:
-                    error_detail = response.json().get("detail", "Unknown error")
-                    logger.error(f"Server Error: {error_detail}")
-                    speak(f"My brain is offline. {error_detail}")
+                stream_reply(clean_command)
                     
             except requests.exceptions.ConnectionError:
                 speak("I cannot connect to the server. Is it running?")
@@ -0,0 +1,164 @@
+# core/backends.py
+"""
+LLM backends. AzureNovaSession (and everything layered on it: deployment pools, model routing,
+history summaries) talks to a backend through two methods only:
+
+    complete(messages=..., tools=..., model=..., stream=False) -> ChatCompletions
+    complete(..., stream=True) -> context-managed iterator of StreamingChatCompletionsUpdate
+    close()
+
+plus `await`-able versions of both on the async client. The Azure SDK clients already have this
+shape. The OpenAI-compatible adapters below speak plain /chat/completions JSON (llama.cpp server,
+vLLM, Ollama, LM Studio...) and return the same SDK model objects, so tool calling, streaming and
+history work identically on every backend.
+"""
+import json
+from typing import Any, Iterator, List, Optional, Tuple
+
+import aiohttp
+from azure.core.exceptions import HttpResponseError
+from azure.ai.inference.models import ChatCompletions, StreamingChatCompletionsUpdate
+
+from core.ratelimit import RateLimiter
+from core.transport import TRANSPORT, create_sync_client, create_async_client
+from core.encoding import encode_body
+
+BACKENDS = ("azure", "openai")
+
+
+class BackendError(HttpResponseError):
+    """Non-2xx answer from an OpenAI-compatible server, surfaced like an Azure SDK error."""
+
+    def __init__(self, status_code: int, body: str):
+        super().__init__(message=f"({status_code}) {body[:500]}")
+        self.status_code = status_code
+
+
+def _sse_payload(line: str) -> Optional[str]:
+    """JSON payload of one server-sent event line, or None for keep-alives, comments and [DONE]."""
+    if not line.startswith("data:"):
+        return None
+    payload = line[5:].strip()
+    return None if not payload or payload == "[DONE]" else payload
+
+
+class SSEStream:
+    """Sync stream of StreamingChatCompletionsUpdate, shaped like the SDK's StreamingChatCompletions."""
+
+    def __init__(self, response):
+        self._response = response
+
+    def __iter__(self) -> Iterator[StreamingChatCompletionsUpdate]:
+        try:
+            for line in self._response.iter_lines(decode_unicode=True):
+                payload = _sse_payload(line or "")
+                if payload:
+                    yield StreamingChatCompletionsUpdate(json.loads(payload))
+        finally:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._response.close()
+
+
+class AsyncSSEStream:
+    """Async twin of SSEStream, shaped like the SDK's AsyncStreamingChatCompletions."""
+
+    def __init__(self, response):
+        self._response = response
+
+    async def __aiter__(self):
+        try:
+            async for raw in self._response.content:
+                payload = _sse_payload(raw.decode("utf-8").strip())
+                if payload:
+                    yield StreamingChatCompletionsUpdate(json.loads(payload))
+        finally:
+            await self.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        self._response.release()
+
+
+class OpenAICompatibleClient:
+    """Sync adapter for any server exposing OpenAI's POST {base_url}/chat/completions."""
+
+    def __init__(self, base_url: str, api_key: str = None, timeout: float = 120.0):
+        self.url = f"{base_url.rstrip('/')}/chat/completions"
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.timeout = timeout
+
+    def complete(self, *, messages: List, tools: List = None, model: str = None, stream: bool = False, **extra):
+        response = TRANSPORT.sync_session().post(
+            self.url, data=encode_body(messages, tools, model or None, stream, extra),
+            headers=self.headers, timeout=self.timeout, stream=stream
+        )
+        if response.status_code >= 300:
+            body = response.text
+            response.close()
+            raise BackendError(response.status_code, body)
+        if stream:
+            return SSEStream(response)
+        return ChatCompletions(response.json())
+
+    def close(self):
+        pass  # the HTTP session belongs to TRANSPORT
+
+
+class AsyncOpenAICompatibleClient:
+    """Async adapter for OpenAI-compatible servers, on the shared aiohttp session."""
+
+    def __init__(self, base_url: str, api_key: str = None, timeout: float = 120.0):
+        self.url = f"{base_url.rstrip('/')}/chat/completions"
+        # The shared aiohttp session leaves decompression to azure-core, so ask for plain bodies.
+        self.headers = {"Accept-Encoding": "identity", "Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.timeout = timeout
+
+    async def complete(self, *, messages: List, tools: List = None, model: str = None, stream: bool = False, **extra):
+        response = await TRANSPORT.async_session().post(
+            self.url, data=encode_body(messages, tools, model or None, stream, extra),
+            headers=self.headers, timeout=aiohttp.ClientTimeout(total=None if stream else self.timeout)
+        )
+        if response.status >= 300:
+            body = await response.text()
+            response.release()
+            raise BackendError(response.status, body)
+        if stream:
+            return AsyncSSEStream(response)
+        try:
+            return ChatCompletions(json.loads(await response.read()))
+        finally:
+            response.release()
+
+    async def close(self):
+        pass  # the HTTP session belongs to TRANSPORT
+
+
+def create_clients(backend: str, name: str, base_endpoint: str, key: str, limiter: RateLimiter = None) -> Tuple[Any, Any, str]:
+    """
+    (sync client, async client, request endpoint) for one deployment on the given backend.
+    Azure deployments live under {endpoint}/deployments/{name}; OpenAI-compatible servers take
+    the model name in the request body instead.
+    """
+    if backend == "azure":
+        endpoint = f"{base_endpoint.rstrip('/')}/deployments/{name}"
+        return create_sync_client(endpoint, key, limiter), create_async_client(endpoint, key, limiter), endpoint
+    if backend == "openai":
+        return OpenAICompatibleClient(base_endpoint, key), AsyncOpenAICompatibleClient(base_endpoint, key), base_endpoint
+    raise ValueError(f"Unknown LLM backend '{backend}' (expected one of {BACKENDS})")
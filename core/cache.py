@@ -0,0 +1,180 @@
+# core/cache.py
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Awaitable, Dict, Hashable, Optional, Tuple
+
+from core.registry import SkillMetadata
+
+_MISSING = object()
+
+
+class _LeaderCancelled(Exception):
+    """The call identical callers were waiting on was cancelled; one of them runs the skill instead."""
+
+
+class TTLCache:
+    """
+    Bounded LRU map whose entries expire ttl seconds after being stored (or after a per-entry ttl).
+    Not thread-safe on its own.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 128):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def normalize_args(args: Dict[str, Any]) -> str:
+    """Default cache key: case/whitespace-insensitive strings, order-insensitive keys."""
+    normalized = {
+        name: value.strip().lower() if isinstance(value, str) else value
+        for name, value in args.items()
+    }
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+class SkillResultCache:
+    """
+    Per-skill LRU+TTL result cache shared by every session.
+    Concurrent identical calls (same skill, same key) collapse into one execution:
+    the first caller runs the skill and the others wait on its result.
+    Safe to use from worker threads and from the event loop at the same time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caches: Dict[str, TTLCache] = {}
+        self._in_flight: Dict[Tuple[str, Hashable], Future] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, counter: str):
+        counts = self.stats.setdefault(name, {"hits": 0, "misses": 0, "collapsed": 0})
+        counts[counter] += 1
+
+    def _cache_for(self, meta: SkillMetadata) -> TTLCache:
+        cache = self._caches.get(meta.name)
+        if cache is None:
+            cache = self._caches[meta.name] = TTLCache(meta.cache_ttl, meta.cache_max_entries)
+        return cache
+
+    def _claim(self, meta: SkillMetadata, args: Dict[str, Any]):
+        """Returns (cached value or _MISSING, future to wait on or None, key, is_leader)."""
+        key = (meta.cache_key or normalize_args)(args)
+        with self._lock:
+            value = self._cache_for(meta).get(key)
+            if value is not _MISSING:
+                self._count(meta.name, "hits")
+                return value, None, key, False
+
+            future = self._in_flight.get((meta.name, key))
+            if future is not None:
+                self._count(meta.name, "collapsed")
+                return _MISSING, future, key, False
+
+            self._count(meta.name, "misses")
+            future = self._in_flight[(meta.name, key)] = Future()
+            future.set_running_or_notify_cancel()  # a waiter giving up must not cancel it for everyone
+            return _MISSING, future, key, True
+
+    def _settle(self, meta: SkillMetadata, key: Hashable, future: Future, value: Any = _MISSING, error: BaseException = None):
+        with self._lock:
+            if error is None and (meta.cache_if is None or meta.cache_if(value)):
+                self._cache_for(meta).set(key, value)
+            self._in_flight.pop((meta.name, key), None)
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def get_or_run(self, meta: SkillMetadata, args: Dict[str, Any], run: Callable[[], Any]) -> Any:
+        while True:
+            value, future, key, leader = self._claim(meta, args)
+            if value is not _MISSING:
+                return value
+            if leader:
+                break
+            try:
+                return future.result()
+            except _LeaderCancelled:
+                continue  # the leader was an async call that got cancelled: try to take over
+
+        try:
+            value = run()
+        except BaseException as e:
+            self._settle(meta, key, future, error=e)
+            raise
+        self._settle(meta, key, future, value=value)
+        return value
+
+    async def get_or_run_async(self, meta: SkillMetadata, args: Dict[str, Any], run: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            value, future, key, leader = self._claim(meta, args)
+            if value is not _MISSING:
+                return value
+            if leader:
+                break
+            try:
+                return await asyncio.wrap_future(future)
+            except _LeaderCancelled:
+                continue
+
+        try:
+            value = await run()
+        except asyncio.CancelledError:
+            # Only this caller went away (client disconnect): waiters from other sessions retry
+            # and one of them becomes the leader, instead of failing with our cancellation.
+            self._settle(meta, key, future, error=_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._settle(meta, key, future, error=e)
+            raise
+        self._settle(meta, key, future, value=value)
+        return value
+
+    def invalidate(self, name: Optional[str] = None):
+        with self._lock:
+            if name is None:
+                for cache in self._caches.values():
+                    cache.clear()
+            elif name in self._caches:
+                self._caches[name].clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                name: {**counts, "entries": len(self._caches.get(name, ()))}
+                for name, counts in self.stats.items()
+            }
+
+
+SKILL_CACHE = SkillResultCache()
@@ -0,0 +1,324 @@
+# core/cassettes.py
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from azure.ai.inference.models import ChatCompletions, StreamingChatCompletionsUpdate
+
+logger = logging.getLogger("NOVA_CASSETTES")
+
+MODES = ("record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded response for a request."""
+
+
+def _as_dict(item: Any) -> Dict[str, Any]:
+    return item.as_dict() if hasattr(item, "as_dict") else item
+
+
+def request_key(messages: List[Dict[str, Any]]) -> str:
+    """
+    Identifies an LLM request by the conversation it carries, not by its exact bytes: the system
+    prompt and tool results are left out so a cassette still replays after a prompt edit or with
+    live skills, and tool-call ids are left out because fast-path ids are random.
+    """
+    shape = []
+    for message in messages:
+        role = message.get("role")
+        if role == "system":
+            continue
+        if role == "tool":
+            shape.append(["tool"])
+            continue
+        calls = [[c["function"]["name"], c["function"]["arguments"]] for c in message.get("tool_calls") or []]
+        shape.append([role, message.get("content"), calls])
+    return hashlib.sha256(json.dumps(shape, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def assemble_stream(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Folds streamed deltas back into one chat completion, so cassettes store a single format."""
+    content, calls, finish_reason, first = [], {}, None, updates[0] if updates else {}
+    for update in updates:
+        for choice in update.get("choices") or []:
+            delta = choice.get("delta") or {}
+            finish_reason = choice.get("finish_reason") or finish_reason
+            if delta.get("content"):
+                content.append(delta["content"])
+            for fragment in delta.get("tool_calls") or []:
+                call = calls.setdefault(fragment.get("index", len(calls)), {"id": "", "type": "function", "function": {"name": "", "arguments": ""}})
+                call["id"] = fragment.get("id") or call["id"]
+                function = fragment.get("function") or {}
+                call["function"]["name"] += function.get("name") or ""
+                call["function"]["arguments"] += function.get("arguments") or ""
+
+    message = {"role": "assistant", "content": "".join(content) or None}
+    if calls:
+        message["tool_calls"] = [calls[index] for index in sorted(calls)]
+    return {
+        "id": first.get("id", ""), "created": first.get("created", 0), "model": first.get("model", ""),
+        "choices": [{"index": 0, "finish_reason": finish_reason or "stop", "message": message}],
+    }
+
+
+def stream_updates(completion: Dict[str, Any]) -> List[StreamingChatCompletionsUpdate]:
+    """A recorded completion played back as a stream: one delta for the text, one per tool call."""
+    choice = completion["choices"][0]
+    message = choice["message"]
+    deltas = [{"role": "assistant", "content": message["content"]}] if message.get("content") else []
+    for index, call in enumerate(message.get("tool_calls") or []):
+        deltas.append({"tool_calls": [{**call, "index": index}]})
+    deltas = deltas or [{"role": "assistant"}]
+    header = {"id": completion.get("id", ""), "created": completion.get("created", 0), "model": completion.get("model", "")}
+    return [
+        StreamingChatCompletionsUpdate({**header, "choices": [{
+            "index": 0, "delta": delta,
+            "finish_reason": choice.get("finish_reason") if position == len(deltas) - 1 else None,
+        }]})
+        for position, delta in enumerate(deltas)
+    ]
+
+
+class Cassette:
+    """
+    Record/replay of LLM conversations in a JSONL file, one request/response pair per line:
+        {"key", "model", "stream", "request": {"messages", "tools"}, "response", "elapsed_ms"}
+
+    record: calls go to the real client and every pair is appended to the file as it completes.
+    replay: answers come from the file in recorded order, per request key, and the real client is
+    never called; once a key's responses run out the last one is repeated. With stub_tools, skills
+    are not executed either: their recorded results are returned instead.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", stub_tools: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}' (expected one of {MODES})")
+        self.path = path
+        self.mode = mode
+        self.stub_tools = stub_tools and mode == "replay"
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._tool_results: Dict[str, str] = {}
+        self.interactions: List[Dict[str, Any]] = []
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0, "stubbed_tools": 0}
+        if mode == "replay":
+            self.load()
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.interactions = [json.loads(line) for line in f if line.strip()]
+        for interaction in self.interactions:
+            self._index_tool_results(interaction["request"]["messages"])
+        self.rewind()
+        logger.info(f"📼 Loaded {len(self.interactions)} recorded LLM calls from {self.path}")
+
+    def rewind(self):
+        """Starts playback over from the first recorded response of every request."""
+        with self._lock:
+            self._responses.clear()
+            self._last.clear()
+            for interaction in self.interactions:
+                self._responses.setdefault(interaction["key"], deque()).append(interaction["response"])
+
+    def _index_tool_results(self, messages: List[Dict[str, Any]]):
+        calls = {}
+        for message in messages:
+            for call in message.get("tool_calls") or []:
+                calls[call["id"]] = call["function"]
+            if message.get("role") == "tool" and message.get("tool_call_id") in calls:
+                function = calls[message["tool_call_id"]]
+                self._tool_results[self._tool_key(function["name"], function["arguments"])] = message.get("content") or ""
+
+    @staticmethod
+    def _tool_key(name: str, arguments: str) -> str:
+        try:
+            arguments = json.dumps(json.loads(arguments or "{}"), sort_keys=True)
+        except ValueError:
+            pass
+        return f"{name}:{arguments}"
+
+    def tool_result(self, tool_call) -> str:
+        """Recorded output of a skill call, matched by name and arguments."""
+        with self._lock:
+            self.stats["stubbed_tools"] += 1
+            result = self._tool_results.get(self._tool_key(tool_call.function.name, tool_call.function.arguments))
+        if result is None:
+            return f"Error: no recorded result for {tool_call.function.name}."
+        return result
+
+    def replay(self, messages: List) -> Dict[str, Any]:
+        payload = [_as_dict(message) for message in messages]
+        key = request_key(payload)
+        with self._lock:
+            queue = self._responses.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            response = self._last.get(key)
+            if response is None:
+                self.stats["misses"] += 1
+                last_user = next((m.get("content") for m in reversed(payload) if m.get("role") == "user"), None)
+                raise CassetteMiss(f"No recorded response in {self.path} for this request (last user message: {last_user!r})")
+            self.stats["replayed"] += 1
+        return response
+
+    def record(self, messages: List, tools: Optional[List], model: Optional[str], stream: bool,
+               response: Dict[str, Any], elapsed: float):
+        payload = [_as_dict(message) for message in messages]
+        interaction = {
+            "key": request_key(payload),
+            "model": model,
+            "stream": stream,
+            "request": {"messages": payload, "tools": [_as_dict(tool)["function"]["name"] for tool in tools or []]},
+            "response": response,
+            "elapsed_ms": round(elapsed * 1000, 1),
+        }
+        line = json.dumps(interaction)
+        with self._lock:
+            self.interactions.append(interaction)
+            self.stats["recorded"] += 1
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def wrap(self, client) -> "CassetteClient":
+        return CassetteClient(self, client)
+
+    def wrap_async(self, async_client) -> "AsyncCassetteClient":
+        return AsyncCassetteClient(self, async_client)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "file": self.path, "stub_tools": self.stub_tools,
+                    "interactions": len(self.interactions), **self.stats}
+
+
+class _RecordingStream:
+    """Passes a live stream through while keeping its updates for the cassette."""
+
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._updates: List[Dict[str, Any]] = []
+
+    def __iter__(self):
+        for update in self._stream:
+            self._updates.append(update.as_dict())
+            yield update
+
+    async def __aiter__(self):
+        async for update in self._stream:
+            self._updates.append(update.as_dict())
+            yield update
+
+    def _finish(self):
+        if self._on_close is not None:
+            self._on_close(assemble_stream(self._updates))
+            self._on_close = None
+
+    def __enter__(self):
+        self._stream.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._stream.__exit__(*exc)
+        self._finish()
+
+    async def __aenter__(self):
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._stream.__aexit__(*exc)
+        self._finish()
+
+
+class _ReplayStream:
+    """Recorded completion served through the SDK's streaming interface (sync and async)."""
+
+    def __init__(self, updates: List[StreamingChatCompletionsUpdate]):
+        self._updates = updates
+
+    def __iter__(self):
+        return iter(self._updates)
+
+    async def __aiter__(self):
+        for update in self._updates:
+            yield update
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def close(self):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+class CassetteClient:
+    """Sync client facade: records through the wrapped client, or replays without calling it."""
+
+    def __init__(self, cassette: Cassette, client):
+        self.cassette = cassette
+        self.client = client
+
+    def complete(self, *, messages: List, tools: List = None, model: str = None, stream: bool = False, **kwargs):
+        if self.cassette.mode == "replay":
+            completion = self.cassette.replay(messages)
+            return _ReplayStream(stream_updates(completion)) if stream else ChatCompletions(completion)
+
+        started = time.perf_counter()
+        response = self.client.complete(messages=messages, tools=tools, model=model, stream=stream, **kwargs)
+        if stream:
+            sent = list(messages)  # the session appends to its history before the stream is closed
+            return _RecordingStream(response, lambda completion: self.cassette.record(
+                sent, tools, model, True, completion, time.perf_counter() - started))
+        self.cassette.record(messages, tools, model, False, response.as_dict(), time.perf_counter() - started)
+        return response
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+
+
+class AsyncCassetteClient:
+    """Async twin of CassetteClient."""
+
+    def __init__(self, cassette: Cassette, client):
+        self.cassette = cassette
+        self.client = client
+
+    async def complete(self, *, messages: List, tools: List = None, model: str = None, stream: bool = False, **kwargs):
+        if self.cassette.mode == "replay":
+            completion = self.cassette.replay(messages)
+            return _ReplayStream(stream_updates(completion)) if stream else ChatCompletions(completion)
+
+        started = time.perf_counter()
+        response = await self.client.complete(messages=messages, tools=tools, model=model, stream=stream, **kwargs)
+        if stream:
+            sent = list(messages)  # the session appends to its history before the stream is closed
+            return _RecordingStream(response, lambda completion: self.cassette.record(
+                sent, tools, model, True, completion, time.perf_counter() - started))
+        self.cassette.record(messages, tools, model, False, response.as_dict(), time.perf_counter() - started)
+        return response
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
@@ -0,0 +1,235 @@
+# core/deployments.py
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Tuple
+
+from azure.core.exceptions import HttpResponseError
+
+from core.ratelimit import RateLimiter, retry_after
+
+logger = logging.getLogger("NOVA_DEPLOYMENTS")
+
+
+def parse_deployments(spec: str, default_endpoint: str) -> List[Tuple[str, str]]:
+    """
+    Parses LLM_MODEL into an ordered list of (deployment name, base endpoint).
+    Entries are comma-separated; each is `name` (served from default_endpoint) or `name@endpoint`.
+        "gpt-4o, gpt-4o-eastus@https://eastus.services.ai.azure.com/models"
+    """
+    deployments = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, endpoint = entry.partition("@")
+        deployments.append((name.strip(), (endpoint or default_endpoint or "").strip().rstrip("/")))
+    return deployments
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+@dataclass
+class Deployment:
+    name: str
+    endpoint: str
+    client: Any
+    async_client: Any
+    limiter: RateLimiter
+    latencies: Dict[bool, Deque[float]] = field(default_factory=lambda: {False: deque(maxlen=100), True: deque(maxlen=100)})
+    cooldown_until: float = 0.0
+    stats: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "errors": 0, "wins": 0, "cancelled": 0})
+
+    def healthy(self, now: float) -> bool:
+        return self.cooldown_until <= now and self.limiter.paused_for() == 0
+
+    def typical_latency(self, stream: bool) -> float:
+        samples = self.latencies[stream]
+        return percentile(samples, 50) if samples else float("inf")
+
+
+class DeploymentPool:
+    """
+    Ordered pool of deployments serving the same model. Calls go to the first healthy deployment.
+    On the async path, if it has not answered within the hedge_percentile of its own recent latency,
+    the same request is also sent to the fastest other healthy deployment. The first answer wins
+    and the other call is cancelled. Failed or throttled deployments are skipped for a cooldown.
+    """
+
+    def __init__(self, deployments: List[Deployment], hedge_percentile: float = 95, hedge_min_delay: float = 0.3,
+                 hedge_default_delay: float = 2.0, min_samples: int = 10, error_cooldown: float = 30.0):
+        self.deployments = deployments
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.min_samples = min_samples
+        self.error_cooldown = error_cooldown
+        self.stats = {"hedges": 0, "backup_wins": 0, "failovers": 0}
+
+    def ranked(self, stream: bool = False) -> List[Deployment]:
+        """First healthy deployment in configured order, then the rest fastest-first."""
+        now = time.monotonic()
+        healthy = [d for d in self.deployments if d.healthy(now)]
+        if not healthy:
+            return sorted(self.deployments, key=lambda d: d.cooldown_until)
+        backups = sorted(healthy[1:], key=lambda d: d.typical_latency(stream))
+        return [healthy[0], *backups]
+
+    def hedge_delay(self, deployment: Deployment, stream: bool) -> float:
+        samples = deployment.latencies[stream]
+        if len(samples) < self.min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, percentile(samples, self.hedge_percentile))
+
+    def _record_success(self, deployment: Deployment, stream: bool, elapsed: float):
+        deployment.latencies[stream].append(elapsed)
+
+    def _record_error(self, deployment: Deployment, error: Exception):
+        deployment.stats["errors"] += 1
+        status = getattr(error, "status_code", None)
+        if isinstance(error, HttpResponseError) and status is not None and status < 500 and status not in (408, 429):
+            return  # the request itself is bad; another deployment will not fare better
+        response = getattr(error, "response", None)
+        cooldown = retry_after(response.headers) if response is not None else None
+        deployment.cooldown_until = time.monotonic() + (cooldown or self.error_cooldown)
+        logger.warning(f"🚧 Deployment '{deployment.name}' cooling down for {cooldown or self.error_cooldown:.0f}s: {error}")
+
+    def _request(self, deployment: Deployment, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        deployment.stats["requests"] += 1
+        return {**kwargs, "model": deployment.name}
+
+    def complete(self, **kwargs):
+        """Sync path: no hedging (it would need a thread per call), but fails over in ranked order."""
+        stream = bool(kwargs.get("stream"))
+        last_error = None
+        for position, deployment in enumerate(self.ranked(stream)):
+            if position:
+                self.stats["failovers"] += 1
+            start = time.perf_counter()
+            try:
+                result = deployment.client.complete(**self._request(deployment, kwargs))
+            except Exception as e:
+                self._record_error(deployment, e)
+                last_error = e
+                continue
+            self._record_success(deployment, stream, time.perf_counter() - start)
+            deployment.stats["wins"] += 1
+            return result
+        raise last_error
+
+    async def _call_async(self, deployment: Deployment, kwargs: Dict[str, Any], stream: bool):
+        start = time.perf_counter()
+        try:
+            result = await deployment.async_client.complete(**self._request(deployment, kwargs))
+        except asyncio.CancelledError:
+            deployment.stats["cancelled"] += 1
+            raise
+        except Exception as e:
+            self._record_error(deployment, e)
+            raise
+        self._record_success(deployment, stream, time.perf_counter() - start)
+        return result
+
+    async def complete_async(self, **kwargs):
+        stream = bool(kwargs.get("stream"))
+        ranked = self.ranked(stream)
+        primary, backups = ranked[0], ranked[1:]
+
+        tasks: Dict[asyncio.Task, Deployment] = {asyncio.create_task(self._call_async(primary, kwargs, stream)): primary}
+        hedge_after = self.hedge_delay(primary, stream)
+        last_error = None
+
+        try:
+            while tasks:
+                timeout = hedge_after if backups and len(tasks) == 1 and last_error is None else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Primary is slower than its own p-th percentile: hedge.
+                    self.stats["hedges"] += 1
+                    backup = backups.pop(0)
+                    tasks[asyncio.create_task(self._call_async(backup, kwargs, stream))] = backup
+                    continue
+
+                for task in done:
+                    deployment = tasks.pop(task)
+                    if task.exception() is None:
+                        deployment.stats["wins"] += 1
+                        if deployment is not primary:
+                            self.stats["backup_wins"] += 1
+                        return task.result()
+                    last_error = task.exception()
+
+                if not tasks and backups:
+                    self.stats["failovers"] += 1
+                    backup = backups.pop(0)
+                    tasks[asyncio.create_task(self._call_async(backup, kwargs, stream))] = backup
+
+            raise last_error
+        finally:
+            await self._cancel(tasks)
+
+    @staticmethod
+    async def _cancel(tasks: Dict[asyncio.Task, Deployment]):
+        """Cancels losing calls. A loser that already got a stream has its connection released."""
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                result = await task
+            except BaseException:
+                continue
+            if hasattr(result, "aclose"):
+                await result.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        deployments = []
+        for d in self.deployments:
+            latency = {}
+            for stream, label in ((False, "complete"), (True, "stream")):
+                if d.latencies[stream]:
+                    latency[f"{label}_p50_ms"] = round(percentile(d.latencies[stream], 50) * 1000)
+                    latency[f"{label}_p95_ms"] = round(percentile(d.latencies[stream], 95) * 1000)
+            deployments.append({
+                "name": d.name,
+                "endpoint": d.endpoint,
+                "healthy": d.healthy(now),
+                **d.stats,
+                **latency,
+                "hedge_delay_ms": round(self.hedge_delay(d, False) * 1000),
+            })
+        return {**self.stats, "deployments": deployments}
+
+
+class PooledClient:
+    """Sync client facade so sessions can treat a pool like a single ChatCompletionsClient."""
+
+    def __init__(self, pool: DeploymentPool):
+        self.pool = pool
+
+    def complete(self, **kwargs):
+        return self.pool.complete(**kwargs)
+
+    def close(self):
+        for d in self.pool.deployments:
+            d.client.close()
+
+
+class AsyncPooledClient:
+    """Async client facade over a DeploymentPool."""
+
+    def __init__(self, pool: DeploymentPool):
+        self.pool = pool
+
+    async def complete(self, **kwargs):
+        return await self.pool.complete_async(**kwargs)
+
+    async def close(self):
+        for d in self.pool.deployments:
+            await d.async_client.close()
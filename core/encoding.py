@@ -0,0 +1,125 @@
+# core/encoding.py
+"""
+Pre-encoded chat request bodies.
+
+Without this, every LLM call serializes every message of the session history from scratch, so a
+long session does quadratic JSON work in the request path. Sessions instead keep a FragmentCache:
+each message's JSON is encoded once, the first time it is sent, and request bodies are assembled
+by joining the cached fragments. Only messages added since the previous call are encoded.
+
+Messages must not be edited in place once they are in a history (replace them instead): the cache
+is keyed by object identity.
+"""
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from azure.ai.inference import ChatCompletionsClient
+from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+
+_PLAIN_KEYWORDS = {"tools", "model", "stream"}
+
+
+def encode_item(item: Any) -> bytes:
+    data = item.as_dict(exclude_readonly=True) if hasattr(item, "as_dict") else item
+    return json.dumps(data).encode("utf-8")
+
+
+class FragmentCache:
+    """
+    Encoded JSON per message or tool definition, reused while the same object is sent again.
+    When the previous call's items are a prefix of the current ones (a growing history), the
+    previous joined output is extended instead of being rebuilt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[Any, bytes]] = {}
+        self._joined_items: List[Any] = []
+        self._joined = b""
+        self.stats = {"encoded": 0, "reused": 0}
+
+    def _fragment(self, item: Any) -> bytes:
+        entry = self._entries.get(id(item))
+        # The entry holds the object itself, so its id cannot be reused while cached.
+        if entry is None or entry[0] is not item:
+            entry = self._entries[id(item)] = (item, encode_item(item))
+            self.stats["encoded"] += 1
+        else:
+            self.stats["reused"] += 1
+        return entry[1]
+
+    def join(self, items: List[Any]) -> bytes:
+        """Comma-separated JSON of items."""
+        with self._lock:
+            previous = self._joined_items
+            # list == checks identity before equality, so an unchanged prefix compares at C speed.
+            if previous and len(items) >= len(previous) and items[:len(previous)] == previous:
+                self.stats["reused"] += len(previous)
+                joined = b", ".join([self._joined, *(self._fragment(item) for item in items[len(previous):])])
+            else:
+                joined = b", ".join([self._fragment(item) for item in items])
+                if len(self._entries) > 2 * len(items) + 64:
+                    # Folded or replaced messages: keep only what this request still uses.
+                    live = {id(item) for item in items}
+                    self._entries = {key: entry for key, entry in self._entries.items() if key in live}
+            self._joined_items = list(items)
+            self._joined = joined
+            return joined
+
+
+# Tool definitions are shared by every session.
+TOOL_FRAGMENTS = FragmentCache()
+
+
+class EncodedMessages(list):
+    """Snapshot of a session history (same message objects) carrying the session's FragmentCache."""
+
+    def __init__(self, messages: List[Any], cache: FragmentCache):
+        super().__init__(messages)
+        self.cache = cache
+
+
+def encode_body(messages: List[Any], tools: Optional[List[Any]] = None, model: Optional[str] = None,
+                stream: Optional[bool] = None, extra: Optional[Dict[str, Any]] = None) -> bytes:
+    """/chat/completions JSON body, with messages and tools taken from the cache when available."""
+    cache = messages.cache if isinstance(messages, EncodedMessages) else FragmentCache()
+    parts = [b'{"messages": [', cache.join(messages), b"]"]
+    if tools:
+        parts += [b', "tools": [', TOOL_FRAGMENTS.join(tools), b"]"]
+    for key, value in {"model": model, "stream": stream, **(extra or {})}.items():
+        if value is not None:
+            parts.append(f', "{key}": {json.dumps(value)}'.encode("utf-8"))
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def _encoded_call(client, args, messages, kwargs) -> Optional[bytes]:
+    """Body for the common call shape (messages, tools, model, stream); None falls back to the SDK."""
+    if args or not isinstance(messages, EncodedMessages) or not set(kwargs) <= _PLAIN_KEYWORDS:
+        return None
+    return encode_body(messages, kwargs.get("tools"), kwargs.get("model") or client._model, kwargs.get("stream"))
+
+
+class EncodedChatCompletionsClient(ChatCompletionsClient):
+    """ChatCompletionsClient that sends EncodedMessages as a pre-assembled body."""
+
+    def complete(self, *args, messages=None, **kwargs):
+        body = _encoded_call(self, args, messages, kwargs)
+        if body is not None:
+            return super().complete(body, stream=kwargs.get("stream"))
+        if messages is not None:
+            kwargs["messages"] = messages
+        return super().complete(*args, **kwargs)
+
+
+class AsyncEncodedChatCompletionsClient(AsyncChatCompletionsClient):
+    """Async twin of EncodedChatCompletionsClient."""
+
+    async def complete(self, *args, messages=None, **kwargs):
+        body = _encoded_call(self, args, messages, kwargs)
+        if body is not None:
+            return await super().complete(body, stream=kwargs.get("stream"))
+        if messages is not None:
+            kwargs["messages"] = messages
+        return await super().complete(*args, **kwargs)
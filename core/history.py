@@ -0,0 +1,244 @@
+# core/history.py
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, List, Optional
+
+from azure.ai.inference.models import SystemMessage, UserMessage, ToolMessage
+
+from core.tokens import USAGE_LEDGER, Usage, estimate_message_tokens
+
+logger = logging.getLogger("NOVA_HISTORY")
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+TRIM_MARKER = "chars trimmed]"
+
+SUMMARY_INSTRUCTION = """
+You compress conversation history for a voice assistant.
+Merge the existing summary and the new conversation excerpt into one summary of at most 150 words.
+Keep facts the user stated, preferences, names, file paths, decisions and unfinished requests.
+Drop greetings, tool plumbing and anything already resolved. Reply with the summary only.
+"""
+
+
+def split_turns(messages: List[Any]) -> List[List[Any]]:
+    """Groups messages into turns, each starting at a UserMessage. Tool calls never straddle turns."""
+    turns = []
+    for message in messages:
+        if message.role == "user" or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def render_transcript(messages: List[Any], max_chars: int = 300) -> str:
+    lines = []
+    for message in messages:
+        if message.role == "user":
+            lines.append(f"User: {message.content}")
+        elif message.role == "assistant" and message.content:
+            lines.append(f"Assistant: {message.content}")
+        elif message.role == "assistant":
+            calls = ", ".join(f"{c.function.name}({c.function.arguments})" for c in message.tool_calls or [])
+            lines.append(f"Assistant called: {calls}")
+        elif message.role == "tool":
+            lines.append(f"Tool result: {str(message.content)[:max_chars]}")
+        elif message.role == "system" and str(message.content).startswith(SUMMARY_PREFIX):
+            lines.append(str(message.content))
+    return "\n".join(lines)
+
+
+class HistoryManager:
+    """
+    Keeps a session's history within a token budget.
+
+    Layout: [system prompt, optional running summary, turns...]. The newest keep_turns turns
+    are always kept verbatim. Older tool outputs are truncated first, and if the history is
+    still over budget the oldest turns are removed and folded into the running summary by a
+    background LLM call, so the request path never waits for summarization. A finished summary
+    is held until the next compact() call, i.e. between turns, so it never shifts the messages
+    of an exchange that is still in progress. Summaries run on the fast model when one is
+    configured; their tokens are recorded in the usage ledger under "history_summary" and added
+    to the session's next request, so they count against its budget.
+
+    While the history fits the budget it is never touched, so each request only appends to the
+    previous one and the provider can serve the shared prefix from its prompt cache. Once over
+    budget, compaction goes down to low_watermark * budget, leaving room for several turns
+    before the prefix has to change again.
+    """
+
+    def __init__(self, token_budget: int = 6000, keep_turns: int = 6, stale_tool_chars: int = 400,
+                 low_watermark: float = 0.75):
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.stale_tool_chars = stale_tool_chars
+        self.low_watermark = low_watermark
+        self._state = weakref.WeakKeyDictionary()
+        self._tasks = set()
+        self.stats = {"compactions": 0, "truncated_tool_outputs": 0, "folded_turns": 0, "summaries": 0, "summary_failures": 0}
+
+    def _session_state(self, session) -> dict:
+        state = self._state.get(session)
+        if state is None:
+            state = self._state[session] = {"pending": [], "running": False, "summary": None, "usage": Usage(), "lock": threading.Lock()}
+        return state
+
+    @staticmethod
+    def _header_length(history: List[Any]) -> int:
+        if len(history) > 1 and history[1].role == "system" and str(history[1].content).startswith(SUMMARY_PREFIX):
+            return 2
+        return 1
+
+    def estimate(self, history: List[Any]) -> int:
+        return sum(estimate_message_tokens(message) for message in history)
+
+    def _estimate_session(self, session) -> int:
+        """estimate() of the session history, from the session's counter (each message is only estimated once)."""
+        return session.tokens.count(session.history)
+
+    def compact(self, session, use_loop: bool = True):
+        """
+        Installs any finished summary, then (over budget only) truncates stale tool output and
+        folds old turns away down to the low watermark. Call between turns only.
+        use_loop=False summarizes in a thread even when a loop is running (a private, short-lived one).
+        """
+        self._install_summary(session)
+        if self._estimate_session(session) <= self.token_budget:
+            return
+
+        target = self.token_budget * self.low_watermark
+        history = session.history
+        header = self._header_length(history)
+        turns = split_turns(history[header:])
+        stale = turns[:-self.keep_turns] if self.keep_turns else turns
+        if not stale:
+            return
+
+        stale_end = header + sum(len(turn) for turn in stale)
+        for index in range(header, stale_end):
+            message = history[index]
+            content = str(message.content)
+            if message.role == "tool" and len(content) > self.stale_tool_chars and not content.endswith(TRIM_MARKER):
+                dropped = len(content) - self.stale_tool_chars
+                # Replaced, not edited: sessions cache each message's encoded JSON by identity.
+                history[index] = ToolMessage(tool_call_id=message.tool_call_id,
+                                             content=f"{content[:self.stale_tool_chars]} ...[{dropped} {TRIM_MARKER}")
+                self.stats["truncated_tool_outputs"] += 1
+        stale = split_turns(history[header:stale_end])
+
+        total = self.estimate(history)
+        if total <= target:
+            return
+
+        folded = []
+        for turn in stale:
+            if total <= target:
+                break
+            folded.extend(turn)
+            total -= self.estimate(turn)
+
+        if not folded:
+            return
+
+        session.history = history[:header] + history[header + len(folded):]
+        self.stats["compactions"] += 1
+        self.stats["folded_turns"] += sum(1 for m in folded if m.role == "user")
+        logger.info(f"🗜️ History over budget, folding {len(folded)} messages into the summary (~{total} tokens kept)")
+        self._schedule_summary(session, folded, use_loop)
+
+    def _schedule_summary(self, session, folded: List[Any], use_loop: bool = True):
+        state = self._session_state(session)
+        with state["lock"]:
+            state["pending"].extend(folded)
+            if state["running"]:
+                return
+            state["running"] = True
+
+        try:
+            loop = asyncio.get_running_loop() if use_loop else None
+        except RuntimeError:
+            loop = None
+
+        if loop is not None and session.async_client is not None:
+            task = loop.create_task(self._drain_async(session, state))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            threading.Thread(target=self._drain_sync, args=(session, state), daemon=True).start()
+
+    def _take_pending(self, state) -> Optional[List[Any]]:
+        with state["lock"]:
+            pending, state["pending"] = state["pending"], []
+            if not pending:
+                state["running"] = False
+            return pending
+
+    def _summary_request(self, session, state, pending: List[Any]) -> List[Any]:
+        with state["lock"]:
+            ready = state["summary"]
+        if ready is not None:
+            previous = ready.content
+        else:
+            previous = session.history[1].content if self._header_length(session.history) == 2 else "(none)"
+        return [
+            SystemMessage(content=SUMMARY_INSTRUCTION),
+            UserMessage(content=f"Existing summary:\n{previous}\n\nNew excerpt:\n{render_transcript(pending)}")
+        ]
+
+    def _store_summary(self, state, route, request: List[Any], response):
+        """Keeps the new summary for _install_summary(); the history itself may be mid-turn here."""
+        usage = USAGE_LEDGER.record_call(route.model, Usage.from_response(response.usage, self.estimate(request)),
+                                         purpose="history_summary")
+        text = response.choices[0].message.content or ""
+        with state["lock"]:
+            state["summary"] = SystemMessage(content=f"{SUMMARY_PREFIX} {text.strip()}")
+            state["usage"].add(usage)
+        self.stats["summaries"] += 1
+
+    def _install_summary(self, session):
+        state = self._state.get(session)
+        if state is None:
+            return
+        with state["lock"]:
+            message, state["summary"] = state["summary"], None
+            usage, state["usage"] = state["usage"], Usage()
+        session.usage.add(usage)
+        if message is None:
+            return
+        if self._header_length(session.history) == 2:
+            session.history[1] = message
+        else:
+            session.history.insert(1, message)
+
+    async def _drain_async(self, session, state):
+        while True:
+            pending = self._take_pending(state)
+            if not pending:
+                return
+            try:
+                route = session.background_route()
+                request = self._summary_request(session, state, pending)
+                response = await route.async_client.complete(messages=request, model=route.model)
+                self._store_summary(state, route, request, response)
+            except Exception as e:
+                self.stats["summary_failures"] += 1
+                logger.error(f"History summarization failed: {e}")
+
+    def _drain_sync(self, session, state):
+        while True:
+            pending = self._take_pending(state)
+            if not pending:
+                return
+            try:
+                route = session.background_route()
+                request = self._summary_request(session, state, pending)
+                response = route.client.complete(messages=request, model=route.model)
+                self._store_summary(state, route, request, response)
+            except Exception as e:
+                self.stats["summary_failures"] += 1
+                logger.error(f"History summarization failed: {e}")
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "token_budget": self.token_budget, "keep_turns": self.keep_turns, "low_watermark": self.low_watermark}
@@ -1,13 +1,38 @@
 import os
+import copy
+import time
+import types
+import uuid
 import inspect
 import json
+import asyncio
 import logging
-from typing import List, Callable, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Dict, Any, AsyncIterator, Optional, Union, get_args, get_origin
 from dataclasses import dataclass
 
 from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage, AssistantMessage, ToolMessage, ChatCompletionsToolDefinition, FunctionDefinition
-from azure.core.credentials import AzureKeyCredential
+from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+from azure.ai.inference.models import SystemMessage, UserMessage, AssistantMessage, ToolMessage, ChatCompletionsToolDefinition, FunctionDefinition, ChatCompletionsToolCall, FunctionCall
+
+from core.registry import SkillMetadata, get_skill_metadata, get_all_skills, generated_modules
+from core.scheduler import SKILL_SCHEDULER
+from core.cache import SKILL_CACHE
+from core.router import IntentRouter, IntentMatch, TRIGGER_PREFIX
+from core.tool_index import ToolIndex
+from core.history import HistoryManager
+from core.response_cache import ResponseCache
+from core.tool_plans import ToolPlanCache
+from core.transport import TRANSPORT
+from core.backends import create_clients
+from core.ratelimit import RATE_LIMITER, RateLimiter
+from core.model_routing import ModelRouter, ModelRoute
+from core.cassettes import Cassette, CassetteClient, AsyncCassetteClient
+from core.encoding import FragmentCache, EncodedMessages
+from core.prefix import PREFIX_MONITOR, PrefixMonitor, canonical_tool_order
+from core.tokens import USAGE_LEDGER, TOOL_TOKENS, TokenCounter, TokenBudgetExceeded, Usage, parse_pricing
+from core.sandbox import SANDBOX, SandboxTimeout
+from core.deployments import Deployment, DeploymentPool, PooledClient, AsyncPooledClient, parse_deployments
 
 SYSTEM_INSTRUCTION = """
 You are N.O.V.A, an advanced AI system.
@@ -20,16 +45,159 @@ GUIDELINES:
 4.  **Confirmation:** When performing an action (like turning on lights), confirm briefly (e.g., "Lights enabled.").
 """
 
+# One shared, never-edited system message: every request starts with the same bytes, which is
+# what provider-side prompt caching needs.
+SYSTEM_PROMPT = SystemMessage(content=SYSTEM_INSTRUCTION)
+
 logger = logging.getLogger("NOVA_BRAIN")
 
+# Extra seconds a process-isolated skill call gets before the session stops waiting for the sandbox.
+SANDBOX_GRACE_SECONDS = 2
+
 NOVA_CLIENT = None
 NOVA_MODEL = None
+NOVA_ENDPOINT = None
+NOVA_ENDPOINTS: List[str] = []
+NOVA_DEPLOYMENT_POOL = None
+NOVA_FAST_DEPLOYMENT_POOL = None
+NOVA_MODEL_ROUTER = None
+NOVA_CASSETTE = None
+NOVA_ASYNC_CLIENT = None
+TOOL_EXECUTOR = None
+SLOW_TOOL_EXECUTOR = None
+NOVA_ROUTER = None
+NOVA_TOOL_INDEX = None
+NOVA_HISTORY_MANAGER = None
+NOVA_RESPONSE_CACHE = None
+NOVA_TOOL_PLANS = None
+NOVA_TOOLS_MAP: Dict[str, Callable] = {}
+NOVA_TOOL_DEFINITIONS: List = []
 
 @dataclass
 class ResponseWrapper:
     text: str
     action_taken: bool
 
+
+class ToolTimeout(TimeoutError):
+    """A skill call ran past its timeout and was cancelled (async) or abandoned (threaded)."""
+
+
+class InvalidArguments(ValueError):
+    """Arguments for a direct skill call do not match the skill's signature."""
+
+MESSAGE_TYPES = {
+    "system": SystemMessage,
+    "user": UserMessage,
+    "assistant": AssistantMessage,
+    "tool": ToolMessage,
+}
+
+def history_to_dicts(history: List) -> List[Dict[str, Any]]:
+    return [message.as_dict() for message in history]
+
+def history_from_dicts(data: List[Dict[str, Any]]) -> List:
+    history = [MESSAGE_TYPES[item["role"]](item) for item in data]
+    if history and history[0].role == "system":
+        history[0] = SYSTEM_PROMPT  # a session saved under an older prompt resumes on the current prefix
+    return history
+
+class StreamedToolCalls:
+    """
+    Reassembles tool calls from streaming deltas.
+    The first fragment of a call carries its id and name, later ones only append argument text.
+    Fragments are matched by their 'index' when the service sends one, otherwise by id.
+    """
+
+    def __init__(self):
+        self._calls: List[Dict[str, str]] = []
+        self._by_index: Dict[int, Dict[str, str]] = {}
+
+    def __bool__(self):
+        return bool(self._calls)
+
+    def add(self, fragment):
+        index = fragment.get("index")
+        function = fragment.get("function") or {}
+
+        if index is not None and index in self._by_index:
+            call = self._by_index[index]
+        elif index is None and self._calls and (not fragment.get("id") or fragment.get("id") == self._calls[-1]["id"]):
+            call = self._calls[-1]
+        else:
+            call = {"id": "", "name": "", "arguments": ""}
+            self._calls.append(call)
+            if index is not None:
+                self._by_index[index] = call
+
+        if fragment.get("id"):
+            call["id"] = fragment["id"]
+        if function.get("name"):
+            call["name"] += function["name"]
+        if function.get("arguments"):
+            call["arguments"] += function["arguments"]
+
+    def build(self) -> List[ChatCompletionsToolCall]:
+        return [
+            ChatCompletionsToolCall(
+                id=call["id"],
+                function=FunctionCall(name=call["name"], arguments=call["arguments"] or "{}")
+            )
+            for call in self._calls
+        ]
+
+JSON_TYPES = {int: "integer", float: "number", bool: "boolean"}
+
+def _unwrap_optional(annotation):
+    """Optional[int] and int | None -> int; other annotations are returned unchanged."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+def _json_type(annotation) -> str:
+    return JSON_TYPES.get(_unwrap_optional(annotation), "string")
+
+def validate_arguments(func: Callable, args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Checks arguments from a direct call against the skill's signature, with the types
+    function_to_schema advertises to the model. Integers are accepted for numbers.
+    """
+    if not isinstance(args, dict):
+        raise InvalidArguments("arguments must be a JSON object")
+    params = inspect.signature(func).parameters
+    unknown = sorted(set(args) - set(params))
+    if unknown:
+        raise InvalidArguments(f"unexpected argument(s): {', '.join(unknown)}")
+
+    validated = {}
+    for name, param in params.items():
+        if name not in args:
+            if param.default is inspect.Parameter.empty:
+                raise InvalidArguments(f"missing required argument '{name}'")
+            continue
+        value = args[name]
+        optional = param.default is None or _unwrap_optional(param.annotation) is not param.annotation
+        if value is None and optional:
+            validated[name] = None
+            continue
+        expected = _json_type(param.annotation)
+        if expected == "integer":
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        elif expected == "number":
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+            value = float(value) if valid else value
+        elif expected == "boolean":
+            valid = isinstance(value, bool)
+        else:
+            # Unannotated parameters are advertised as strings but left to the skill.
+            valid = isinstance(value, str) or param.annotation is inspect.Parameter.empty
+        if not valid:
+            raise InvalidArguments(f"argument '{name}' must be {expected}, got {type(value).__name__}")
+        validated[name] = value
+    return validated
+
 def function_to_schema(func: Callable) -> ChatCompletionsToolDefinition:
     sig = inspect.signature(func)
     doc = inspect.getdoc(func) or "No description provided."
@@ -41,13 +209,7 @@ def function_to_schema(func: Callable) -> ChatCompletionsToolDefinition:
     }
     
     for param_name, param in sig.parameters.items():
-        param_type = "string" 
-        if param.annotation == int:
-            param_type = "integer"
-        elif param.annotation == float:
-            param_type = "number"
-        elif param.annotation == bool:
-            param_type = "boolean"
+        param_type = _json_type(param.annotation)
             
         parameters["properties"][param_name] = {
             "type": param_type,
@@ -66,83 +228,798 @@ def function_to_schema(func: Callable) -> ChatCompletionsToolDefinition:
     )
 
 class AzureNovaSession:
-    def __init__(self, client: ChatCompletionsClient, model_name: str, tools_map: Dict[str, Callable], tool_definitions: List):
+    def __init__(self, client: ChatCompletionsClient, model_name: str, tools_map: Dict[str, Callable], tool_definitions: List,
+                 async_client: AsyncChatCompletionsClient = None, tool_executor: ThreadPoolExecutor = None, max_parallel_tools: int = 4,
+                 slow_tool_executor: ThreadPoolExecutor = None,
+                 router: IntentRouter = None, tool_index: ToolIndex = None, history_manager: HistoryManager = None,
+                 response_cache: ResponseCache = None, model_router: ModelRouter = None, cassette: Cassette = None,
+                 request_token_budget: int = 0, tool_timeout: float = 0, tool_plans: ToolPlanCache = None):
         self.client = client
+        self.async_client = async_client
         self.model_name = model_name
-        self.history = [SystemMessage(content=SYSTEM_INSTRUCTION)]
+        self.history = [SYSTEM_PROMPT]
         self.tools_map = tools_map
         self.tool_definitions = tool_definitions
+        self.max_parallel_tools = max(1, max_parallel_tools)
+        self.tool_executor = tool_executor or ThreadPoolExecutor(max_workers=self.max_parallel_tools, thread_name_prefix="nova-tool")
+        self.slow_tool_executor = slow_tool_executor
+        self.router = router
+        self.tool_index = tool_index
+        self.history_manager = history_manager
+        self.response_cache = response_cache
+        self.tool_plans = tool_plans
+        self.model_router = model_router
+        self.request_token_budget = request_token_budget
+        self.tool_timeout = tool_timeout
+        self.turn_start = None
+        self.tool_tasks: List[asyncio.Task] = []
+        self.timings: Dict[str, float] = {}
+        self.usage = Usage()
+        self.tokens = TokenCounter()
+        self.encoded = FragmentCache()
+        self.prefix = None
+        self.offered_tools = None
+        self.cassette = None
+        if cassette is not None:
+            self._use_cassette(cassette)
+
+    def fork(self) -> "AzureNovaSession":
+        """Returns a new session sharing this one's clients, tools and router, with a fresh history."""
+        session = copy.copy(self)
+        session.history = [SYSTEM_PROMPT]
+        session.timings = {}
+        session.usage = Usage()
+        session.tokens = TokenCounter()
+        session.encoded = FragmentCache()
+        session.prefix = None
+        session.offered_tools = None
+        session.turn_start = None
+        session.tool_tasks = []
+        return session
 
-    def send_message(self, text: str):
+    def _use_cassette(self, cassette: Cassette):
+        if isinstance(self.client, CassetteClient):
+            self.client, self.async_client = self.client.client, self.async_client.client
+        self.cassette = cassette
+        self.client = cassette.wrap(self.client)
+        self.async_client = cassette.wrap_async(self.async_client)
+
+    def with_cassette(self, cassette: Cassette) -> "AzureNovaSession":
+        """Fork that records its LLM calls to (or replays them from) the given cassette."""
+        session = self.fork()
+        session._use_cassette(cassette)
+        return session
+
+    def _request_messages(self) -> EncodedMessages:
+        """The history as sent to the LLM: only messages added since the last call get serialized."""
+        return EncodedMessages(self.history, self.encoded)
+
+    def _estimate_request(self, tools) -> int:
+        """
+        Local prompt-token estimate for the next call (history + tool definitions), counting only
+        messages added since the previous call. Refuses the call when it would exceed the request
+        budget, rolling the turn back so the refused message does not stay in history.
+        """
+        estimate = self.tokens.count(self.history) + TOOL_TOKENS.count(tools or [])
+        if self.request_token_budget and estimate > self.request_token_budget:
+            self._abandon_turn()
+            raise TokenBudgetExceeded(f"Request needs ~{estimate} prompt tokens, over the {self.request_token_budget} token budget")
+        return estimate
+
+    def _begin_turn(self, text: str):
+        """Appends the user message, remembering where this exchange starts in case it is cancelled."""
+        self.turn_start = len(self.history)
         self.history.append(UserMessage(content=text))
-        
+
+    def _abandon_turn(self):
+        """
+        Cancelled mid-exchange (client went away): stops the turn's skill tasks and drops its
+        partial messages, so the next request does not send a tool call without its result.
+        """
+        for task in self.tool_tasks:
+            task.cancel()
+        self.tool_tasks = []
+        if self.turn_start is not None:
+            del self.history[self.turn_start:]
+            self.turn_start = None
+
+    def _compact_history(self, use_loop: bool = True):
+        if self.history_manager is not None:
+            self.history_manager.compact(self, use_loop=use_loop)
+
+    def _select_tools(self, text: str):
+        """
+        Tool definitions to offer for this message: the most relevant ones for the new text and the
+        previous user message, plus whatever tools the previous exchange used (for follow-ups).
+        The session's previous list is kept while it covers them, so its prefix stays the same.
+        Must be called before the new UserMessage is appended.
+        """
+        if not self.tool_definitions:
+            return None
+        if self.tool_index is None:
+            return self.tool_definitions
+
+        query = [text]
+        recent_tools = set()
+        for message in reversed(self.history):
+            if message.role == "user":
+                query.append(message.content or "")
+                break
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                recent_tools.add(tool_call.function.name)
+
+        self.offered_tools = self.tool_index.select(" ".join(query), always_include=recent_tools, previous=self.offered_tools)
+        return self.offered_tools or None
+
+    def _note_prefix(self, tools):
+        """Counts requests whose prefix (tools + system prompt) differs from this session's previous one."""
+        prefix = PrefixMonitor.fingerprint(tools, self.history[0].content)
+        if self.prefix is not None and prefix != self.prefix:
+            PREFIX_MONITOR.prefix_changed()
+        self.prefix = prefix
+
+    def _classify(self, text: str):
+        """(simple, reason) for the fast/large model choice. Must be called before the UserMessage is appended."""
+        if self.model_router is None:
+            return False, "single model"
+        return self.model_router.classify(text, self.history, self.tool_index)
+
+    def _route(self, simple: bool) -> ModelRoute:
+        if simple and self.model_router is not None:
+            route = self.model_router.fast_route
+            if self.cassette is not None:
+                return ModelRoute(route.name, route.model, self.cassette.wrap(route.client), self.cassette.wrap_async(route.async_client))
+            return route
+        return ModelRoute("large", self.model_name, self.client, self.async_client)
+
+    def background_route(self) -> ModelRoute:
+        """Route for housekeeping calls such as history summaries: the fast model when one is configured."""
+        return self._route(True)
+
+    def _after_tool_round(self, simple: bool, reason: str, tool_rounds: int):
+        if self.model_router is None or not simple:
+            return simple, reason
+        if not self.model_router.escalate(simple, tool_rounds):
+            return False, "escalated"
+        return simple, reason
+
+    def _record_route(self, route: ModelRoute, reason: str, started: float, prompt_estimate: int, usage=None):
+        elapsed = time.perf_counter() - started
+        PREFIX_MONITOR.record(usage, route.model)
+        # Providers that omit usage (some streams) are counted from the local estimate.
+        self.usage.add(USAGE_LEDGER.record_call(route.model, Usage.from_response(usage, prompt_estimate)))
+        self.timings["llm"] = self.timings.get("llm", 0.0) + elapsed
+        if self.model_router is not None:
+            self.model_router.record(route, reason, elapsed, prompt_estimate, self.model_name)
+
+    def _record_tools(self, started: float):
+        self.timings["tools"] = self.timings.get("tools", 0.0) + time.perf_counter() - started
+
+    def _lookup_response(self, text: str, use_cache: bool = True):
+        """
+        Returns (cache key, cached ResponseWrapper or None). On a hit the exchange is recorded in history.
+        Must be called before the new UserMessage is appended.
+        """
+        if self.response_cache is None:
+            return None, None
+
+        previous_reply = next((m.content for m in reversed(self.history) if m.role == "assistant" and m.content), None)
+        key = self.response_cache.make_key(text, self.model_name, previous_reply, self.encoded.join(self.history))
+        entry = self.response_cache.get(key) if use_cache else None
+        if entry is None:
+            return key, None
+
+        logger.info(f"💾 Response cache hit (tools: {', '.join(entry.tools) or 'none'})")
+        self.history.extend([UserMessage(content=text), AssistantMessage(content=entry.text)])
+        return key, ResponseWrapper(text=entry.text, action_taken=entry.action_taken)
+
+    def _store_response(self, key, response: ResponseWrapper, tools_called: List[str]):
+        if self.response_cache is not None and key is not None:
+            self.response_cache.put(key, response.text, response.action_taken, tools_called)
+
+    def _lookup_plan(self, text: str):
+        """
+        Returns (plan key, tool calls to run instead of the model's first turn, or None).
+        Must be called before the new UserMessage is appended.
+        """
+        if self.tool_plans is None:
+            return None, None
+        key = self.tool_plans.make_key(text)
+        plan = self.tool_plans.lookup(key, self.tools_map)
+        if plan is None:
+            return key, None
+        logger.info(f"🗺️ Tool plan hit: {', '.join(plan.skills)}")
+        return key, [
+            ChatCompletionsToolCall(id=f"plan_{uuid.uuid4().hex[:12]}", function=FunctionCall(name=name, arguments=arguments))
+            for name, arguments in plan.calls
+        ]
+
+    def _observe_plan(self, key, tool_calls):
+        if self.tool_plans is not None:
+            self.tool_plans.observe(key, tool_calls, self.tools_map)
+
+    def _finish_plan(self, results: List[str]):
+        """With reply="template", answers a plan hit from its tool results; otherwise None and the LLM phrases it."""
+        if self.tool_plans is None or self.tool_plans.reply != "template":
+            return None
+        reply = "\n".join(TRIGGER_PREFIX.sub("", result) for result in results)
+        self.history.append(AssistantMessage(content=reply))
+        return ResponseWrapper(text=reply, action_taken=True)
+
+    def _match_fast_path(self, text: str):
+        """Returns (IntentMatch, tool call) when the local router can answer without the LLM."""
+        if self.router is None:
+            return None
+        match = self.router.match(text)
+        if match is None:
+            return None
+        tool_call = ChatCompletionsToolCall(
+            id=f"fastpath_{uuid.uuid4().hex[:12]}",
+            function=FunctionCall(name=match.skill, arguments=json.dumps(match.args))
+        )
+        return match, tool_call
+
+    def _finish_fast_path(self, text: str, match: IntentMatch, tool_call, result: str) -> ResponseWrapper:
+        reply = match.render_reply(result)
+        logger.info(f"⚡ Fast path: {match.skill} -> {result}")
+        # Record it as a regular tool turn so the LLM sees consistent history on the next message.
+        self.history.extend([
+            UserMessage(content=text),
+            AssistantMessage(tool_calls=[tool_call]),
+            ToolMessage(tool_call_id=tool_call.id, content=result),
+            AssistantMessage(content=reply)
+        ])
+        return ResponseWrapper(text=reply, action_taken=True)
+
+    def _tool_timeout(self, meta: SkillMetadata) -> float:
+        """Seconds a skill call may take: its own timeout, else the session default; 0 = unlimited."""
+        if meta.timeout is not None:
+            return meta.timeout
+        return self.tool_timeout
+
+    def _executor(self, meta: SkillMetadata) -> ThreadPoolExecutor:
+        """Slow skills get their own threads, so a few of them (or abandoned ones) cannot starve quick skills."""
+        if meta.latency == "slow" and self.slow_tool_executor is not None:
+            return self.slow_tool_executor
+        return self.tool_executor
+
+    @staticmethod
+    def _call_skill(meta: SkillMetadata, func: Callable, args: Dict[str, Any], timeout: float, submitted: Optional[float] = None):
+        """Runs one skill call in the current thread, once the scheduler admits it."""
+        with SKILL_SCHEDULER.hold(meta):
+            if meta.execution == "process":
+                if timeout > 0 and submitted is not None:
+                    # Time spent queued for a thread or a gate counts against the call.
+                    timeout -= time.monotonic() - submitted
+                    if timeout <= 0:
+                        raise SandboxTimeout(f"{func.__name__} timed out before a sandbox worker was free")
+                # The pool kills a worker that overruns, so the timeout really stops the skill.
+                return SANDBOX.call(func, args, timeout)
+            return func(**args)
+
+    async def _invoke_async(self, func: Callable, args: Dict[str, Any], timeout: float, meta: SkillMetadata):
+        if meta.execution == "loop":
+            async def run():
+                async with SKILL_SCHEDULER.hold_async(meta):
+                    return await func(**args)
+            call = run()
+        else:
+            hung = SKILL_SCHEDULER.hung_by(meta)
+            if hung is not None:
+                raise ToolTimeout(f"{func.__name__} is unavailable, an earlier {hung} call timed out and has not returned yet")
+            # Sync skills block (HTTP, psutil sampling, subprocess), keep them off the event loop.
+            future = self._executor(meta).submit(self._call_skill, meta, func, args, timeout, time.monotonic())
+            call = asyncio.wrap_future(future)
+        if timeout <= 0:
+            return await call
+        # The sandbox enforces a process skill's timeout itself (and kills the worker), so this is
+        # only a backstop there, e.g. for a call still waiting on a scheduler gate.
+        limit = timeout + SANDBOX_GRACE_SECONDS if meta.execution == "process" else timeout
+        try:
+            # Cancels a coroutine skill; a threaded one cannot be stopped and is abandoned.
+            return await asyncio.wait_for(call, limit)
+        except asyncio.TimeoutError:
+            if meta.execution != "loop":
+                SKILL_SCHEDULER.abandon(meta, future)
+            raise ToolTimeout(f"{func.__name__} timed out after {timeout:g}s") from None
+
+    async def invoke_skill_async(self, name: str, args: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Calls one skill without the model, for GUI controls and other programmatic callers. The
+        call shares the result cache, scheduler and timeout of model-issued calls. Raises KeyError
+        for an unknown skill and InvalidArguments for bad arguments; a failing skill is reported
+        in the returned status.
+        """
+        func = self.tools_map.get(name)
+        if func is None:
+            raise KeyError(name)
+        args = validate_arguments(func, args)
+        meta = get_skill_metadata(name) or SkillMetadata(name=name)
+        timeout = self._tool_timeout(meta)
+        ran = False
+
+        async def run():
+            nonlocal ran
+            ran = True
+            return await self._invoke_async(func, args, timeout, meta)
+
+        started = time.perf_counter()
+        outcome = {"skill": name, "status": "ok", "result": None, "error": None, "cached": False}
+        try:
+            if use_cache and meta.cacheable:
+                outcome["result"] = await SKILL_CACHE.get_or_run_async(meta, args, run)
+                outcome["cached"] = not ran  # served from the cache or by an identical call in flight
+            else:
+                outcome["result"] = await run()
+        except (ToolTimeout, SandboxTimeout) as e:
+            outcome.update(status="timeout", error=str(e))
+        except Exception as e:
+            outcome.update(status="error", error=f"{type(e).__name__}: {e}")
+        outcome["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return outcome
+
+    async def _run_tool_async(self, tool_call, use_cache: bool = True) -> str:
+        func_name = tool_call.function.name
+        if func_name not in self.tools_map:
+            return f"Error: Function {func_name} not found."
+        if self.cassette is not None and self.cassette.stub_tools:
+            return self.cassette.tool_result(tool_call)
+
+        try:
+            args = json.loads(tool_call.function.arguments)
+            logger.info(f"🛠️ Executing {func_name} with {args}")
+            func = self.tools_map[func_name]
+            meta = get_skill_metadata(func_name) or SkillMetadata(name=func_name)
+            timeout = self._tool_timeout(meta)
+            if use_cache and meta.cacheable:
+                result = await SKILL_CACHE.get_or_run_async(meta, args, lambda: self._invoke_async(func, args, timeout, meta))
+            else:
+                result = await self._invoke_async(func, args, timeout, meta)
+        except (ToolTimeout, SandboxTimeout) as e:
+            logger.warning(f"⏱️ {e}")
+            result = f"Error: {e}."
+        except Exception as e:
+            result = f"Error executing {func_name}: {str(e)}"
+        result = str(result)
+        USAGE_LEDGER.record_tool(func_name, result)
+        return result
+
+    @staticmethod
+    def _has_side_effects(tool_call) -> bool:
+        meta = get_skill_metadata(tool_call.function.name)
+        return meta is not None and not meta.idempotent
+
+    def _start_tools_async(self, tool_calls, use_cache: bool = True) -> List[asyncio.Task]:
+        """
+        Schedules one turn's tool calls as tasks, at most max_parallel_tools running at once.
+        Calls with side effects each wait for the previous one, keeping the LLM's order.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+
+        async def run(tool_call, after):
+            if after is not None:
+                await asyncio.wait({after})
+            async with semaphore:
+                return await self._run_tool_async(tool_call, use_cache)
+
+        self.tool_tasks, previous = [], None
+        for tool_call in tool_calls:
+            ordered = self._has_side_effects(tool_call)
+            task = asyncio.create_task(run(tool_call, previous if ordered else None))
+            if ordered:
+                previous = task
+            self.tool_tasks.append(task)
+        return self.tool_tasks
+
+    def send_message(self, text: str, use_cache: bool = True) -> ResponseWrapper:
+        """
+        Blocking variant of send_message_async for callers without an event loop. Runs the same
+        exchange on a private loop, making the LLM calls through the sync clients (the aio ones
+        belong to the backend's loop). Called from inside a running loop, the private loop gets
+        a thread of its own.
+        """
+        def run():
+            return asyncio.run(self._respond(self._exchange(text, use_cache, blocking=True)))
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return run()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="nova-sync") as pool:
+            return pool.submit(run).result()
+
+    async def send_message_async(self, text: str, use_cache: bool = True) -> ResponseWrapper:
+        """
+        Non-blocking variant of send_message for the FastAPI event loop.
+        LLM round-trips go through the aio client and sync skills run in worker threads.
+        use_cache=False bypasses the skill result cache for this message.
+        Cancelling it stops the in-flight LLM call and skills and leaves the history as it was.
+        """
+        try:
+            return await self._respond(self._exchange(text, use_cache))
+        except asyncio.CancelledError:
+            self._abandon_turn()
+            raise
+
+    async def stream_message(self, text: str, use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of send_message_async. Yields events as they happen:
+        'delta' (text fragment), 'tool_start', 'tool_end' and finally 'final'.
+        Closing the stream before 'final' abandons the exchange like a cancelled send_message_async.
+        """
+        events = self._exchange(text, use_cache, stream=True)
+        finished = False
+        try:
+            async for event in events:
+                finished = event["type"] == "final"
+                yield event
+        except (asyncio.CancelledError, GeneratorExit):
+            if not finished:
+                self._abandon_turn()
+            raise
+        finally:
+            await events.aclose()
+
+    @staticmethod
+    async def _respond(events: AsyncIterator[Dict[str, Any]]) -> ResponseWrapper:
+        """Runs an exchange to its 'final' event."""
+        try:
+            async for event in events:
+                if event["type"] == "final":
+                    return ResponseWrapper(text=event["response"], action_taken=event["action_taken"])
+        finally:
+            await events.aclose()
+
+    def _final(self, response: ResponseWrapper, **extra) -> Dict[str, Any]:
+        return {"type": "final", "response": response.text, "action_taken": response.action_taken,
+                "usage": self.usage.as_dict(), **extra}
+
+    async def _complete(self, route: ModelRoute, tools, stream: bool, blocking: bool):
+        """One LLM call on the route: through the aio client, or the sync one in a worker thread."""
+        if blocking:
+            return await asyncio.to_thread(route.client.complete, messages=self._request_messages(), tools=tools, model=route.model)
+        if stream:
+            return await route.async_client.complete(stream=True, messages=self._request_messages(), tools=tools, model=route.model)
+        return await route.async_client.complete(messages=self._request_messages(), tools=tools, model=route.model)
+
+    async def _exchange(self, text: str, use_cache: bool, stream: bool = False,
+                        blocking: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        One user message, start to finish: local fast path, response cache, then model and tool
+        rounds. Yields 'delta', 'tool_start' and 'tool_end' events and ends with 'final'.
+        stream: the model's text is yielded as it arrives (otherwise once per model call).
+        blocking: LLM calls go through the sync clients (send_message, sessions without aio client).
+        """
+        if self.async_client is None:
+            stream, blocking = False, True
+
+        self.timings = {}
+        self.usage = Usage()
+        self.turn_start = None
+        self._compact_history(use_loop=not blocking)
+        fast_path = self._match_fast_path(text)
+        if fast_path:
+            match, tool_call = fast_path
+            yield {"type": "tool_start", "id": tool_call.id, "name": match.skill, "arguments": tool_call.function.arguments}
+            tools_started = time.perf_counter()
+            result = await self._run_tool_async(tool_call, use_cache)
+            self._record_tools(tools_started)
+            yield {"type": "tool_end", "id": tool_call.id, "name": match.skill, "result": result}
+            response = self._finish_fast_path(text, match, tool_call, result)
+            yield {"type": "delta", "text": response.text}
+            yield self._final(response)
+            return
+
+        cache_key, cached = self._lookup_response(text, use_cache)
+        if cached:
+            yield {"type": "delta", "text": cached.text}
+            yield self._final(cached, cached=True)
+            return
+
+        tools = self._select_tools(text)
+        self._note_prefix(tools)
+        simple, reason = self._classify(text)
+        plan_key, planned = self._lookup_plan(text)
+        plan_hit = planned is not None
+        self._begin_turn(text)
+
         max_turns = 5
         tool_used = False
-        
-        for _ in range(max_turns):
-            response = self.client.complete(
-                messages=self.history,
-                tools=self.tool_definitions if self.tool_definitions else None,
-                model=self.model_name
-            )
-            
-            choice = response.choices[0]
-            
-            if choice.message.tool_calls:
+        tools_called = []
+
+        for turn in range(max_turns):
+            content = ""
+            if planned:
+                tool_calls, planned = planned, None
+            else:
+                route = self._route(simple)
+                prompt_estimate = self._estimate_request(tools)
+                started = time.perf_counter()
+                response = await self._complete(route, tools, stream, blocking)
+
+                if stream:
+                    content_parts = []
+                    pending_calls = StreamedToolCalls()
+                    usage = None
+                    async with response:
+                        async for update in response:
+                            usage = update.get("usage") or usage  # only sent by providers that stream usage
+                            if not update.choices or update.choices[0].delta is None:
+                                continue
+                            delta = update.choices[0].delta
+
+                            if delta.content:
+                                content_parts.append(delta.content)
+                                yield {"type": "delta", "text": delta.content}
+
+                            for fragment in delta.tool_calls or []:
+                                pending_calls.add(fragment)
+                    content = "".join(content_parts)
+                    tool_calls = pending_calls.build() if pending_calls else None
+                else:
+                    usage = response.usage
+                    message = response.choices[0].message
+                    content, tool_calls = message.content or "", message.tool_calls
+                    if content:
+                        yield {"type": "delta", "text": content}
+
+                self._record_route(route, reason, started, prompt_estimate, usage)
+                if turn == 0:
+                    self._observe_plan(plan_key, tool_calls)
+
+            if tool_calls:
                 tool_used = True
-                self.history.append(AssistantMessage(tool_calls=choice.message.tool_calls))
-                
-                for tool_call in choice.message.tool_calls:
-                    func_name = tool_call.function.name
-                    args_json = tool_call.function.arguments
-                    
-                    if func_name in self.tools_map:
-                        try:
-                            args = json.loads(args_json)
-                            logger.info(f"🛠️ Executing {func_name} with {args}")
-                            
-                            result = self.tools_map[func_name](**args)
-                            
-                        except Exception as e:
-                            result = f"Error executing {func_name}: {str(e)}"
-                    else:
-                        result = f"Error: Function {func_name} not found."
-                    
-                    self.history.append(ToolMessage(tool_call_id=tool_call.id, content=str(result)))
-                
+                tools_called.extend(tool_call.function.name for tool_call in tool_calls)
+                self.history.append(AssistantMessage(content=content or None, tool_calls=tool_calls))
+
+                for tool_call in tool_calls:
+                    yield {"type": "tool_start", "id": tool_call.id, "name": tool_call.function.name, "arguments": tool_call.function.arguments}
+
+                tools_started = time.perf_counter()
+                tasks = self._start_tools_async(tool_calls, use_cache)
+                task_calls = dict(zip(tasks, tool_calls))
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        tool_call = task_calls[task]
+                        yield {"type": "tool_end", "id": tool_call.id, "name": tool_call.function.name, "result": task.result()}
+                self._record_tools(tools_started)
+
+                results = [task.result() for task in tasks]
+                for tool_call, result in zip(tool_calls, results):
+                    self.history.append(ToolMessage(tool_call_id=tool_call.id, content=result))
+
+                if turn == 0 and plan_hit:
+                    response = self._finish_plan(results)
+                    if response is not None:
+                        self._store_response(cache_key, response, tools_called)
+                        yield {"type": "delta", "text": response.text}
+                        yield self._final(response)
+                        return
+
+                simple, reason = self._after_tool_round(simple, reason, turn + 1)
                 continue
-            
-            else:
-                final_text = choice.message.content
-                self.history.append(AssistantMessage(content=final_text))
-                
-                return ResponseWrapper(text=final_text, action_taken=tool_used)
-                
-        return ResponseWrapper(text="I'm sorry, I got stuck in a loop processing your request.", action_taken=True)
+
+            self.history.append(AssistantMessage(content=content))
+            response = ResponseWrapper(text=content, action_taken=tool_used)
+            self._store_response(cache_key, response, tools_called)
+            yield self._final(response)
+            return
+
+        # Never cached: the same message may well succeed next time.
+        response = ResponseWrapper(text="I'm sorry, I got stuck in a loop processing your request.", action_taken=True)
+        self.history.append(AssistantMessage(content=response.text))
+        yield {"type": "delta", "text": response.text}
+        yield self._final(response)
+
+
+def _connect(backend: str, deployments, key: str, limits: Dict[str, Any], limiter: RateLimiter):
+    """
+    Sync and async clients for an ordered deployment list: plain clients for one deployment,
+    pooled (hedging) clients for several. Returns (client, async_client, pool or None, endpoints).
+    """
+    members = []
+    for position, (name, base_endpoint) in enumerate(deployments):
+        # Each deployment has its own quota, so backups get their own limiter.
+        member_limiter = limiter if position == 0 else RateLimiter(**limits)
+        client, async_client, endpoint = create_clients(backend, name, base_endpoint, key, member_limiter)
+        members.append(Deployment(name, endpoint, client, async_client, member_limiter))
+
+    endpoints = [member.endpoint for member in members]
+    if len(members) == 1:
+        return members[0].client, members[0].async_client, None, endpoints
+
+    pool = DeploymentPool(
+        members,
+        hedge_percentile=float(os.getenv("NOVA_HEDGE_PERCENTILE", 95)),
+        hedge_default_delay=float(os.getenv("NOVA_HEDGE_DELAY", 2.0))
+    )
+    logger.info(f"🛰️ Deployment pool: {', '.join(member.name for member in members)}")
+    return PooledClient(pool), AsyncPooledClient(pool), pool, endpoints
+
+
+def _backend_settings(backend: str):
+    """Default (endpoint, key) for deployments on a backend that don't name their own endpoint."""
+    if backend == "openai":
+        return os.getenv("OPENAI_COMPAT_BASE_URL"), os.getenv("OPENAI_COMPAT_API_KEY", "")
+    return os.getenv("AZURE_INFERENCE_ENDPOINT"), os.getenv("AZURE_INFERENCE_CREDENTIAL")
 
 
 def initialize_brain(tools_list: List[Callable]):
-    global NOVA_CLIENT, NOVA_MODEL
-    endpoint = os.getenv("AZURE_INFERENCE_ENDPOINT")
-    key = os.getenv("AZURE_INFERENCE_CREDENTIAL")
-    model_name = os.getenv("LLM_MODEL", "gpt-4o") 
+    global NOVA_CLIENT, NOVA_MODEL, NOVA_ENDPOINT, NOVA_DEPLOYMENT_POOL, NOVA_FAST_DEPLOYMENT_POOL, NOVA_MODEL_ROUTER, NOVA_CASSETTE, NOVA_ASYNC_CLIENT, TOOL_EXECUTOR, SLOW_TOOL_EXECUTOR, NOVA_ROUTER, NOVA_TOOL_INDEX, NOVA_HISTORY_MANAGER, NOVA_RESPONSE_CACHE, NOVA_TOOL_PLANS
+    backend = os.getenv("LLM_BACKEND", "azure").lower()
+    fast_backend = os.getenv("LLM_FAST_BACKEND", backend).lower()
+    endpoint, key = _backend_settings(backend)
+    model_spec = os.getenv("LLM_MODEL", "gpt-4o")
+    max_parallel_tools = int(os.getenv("NOVA_MAX_PARALLEL_TOOLS", 4))
+    tool_threads = int(os.getenv("NOVA_TOOL_THREADS", 16))
+    fast_path_enabled = os.getenv("NOVA_FAST_PATH", "true").lower() == "true"
+    tool_top_k = int(os.getenv("NOVA_TOOL_TOP_K", 8))
+    tool_timeout = float(os.getenv("NOVA_TOOL_TIMEOUT", 30))
+    history_budget = int(os.getenv("NOVA_HISTORY_TOKEN_BUDGET", 6000))
+    history_keep_turns = int(os.getenv("NOVA_HISTORY_KEEP_TURNS", 6))
+    response_cache_enabled = os.getenv("NOVA_RESPONSE_CACHE", "false").lower() == "true"
+    tool_plans_enabled = os.getenv("NOVA_TOOL_PLANS", "false").lower() == "true"
+    cassette_mode = os.getenv("NOVA_CASSETTE_MODE", "off").lower()
+    request_token_budget = int(os.getenv("NOVA_REQUEST_TOKEN_BUDGET", 0))
 
-    if not endpoint or not key:
+    if backend == "azure" and (not endpoint or not key):
         raise ValueError("CRITICAL: Missing AZURE_INFERENCE_ENDPOINT or AZURE_INFERENCE_CREDENTIAL in .env")
+    if backend == "openai" and not endpoint:
+        raise ValueError("CRITICAL: Missing OPENAI_COMPAT_BASE_URL in .env")
 
-    full_endpoint = f"{endpoint.rstrip('/')}/deployments/{model_name}"
+    deployments = parse_deployments(model_spec, endpoint)
+    model_name = deployments[0][0]
 
-    print(f"Initializing Azure AI Foundry with model: {model_name}")
+    if backend == "azure":
+        print(f"Initializing Azure AI Foundry with model: {model_name}")
+    else:
+        print(f"Initializing OpenAI-compatible backend at {endpoint} with model: {model_name}")
 
-    client = ChatCompletionsClient(
-        endpoint=full_endpoint,
-        credential=AzureKeyCredential(key)
+    TRANSPORT.configure(
+        pool_size=int(os.getenv("NOVA_HTTP_POOL_SIZE", 20)),
+        keepalive=float(os.getenv("NOVA_HTTP_KEEPALIVE", 120)),
+        idle_ping=float(os.getenv("NOVA_HTTP_IDLE_PING", 90))
+    )
+    limits = dict(
+        rpm=int(os.getenv("NOVA_RATE_LIMIT_RPM", 0)),
+        tpm=int(os.getenv("NOVA_RATE_LIMIT_TPM", 0)),
+        max_retries=int(os.getenv("NOVA_RETRY_MAX", 4)),
+        deadline=float(os.getenv("NOVA_RETRY_DEADLINE", 30))
     )
+    RATE_LIMITER.configure(**limits)
+    client, async_client, NOVA_DEPLOYMENT_POOL, endpoints = _connect(backend, deployments, key, limits, RATE_LIMITER)
+
+    fast_endpoint, fast_key = _backend_settings(fast_backend)
+    fast_deployments = parse_deployments(os.getenv("LLM_FAST_MODEL", ""), fast_endpoint)
+    if fast_deployments:
+        # The fast deployment has its own quota, so it gets its own limiter.
+        fast_client, fast_async_client, NOVA_FAST_DEPLOYMENT_POOL, fast_endpoints = _connect(
+            fast_backend, fast_deployments, fast_key, limits, RateLimiter(**limits))
+        endpoints += fast_endpoints
+        NOVA_MODEL_ROUTER = ModelRouter(
+            ModelRoute("fast", fast_deployments[0][0], fast_client, fast_async_client),
+            policy=os.getenv("NOVA_MODEL_ROUTING", "auto").lower(),
+            max_tokens=int(os.getenv("NOVA_FAST_MAX_TOKENS", 32)),
+            max_tools=int(os.getenv("NOVA_FAST_MAX_TOOLS", 2)),
+            max_depth=int(os.getenv("NOVA_FAST_MAX_DEPTH", 8))
+        )
+        logger.info(f"🧭 Model routing: {NOVA_MODEL_ROUTER.policy} (fast={fast_deployments[0][0]}, large={model_name})")
     
+    NOVA_ENDPOINT = endpoints[0]
+    NOVA_ENDPOINTS[:] = endpoints
     NOVA_CLIENT = client
     NOVA_MODEL = model_name
+    NOVA_ASYNC_CLIENT = async_client
+    TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=tool_threads, thread_name_prefix="nova-tool")
+    SLOW_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("NOVA_SLOW_TOOL_THREADS", 4)), thread_name_prefix="nova-slow-tool")
+
+    NOVA_ROUTER = IntentRouter() if fast_path_enabled else None
+    NOVA_TOOL_INDEX = ToolIndex(top_k=tool_top_k) if tool_top_k > 0 else None
+    NOVA_HISTORY_MANAGER = HistoryManager(
+        token_budget=history_budget,
+        keep_turns=history_keep_turns,
+        low_watermark=float(os.getenv("NOVA_HISTORY_LOW_WATERMARK", 0.75))
+    ) if history_budget > 0 else None
+    NOVA_RESPONSE_CACHE = ResponseCache(
+        default_ttl=float(os.getenv("NOVA_RESPONSE_CACHE_TTL", 3600)),
+        max_entries=int(os.getenv("NOVA_RESPONSE_CACHE_SIZE", 512)),
+        disk_path=os.getenv("NOVA_RESPONSE_CACHE_FILE") or None
+    ) if response_cache_enabled else None
+    NOVA_TOOL_PLANS = ToolPlanCache(
+        min_observations=int(os.getenv("NOVA_TOOL_PLAN_MIN_OBSERVATIONS", 3)),
+        max_entries=int(os.getenv("NOVA_TOOL_PLAN_SIZE", 512)),
+        reply=os.getenv("NOVA_TOOL_PLAN_REPLY", "llm").lower()
+    ) if tool_plans_enabled else None
+    NOVA_CASSETTE = Cassette(
+        os.getenv("NOVA_CASSETTE_FILE", "cassettes/session.jsonl"),
+        mode=cassette_mode,
+        stub_tools=os.getenv("NOVA_CASSETTE_TOOLS", "real").lower() == "stub"
+    ) if cassette_mode != "off" else None
+    if NOVA_CASSETTE is not None:
+        logger.info(f"📼 Cassette {NOVA_CASSETTE.mode}: {NOVA_CASSETTE.path}")
+    SANDBOX.configure(
+        workers=int(os.getenv("NOVA_SANDBOX_WORKERS", 2)),
+        cpu_seconds=float(os.getenv("NOVA_SANDBOX_CPU_SECONDS", 10)),
+        memory_mb=int(os.getenv("NOVA_SANDBOX_MEMORY_MB", 512)),
+        max_result_chars=int(os.getenv("NOVA_SANDBOX_MAX_RESULT_CHARS", 20000))
+    )
+    USAGE_LEDGER.configure(
+        pricing=parse_pricing(os.getenv("NOVA_PRICING", "")),
+        session_token_budget=int(os.getenv("NOVA_SESSION_TOKEN_BUDGET", 0))
+    )
+    refresh_tools(tools_list)
+
+    return AzureNovaSession(client, model_name, NOVA_TOOLS_MAP, NOVA_TOOL_DEFINITIONS, async_client=async_client,
+                            tool_executor=TOOL_EXECUTOR, max_parallel_tools=max_parallel_tools,
+                            slow_tool_executor=SLOW_TOOL_EXECUTOR,
+                            router=NOVA_ROUTER, tool_index=NOVA_TOOL_INDEX, history_manager=NOVA_HISTORY_MANAGER,
+                            response_cache=NOVA_RESPONSE_CACHE, model_router=NOVA_MODEL_ROUTER, cassette=NOVA_CASSETTE,
+                            request_token_budget=request_token_budget, tool_timeout=tool_timeout, tool_plans=NOVA_TOOL_PLANS)
+
+
+def refresh_tools(tools_list: List[Callable] = None):
+    """
+    Loads the given skills (default: everything in the registry) into the shared tools map,
+    tool definitions, fast-path router and tool index. Live sessions see the change immediately.
+    """
+    if tools_list is None:
+        tools_list = get_all_skills()
+
+    NOVA_TOOLS_MAP.clear()
+    NOVA_TOOLS_MAP.update({func.__name__: func for func in tools_list})
+    metadata = [get_skill_metadata(name) for name in NOVA_TOOLS_MAP]
+    pinned = [meta.name for meta in metadata if meta and meta.pinned]
+    NOVA_TOOL_DEFINITIONS[:] = canonical_tool_order([function_to_schema(func) for func in tools_list], pinned)
+
+    if NOVA_ROUTER is not None:
+        NOVA_ROUTER.load(NOVA_TOOLS_MAP)
+        logger.info(f"⚡ Fast path router compiled {len(NOVA_ROUTER)} intents")
+
+    if NOVA_TOOL_INDEX is not None:
+        NOVA_TOOL_INDEX.rebuild(NOVA_TOOL_DEFINITIONS, pinned=pinned)
+
+    for meta in metadata:
+        if meta and NOVA_TOOLS_MAP[meta.name].__module__ in generated_modules():
+            meta.isolation = "process"  # even if the generated module rewrote its own metadata
+    isolated = {NOVA_TOOLS_MAP[meta.name].__module__ for meta in metadata if meta and meta.execution == "process"}
+    if isolated:
+        SANDBOX.start(isolated)
+
+
+async def warm_up_brain():
+    """Pre-opens pooled connections to the inference endpoints so the first request skips the handshake."""
+    TRANSPORT.bind_loop()
+    endpoints = NOVA_ENDPOINTS
+    if not endpoints:
+        return
+    elapsed_ms = max(await asyncio.gather(*(TRANSPORT.warm_up(endpoint) for endpoint in endpoints)))
+    logger.info(f"🔥 Transport warmed in {elapsed_ms:.0f}ms")
+
+
+async def keep_brain_warm():
+    """Background task: keeps pooled connections alive through idle periods."""
+    endpoints = NOVA_ENDPOINTS
+    if endpoints:
+        await TRANSPORT.keep_warm(endpoints)
 
-    tools_map = {func.__name__: func for func in tools_list}
-    tool_definitions = [function_to_schema(func) for func in tools_list]
 
-    return AzureNovaSession(client, model_name, tools_map, tool_definitions)
\ No newline at end of file
+async def shutdown_brain():
+    global NOVA_ASYNC_CLIENT, TOOL_EXECUTOR, SLOW_TOOL_EXECUTOR
+    if NOVA_ASYNC_CLIENT is not None:
+        await NOVA_ASYNC_CLIENT.close()
+        NOVA_ASYNC_CLIENT = None
+    if NOVA_CLIENT is not None:
+        NOVA_CLIENT.close()
+    if NOVA_MODEL_ROUTER is not None:
+        await NOVA_MODEL_ROUTER.fast_route.async_client.close()
+        NOVA_MODEL_ROUTER.fast_route.client.close()
+    if TOOL_EXECUTOR is not None:
+        TOOL_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        TOOL_EXECUTOR = None
+    if SLOW_TOOL_EXECUTOR is not None:
+        SLOW_TOOL_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        SLOW_TOOL_EXECUTOR = None
+    SANDBOX.shutdown()
+    await TRANSPORT.close()
@@ -0,0 +1,123 @@
+# core/model_routing.py
+import re
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from core.tokens import estimate_tokens
+
+logger = logging.getLogger("NOVA_MODEL_ROUTING")
+
+# Wording that usually means the user wants reasoning rather than a single action.
+REASONING_HINTS = re.compile(
+    r"\b(why|explain|compare|plan|write|draft|summari[sz]e|analy[sz]e|debug|code|script|step by step|"
+    r"pros and cons|difference|should i|recommend|and then|after that)\b",
+    re.IGNORECASE
+)
+
+POLICIES = ("auto", "fast", "large")
+
+
+@dataclass
+class ModelRoute:
+    name: str  # "fast" or "large"
+    model: str
+    client: Any
+    async_client: Any
+
+
+class ModelRouter:
+    """
+    Picks the fast or the large deployment for each LLM call of a message, using only local signals:
+    request length, how many tools the request plausibly needs (tool index scores), reasoning cues
+    and conversation depth.
+
+    A simple request runs on the fast model: the tool-dispatch turn and the phrasing turn after the
+    tool results. If the fast model asks for a second round of tools, the rest of the message is
+    escalated to the large model. Complex requests go to the large model from the start.
+    Policy "fast" / "large" pins every call to one model.
+    """
+
+    def __init__(self, fast_route: ModelRoute, policy: str = "auto", max_tokens: int = 32,
+                 max_tools: int = 2, max_depth: int = 8):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown model routing policy '{policy}' (expected one of {POLICIES})")
+        self.fast_route = fast_route
+        self.policy = policy
+        self.max_tokens = max_tokens
+        self.max_tools = max_tools
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self.stats = {
+            route: {"calls": 0, "total_ms": 0.0, "prompt_tokens": 0}
+            for route in ("fast", "large")
+        }
+        self.stats["escalations"] = 0
+        self.reasons: Dict[str, int] = {}
+
+    def classify(self, text: str, history: List, tool_index=None) -> Tuple[bool, str]:
+        """Returns (simple, reason). Called once per message, before the user message is appended."""
+        if self.policy != "auto":
+            return self.policy == "fast", f"policy={self.policy}"
+
+        if estimate_tokens(text) > self.max_tokens:
+            return False, "long request"
+        if REASONING_HINTS.search(text):
+            return False, "reasoning cue"
+
+        depth = sum(1 for message in history if message.role == "user")
+        if depth >= self.max_depth:
+            return False, "deep conversation"
+
+        if tool_index is not None:
+            scores = tool_index.score(text)
+            if scores:
+                top = max(scores.values())
+                likely = sum(1 for score in scores.values() if score >= top / 2)
+                if likely > self.max_tools:
+                    return False, f"{likely} candidate tools"
+                return True, "tool dispatch"
+
+        return True, "short request"
+
+    def escalate(self, simple: bool, tool_rounds: int) -> bool:
+        """A simple request that needs a second round of tools has turned multi-step."""
+        if simple and self.policy == "auto" and tool_rounds >= 2:
+            with self._lock:
+                self.stats["escalations"] += 1
+            logger.info("🧭 Escalating to the large model: request needs more than one tool round")
+            return False
+        return simple
+
+    def record(self, route: ModelRoute, reason: str, elapsed: float, prompt_tokens: int, large_model: str = None):
+        """Logs one routed call. Fast calls report the prompt tokens kept off the large model."""
+        with self._lock:
+            stats = self.stats[route.name]
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed * 1000
+            stats["prompt_tokens"] += prompt_tokens
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+        if route.name == "fast":
+            logger.info(f"🧭 {route.model} ({reason}): {elapsed * 1000:.0f}ms, ~{prompt_tokens} prompt tokens kept off {large_model}")
+        else:
+            logger.info(f"🧭 {route.model} ({reason}): {elapsed * 1000:.0f}ms, ~{prompt_tokens} prompt tokens")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {}
+            for name in ("fast", "large"):
+                stats = self.stats[name]
+                routes[name] = {
+                    **stats,
+                    "total_ms": round(stats["total_ms"]),
+                    "avg_ms": round(stats["total_ms"] / stats["calls"]) if stats["calls"] else 0,
+                }
+            return {
+                "policy": self.policy,
+                "fast_model": self.fast_route.model,
+                **routes,
+                "escalations": self.stats["escalations"],
+                "reasons": dict(self.reasons),
+            }
@@ -0,0 +1,70 @@
+# core/prefix.py
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("NOVA_PREFIX")
+
+
+def canonical_tool_order(definitions: List[Any], pinned: Iterable[str] = ()) -> List[Any]:
+    """
+    Deterministic tool order for the request prefix: pinned tools first (they are in every
+    request, so they extend the shared prefix), then the rest, each group sorted by name.
+    Registry order depends on module import order and changes when skills are added.
+    """
+    pinned = set(pinned)
+    return sorted(definitions, key=lambda d: (d.function.name not in pinned, d.function.name))
+
+
+def cached_tokens(usage: Any) -> Optional[int]:
+    """prompt_tokens_details.cached_tokens from a response's usage, or None when the provider omits it."""
+    if not usage:
+        return None
+    details = usage.get("prompt_tokens_details") if hasattr(usage, "get") else None
+    if not details:
+        return None
+    value = details.get("cached_tokens")
+    return int(value) if value is not None else None
+
+
+class PrefixMonitor:
+    """
+    Confirms that provider-side prompt caching is working: counts prompt and cached tokens from
+    response usage, and how often a session's prefix (tool list + system prompt) changed between
+    two of its requests, which forces the provider to re-read the prompt from scratch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "cache_hits": 0, "unreported": 0, "prefix_changes": 0}
+
+    @staticmethod
+    def fingerprint(tools: Optional[List[Any]], system_prompt: str) -> int:
+        return hash((tuple(t.function.name for t in tools or []), system_prompt))
+
+    def prefix_changed(self):
+        with self._lock:
+            self.stats["prefix_changes"] += 1
+
+    def record(self, usage: Any, model: str):
+        cached = cached_tokens(usage)
+        prompt = int(usage.get("prompt_tokens") or 0) if usage and hasattr(usage, "get") else 0
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["prompt_tokens"] += prompt
+            if cached is None:
+                self.stats["unreported"] += 1
+                return
+            self.stats["cached_tokens"] += cached
+            if cached:
+                self.stats["cache_hits"] += 1
+        if cached:
+            logger.info(f"💾 {model}: {cached}/{prompt} prompt tokens served from the provider cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            prompt = self.stats["prompt_tokens"]
+            return {**self.stats, "cached_ratio": round(self.stats["cached_tokens"] / prompt, 3) if prompt else 0.0}
+
+
+PREFIX_MONITOR = PrefixMonitor()
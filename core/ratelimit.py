@@ -0,0 +1,323 @@
+# core/ratelimit.py
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.policies import HTTPPolicy, AsyncHTTPPolicy
+
+from core.tokens import CHARS_PER_TOKEN
+
+logger = logging.getLogger("NOVA_RATELIMIT")
+
+# Statuses worth another attempt. 429 is quota; the rest are transient service-side failures.
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class RateLimitExceeded(HttpResponseError):
+    """Raised when a call cannot be admitted or retried within its deadline."""
+
+    def __init__(self, message: str):
+        super().__init__(message=message)
+        self.status_code = 429
+
+
+class TokenBucket:
+    """
+    Classic token bucket that allows debt: reserve() always succeeds and returns how long the
+    caller must wait for its share, so concurrent callers queue up in arrival order.
+    Not thread-safe on its own.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.refill_per_second
+
+    def refund(self, amount: float, now: float):
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def clamp(self, remaining: float, now: float):
+        """Never believe we have more headroom than the service says we do."""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parses '20ms', '1s', '6m0s' (x-ratelimit-reset-*) or plain seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    total, number = 0.0, ""
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char.isdigit() or char == ".":
+            number += char
+        elif value.startswith("ms", i):
+            total += float(number or 0) / 1000
+            number = ""
+            i += 1
+        elif char in "hms":
+            total += float(number or 0) * {"h": 3600, "m": 60, "s": 1}[char]
+            number = ""
+        else:
+            return None
+        i += 1
+    return total
+
+
+def retry_after(headers) -> Optional[float]:
+    """Seconds the service asked us to wait, from Retry-After style headers (None if absent)."""
+    if headers is None:
+        return None
+
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    resets = [parse_duration(headers.get(name)) for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+class RateLimiter:
+    """
+    Client-side pacing for one Azure deployment, shared by every client and session in the process.
+
+    Requests reserve capacity from a requests bucket (RPM) and a tokens bucket (TPM) before they
+    are sent. Azure evaluates quota over 10-second windows, so each bucket holds a sixth of the
+    per-minute quota. When the service still answers 429, the wait it asks for is applied to every
+    caller, not just the one that was throttled, and the call is retried with jittered exponential
+    backoff until it succeeds, retries run out, or its deadline passes.
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_retries: int = 4, deadline: float = 30.0,
+                 base_delay: float = 0.5, max_delay: float = 20.0, completion_tokens: int = 512):
+        self._lock = threading.Lock()
+        self.configure(rpm=rpm, tpm=tpm, max_retries=max_retries, deadline=deadline,
+                       base_delay=base_delay, max_delay=max_delay, completion_tokens=completion_tokens)
+        self._blocked_until = 0.0
+        self.stats = {"requests": 0, "throttled": 0, "backoffs": 0, "deadline_exceeded": 0, "waited_seconds": 0.0}
+
+    def configure(self, rpm: int = None, tpm: int = None, max_retries: int = None, deadline: float = None,
+                  base_delay: float = None, max_delay: float = None, completion_tokens: int = None):
+        with self._lock:
+            if rpm is not None:
+                self.rpm = rpm
+                self._requests = TokenBucket(max(1.0, rpm / 6), rpm / 60) if rpm > 0 else None
+            if tpm is not None:
+                self.tpm = tpm
+                self._tokens = TokenBucket(max(1.0, tpm / 6), tpm / 60) if tpm > 0 else None
+            if max_retries is not None:
+                self.max_retries = max_retries
+            if deadline is not None:
+                self.deadline = deadline
+            if base_delay is not None:
+                self.base_delay = base_delay
+            if max_delay is not None:
+                self.max_delay = max_delay
+            if completion_tokens is not None:
+                self.completion_tokens = completion_tokens
+
+    def estimate(self, body) -> int:
+        """Prompt tokens from the serialized request body, plus the completion allowance."""
+        size = len(body) if body else 0
+        return size // CHARS_PER_TOKEN + self.completion_tokens
+
+    def reserve(self, tokens: int, deadline: float) -> float:
+        """Claims quota for one call and returns the wait before it may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+
+            if now + wait > deadline:
+                self._release(tokens, now)
+                self.stats["deadline_exceeded"] += 1
+                raise RateLimitExceeded(f"Rate limit: call would wait {wait:.1f}s, beyond its deadline")
+
+            self.stats["requests"] += 1
+            self.stats["waited_seconds"] += wait
+            return wait
+
+    def _release(self, tokens: int, now: float):
+        if self._requests is not None:
+            self._requests.refund(1, now)
+        if self._tokens is not None:
+            self._tokens.refund(tokens, now)
+
+    def settle(self, estimated: int, used: Optional[int]):
+        """Returns over-estimated tokens to the bucket once real usage is known."""
+        if used is None or self._tokens is None or used >= estimated:
+            return
+        with self._lock:
+            self._tokens.refund(estimated - used, time.monotonic())
+
+    def observe(self, headers):
+        """Syncs the buckets with x-ratelimit-remaining-* headers from a successful response."""
+        with self._lock:
+            now = time.monotonic()
+            for bucket, name in ((self._requests, "x-ratelimit-remaining-requests"), (self._tokens, "x-ratelimit-remaining-tokens")):
+                value = headers.get(name)
+                if bucket is not None and value is not None:
+                    try:
+                        bucket.clamp(float(value), now)
+                    except ValueError:
+                        pass
+
+    def backoff(self, status: int, headers, attempt: int) -> float:
+        """Delay before the next attempt. Throttling pauses every caller, not just this one."""
+        requested = retry_after(headers)
+        if requested is not None:
+            delay = requested * random.uniform(1.0, 1.1)
+        else:
+            ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+            delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+
+        with self._lock:
+            self.stats["backoffs"] += 1
+            if status == 429:
+                self.stats["throttled"] += 1
+                self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+    def paused_for(self) -> float:
+        """Seconds left on a service-requested pause (0 when calls may flow)."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "waited_seconds": round(self.stats["waited_seconds"], 2),
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "paused_for": round(self.paused_for(), 2),
+            }
+
+
+def _request_info(limiter: RateLimiter, request):
+    body = request.http_request.body
+    marker = b'"stream": true' if isinstance(body, bytes) else '"stream": true'
+    streaming = bool(body) and marker in body
+    return limiter.estimate(body), streaming
+
+
+def _used_tokens(http_response) -> Optional[int]:
+    try:
+        return json.loads(http_response.text())["usage"]["total_tokens"]
+    except Exception:
+        return None
+
+
+class RateLimitPolicy(HTTPPolicy):
+    """Pipeline policy that paces and retries sync inference calls through a shared RateLimiter."""
+
+    def __init__(self, limiter: RateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def send(self, request):
+        limiter = self.limiter
+        tokens, streaming = _request_info(limiter, request)
+        deadline = time.monotonic() + limiter.deadline
+
+        attempt = 0
+        while True:
+            wait = limiter.reserve(tokens, deadline)
+            if wait:
+                time.sleep(wait)
+
+            response = self.next.send(request)
+            status = response.http_response.status_code
+            if status not in RETRY_STATUSES:
+                limiter.observe(response.http_response.headers)
+                if status < 300 and not streaming:
+                    limiter.settle(tokens, _used_tokens(response.http_response))
+                return response
+
+            if attempt >= limiter.max_retries:
+                return response
+            delay = limiter.backoff(status, response.http_response.headers, attempt)
+            if time.monotonic() + delay > deadline:
+                return response
+
+            logger.warning(f"⏳ Azure returned {status}, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            response.http_response.close()
+            attempt += 1
+
+
+class AsyncRateLimitPolicy(AsyncHTTPPolicy):
+    """Async twin of RateLimitPolicy. Waits yield to the event loop instead of blocking it."""
+
+    def __init__(self, limiter: RateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    async def send(self, request):
+        limiter = self.limiter
+        tokens, streaming = _request_info(limiter, request)
+        deadline = time.monotonic() + limiter.deadline
+
+        attempt = 0
+        while True:
+            wait = limiter.reserve(tokens, deadline)
+            if wait:
+                await asyncio.sleep(wait)
+
+            response = await self.next.send(request)
+            status = response.http_response.status_code
+            if status not in RETRY_STATUSES:
+                limiter.observe(response.http_response.headers)
+                if status < 300 and not streaming:
+                    limiter.settle(tokens, _used_tokens(response.http_response))
+                return response
+
+            if attempt >= limiter.max_retries:
+                return response
+            delay = limiter.backoff(status, response.http_response.headers, attempt)
+            if time.monotonic() + delay > deadline:
+                return response
+
+            logger.warning(f"⏳ Azure returned {status}, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            await response.http_response.close()
+            attempt += 1
+
+
+RATE_LIMITER = RateLimiter()
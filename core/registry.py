@@ -1,15 +1,166 @@
 # core/registry.py
-import functools
-from typing import Callable, Dict, List
+import os
+import json
+import inspect
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 
 SKILL_REGISTRY: Dict[str, Callable] = {}
+SKILL_METADATA: Dict[str, "SkillMetadata"] = {}
+GENERATED_SKILLS_FILE = os.path.join("skills", "generated.json")
+_GENERATED_MODULES: Optional[Set[str]] = None
+ISOLATION_MODES = ("thread", "process")
+SKILL_KINDS = ("blocking", "async", "cpu")
+LATENCY_CLASSES = ("fast", "normal", "slow")
 
-def skill(func: Callable):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-    SKILL_REGISTRY[func.__name__] = func
-    return wrapper
+@dataclass
+class Intent:
+    """
+    A deterministic phrasing that maps straight to a skill call, bypassing the LLM.
+    pattern: regex matched against the whole normalized utterance; named groups become arguments.
+    args: fixed arguments merged with the captured ones.
+    reply: template for the spoken answer, formatted with the arguments and {result}.
+    Intents run with no model turn and no confirmation: never declare one for a destructive
+    action (deleting, clearing, overwriting); leave those to the LLM.
+    """
+    pattern: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    reply: Optional[str] = None
+
+@dataclass
+class SkillMetadata:
+    name: str
+    cache_ttl: Optional[float] = None
+    cache_max_entries: int = 128
+    cache_key: Optional[Callable[[Dict[str, Any]], Any]] = None
+    cache_if: Optional[Callable[[Any], bool]] = None
+    intents: List[Intent] = field(default_factory=list)
+    pinned: bool = False
+    timeout: Optional[float] = None
+    isolation: str = "thread"
+    kind: str = "blocking"
+    idempotent: bool = True
+    resources: Tuple[str, ...] = ()
+    max_concurrency: int = 0
+    latency: str = "fast"
+    direct_call: bool = False
+
+    @property
+    def cacheable(self) -> bool:
+        return bool(self.cache_ttl) and self.idempotent
+
+    @property
+    def execution(self) -> str:
+        """Where the dispatcher runs the skill: "loop" (awaited), "thread" or "process" (sandbox pool)."""
+        if self.isolation == "process" or self.kind == "cpu":
+            return "process"
+        return "loop" if self.kind == "async" else "thread"
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-safe view for the /skills endpoint."""
+        return {
+            "kind": self.kind, "execution": self.execution, "latency": self.latency, "timeout": self.timeout,
+            "idempotent": self.idempotent, "cache_ttl": self.cache_ttl if self.cacheable else None,
+            "resources": list(self.resources), "max_concurrency": self.max_concurrency,
+            "pinned": self.pinned, "intents": [intent.pattern for intent in self.intents], "direct_call": self.direct_call,
+        }
+
+def generated_modules() -> Set[str]:
+    """Skill modules written by skill_maker. Kept on disk, so they stay sandboxed after a restart."""
+    global _GENERATED_MODULES
+    if _GENERATED_MODULES is None:
+        try:
+            with open(GENERATED_SKILLS_FILE, "r", encoding="utf-8") as f:
+                _GENERATED_MODULES = set(json.load(f))
+        except (OSError, ValueError):
+            _GENERATED_MODULES = set()
+    return _GENERATED_MODULES
+
+def mark_generated(module: str):
+    """Records a module as generated before it is imported: its skills always run in the sandbox pool."""
+    modules = generated_modules()
+    modules.add(module)
+    os.makedirs(os.path.dirname(GENERATED_SKILLS_FILE), exist_ok=True)
+    with open(GENERATED_SKILLS_FILE, "w", encoding="utf-8") as f:
+        json.dump(sorted(modules), f, indent=2)
+
+def skill(func: Callable = None, *, cache_ttl: float = None, cache_max_entries: int = 128,
+          cache_key: Callable[[Dict[str, Any]], Any] = None, cache_if: Callable[[Any], bool] = None, intents: List[Intent] = None,
+          pinned: bool = False, timeout: float = None, isolation: str = None, kind: str = None,
+          idempotent: bool = True, resources: Tuple[str, ...] = (), max_concurrency: int = 0, latency: str = "fast",
+          direct_call: bool = False):
+    """
+    Registers a skill. Use bare (@skill) or with options:
+
+        @skill(cache_ttl=300)
+        def get_weather(city: str): ...
+
+    cache_ttl: seconds a result may be served from cache (None disables caching).
+    cache_max_entries: LRU bound for this skill's cache.
+    cache_key: builds the cache key from the call's argument dict (defaults to normalized args).
+    cache_if: returns False for results that must not be cached, e.g. the error strings a skill
+        returns when its service is unreachable (every result is cached by default).
+    intents: Intent patterns the local fast-path router may answer without the LLM.
+    pinned: always offer this tool to the LLM, even when it is not relevant to the request.
+    timeout: seconds a call may run before the dispatcher gives up on it (None uses
+        NOVA_TOOL_TIMEOUT, 0 disables). Async skills are cancelled, threaded ones abandoned.
+    isolation: "thread" (default) runs the skill in the backend process; "process" runs it in
+        the sandbox pool (core/sandbox.py) with CPU, memory and result limits. A module can set
+        SKILL_ISOLATION = "process" to make it the default for all of its skills. Modules written
+        by skill_maker (see mark_generated) always get "process", whatever they declare.
+    kind: "blocking" (runs in a tool thread), "async" (awaited on the event loop; detected for
+        async def) or "cpu" (CPU-bound: runs in the sandbox pool, off the GIL).
+    idempotent: False for skills with side effects. Their calls in one turn run one after the
+        other in the order the LLM asked for them, and their results are never cached.
+    resources: exclusive resource groups (e.g. "camera", "audio", "display"); only one call
+        holding a given group runs at a time, across all sessions.
+    max_concurrency: most calls of this skill running at once (0 = unlimited).
+    latency: "fast", "normal" or "slow". Slow skills get their own threads so they cannot
+        starve quick ones.
+    direct_call: True allows POST /skills/{name}/invoke to run the skill without the LLM (GUI
+        controls). Leave it off for anything a stray local caller must not trigger (file writes,
+        skill creation, launching programs).
+    """
+    def register(func: Callable):
+        mode = isolation or func.__globals__.get("SKILL_ISOLATION", "thread")
+        if func.__module__ in generated_modules():
+            mode = "process"
+        if mode not in ISOLATION_MODES:
+            raise ValueError(f"Unknown isolation '{mode}' for skill {func.__name__} (expected one of {ISOLATION_MODES})")
+        skill_kind = kind or ("async" if inspect.iscoroutinefunction(func) else "blocking")
+        if skill_kind not in SKILL_KINDS:
+            raise ValueError(f"Unknown kind '{skill_kind}' for skill {func.__name__} (expected one of {SKILL_KINDS})")
+        if (skill_kind == "async") != inspect.iscoroutinefunction(func):
+            raise ValueError(f"Skill {func.__name__}: kind 'async' is for (and required by) async def functions")
+        if latency not in LATENCY_CLASSES:
+            raise ValueError(f"Unknown latency class '{latency}' for skill {func.__name__} (expected one of {LATENCY_CLASSES})")
+
+        SKILL_REGISTRY[func.__name__] = func
+        SKILL_METADATA[func.__name__] = SkillMetadata(
+            name=func.__name__,
+            cache_ttl=cache_ttl,
+            cache_max_entries=cache_max_entries,
+            cache_key=cache_key,
+            cache_if=cache_if,
+            intents=list(intents or []),
+            pinned=pinned,
+            timeout=timeout,
+            isolation=mode,
+            kind=skill_kind,
+            idempotent=idempotent,
+            resources=tuple(resources),
+            max_concurrency=max_concurrency,
+            latency=latency,
+            direct_call=direct_call
+        )
+        return func  # unwrapped, so callers (and inspect) see the skill itself
+
+    if func is None:
+        return register
+    return register(func)
 
 def get_all_skills() -> List[Callable]:
-    return list(SKILL_REGISTRY.values())
\ No newline at end of file
+    return list(SKILL_REGISTRY.values())
+
+def get_skill_metadata(name: str) -> Optional[SkillMetadata]:
+    return SKILL_METADATA.get(name)
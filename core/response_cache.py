@@ -0,0 +1,142 @@
+# core/response_cache.py
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Iterable, List, Optional
+
+from core.cache import TTLCache
+from core.registry import get_skill_metadata
+from core.router import normalize_utterance
+
+logger = logging.getLogger("NOVA_RESPONSE_CACHE")
+
+# Utterances that lean on the previous answer ("what about tomorrow", "do it again") are keyed
+# together with that answer, so they only hit when the conversation is in the same place.
+CONTEXT_DEPENDENT = re.compile(
+    r"^(and|also|what about|how about|then)\b|\b(it|that|this|those|them|they|there|again|more|too|else|another|same|instead)\b"
+)
+
+
+@dataclass(frozen=True)
+class ResponseKey:
+    shared: str  # model + utterance (+ previous reply for follow-ups): answers backed by tools
+    conversation: str  # shared + the whole history sent with the message: answers from the model alone
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    action_taken: bool
+    tools: List[str]
+
+
+class ResponseCache:
+    """
+    Caches final answers for repeated prompts.
+
+    An answer's lifetime comes from the tools that produced it: no tools means the default ttl,
+    otherwise the shortest cache_ttl among them. Answers that used a tool without cache_ttl
+    (anything with side effects, e.g. opening an app) are never cached.
+
+    Tool-backed answers are shared by every session. An answer from the model alone may come
+    from the conversation ("what's my name?"), so it is stored under the conversation key and
+    only served again for the same history (summary and turns).
+    An optional SQLite file keeps entries across restarts.
+    """
+
+    def __init__(self, default_ttl: float = 3600.0, max_entries: int = 512,
+                 disk_path: Optional[str] = None, disk_max_entries: int = 5000):
+        self.default_ttl = default_ttl
+        self._memory = TTLCache(default_ttl, max_entries)
+        self._lock = threading.Lock()
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self._db = None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stored": 0, "uncacheable": 0}
+
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, expires_at REAL, stored_at REAL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, model_name: str, previous_reply: Optional[str] = None, history: bytes = b"") -> ResponseKey:
+        """history: the encoded conversation the message is sent with (see core/encoding.py)."""
+        utterance = normalize_utterance(text)
+        context = (previous_reply or "") if CONTEXT_DEPENDENT.search(utterance) else ""
+        shared = hashlib.sha256(f"{model_name}\x00{utterance}\x00{context}".encode("utf-8")).hexdigest()
+        conversation = hashlib.sha256(shared.encode("utf-8") + b"\x00" + history).hexdigest()
+        return ResponseKey(shared=shared, conversation=conversation)
+
+    def ttl_for(self, tools: Iterable[str]) -> Optional[float]:
+        ttl = self.default_ttl
+        for name in tools:
+            meta = get_skill_metadata(name)
+            if meta is None or not meta.cacheable:
+                return None
+            ttl = min(ttl, meta.cache_ttl)
+        return ttl
+
+    def get(self, key: ResponseKey) -> Optional[CachedResponse]:
+        with self._lock:
+            for entry_key in (key.shared, key.conversation):
+                entry = self._memory.get(entry_key, None)
+                if entry is not None:
+                    self.stats["hits"] += 1
+                    return entry
+
+            if self._db is not None:
+                for entry_key in (key.shared, key.conversation):
+                    row = self._db.execute("SELECT value, expires_at FROM responses WHERE key = ?", (entry_key,)).fetchone()
+                    if row and row[1] > time.time():
+                        entry = CachedResponse(**json.loads(row[0]))
+                        self._memory.set(entry_key, entry, ttl=row[1] - time.time())
+                        self.stats["disk_hits"] += 1
+                        return entry
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: ResponseKey, text: str, action_taken: bool, tools: Iterable[str]):
+        tools = sorted(set(tools))
+        ttl = self.ttl_for(tools)
+        if ttl is None or ttl <= 0 or not text:
+            self.stats["uncacheable"] += 1
+            return
+
+        entry = CachedResponse(text=text, action_taken=action_taken, tools=tools)
+        key = key.shared if tools else key.conversation
+        with self._lock:
+            self._memory.set(key, entry, ttl=ttl)
+            self.stats["stored"] += 1
+            if self._db is not None:
+                now = time.time()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(asdict(entry)), now + ttl, now)
+                )
+                self._db.execute(
+                    "DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY stored_at DESC LIMIT ?)",
+                    (self.disk_max_entries,)
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "entries": len(self._memory), "default_ttl": self.default_ttl, "disk": bool(self._db)}
@@ -0,0 +1,122 @@
+# core/router.py
+import re
+import inspect
+import typing
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from core.registry import Intent, get_skill_metadata
+
+logger = logging.getLogger("NOVA_ROUTER")
+
+FILLER_PREFIX = re.compile(r"^(nova\s+)?((please|can you|could you|would you|hey)\s+)*")
+FILLER_SUFFIX = re.compile(r"(\s+(please|for me|now))+$")
+TRIGGER_PREFIX = re.compile(r"^[A-Z][A-Z0-9_]{3,}:\s*")
+
+
+def normalize_utterance(text: str) -> str:
+    text = text.lower().strip()
+    text = re.sub(r"[?!.,]+$", "", text).replace(",", " ")
+    text = re.sub(r"\s+", " ", text)
+    text = FILLER_PREFIX.sub("", text)
+    return FILLER_SUFFIX.sub("", text).strip()
+
+
+def _coerce(value: str, annotation: Any) -> Any:
+    """Converts a captured string to the parameter's annotated type (Optional[int] -> int)."""
+    if annotation is inspect.Parameter.empty:
+        return value
+    candidates = [arg for arg in typing.get_args(annotation) if arg is not type(None)] or [annotation]
+    target = candidates[0]
+    if target is bool:
+        return value.lower() in ("true", "yes", "on", "1")
+    if target in (int, float):
+        return target(value)
+    return value
+
+
+@dataclass
+class IntentMatch:
+    skill: str
+    args: Dict[str, Any]
+    intent: Intent
+
+    def render_reply(self, result: str) -> str:
+        if self.intent.reply:
+            return self.intent.reply.format(result=result, **self.args)
+        # Skills prefix UI trigger codes (e.g. 'BRIGHTNESS_CONTROL_UI: ...'); they are not meant to be spoken.
+        return TRIGGER_PREFIX.sub("", result)
+
+
+class IntentRouter:
+    """
+    Matches utterances against the Intent patterns declared on skills.
+    Only an unambiguous full match is routed; anything else falls through to the LLM.
+    """
+
+    def __init__(self):
+        self._routes: List[tuple] = []
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "ambiguous": 0, "rejected": 0}
+
+    @classmethod
+    def from_tools(cls, tools_map: Dict[str, Callable]) -> "IntentRouter":
+        router = cls()
+        router.load(tools_map)
+        return router
+
+    def load(self, tools_map: Dict[str, Callable]):
+        """Replaces all routes with the intents declared by the given skills."""
+        routes = []
+        for name, func in tools_map.items():
+            meta = get_skill_metadata(name)
+            if meta:
+                for intent in meta.intents:
+                    routes.append((re.compile(intent.pattern, re.IGNORECASE), name, inspect.signature(func), intent))
+        self._routes = routes
+
+    def add(self, skill_name: str, func: Callable, intent: Intent):
+        compiled = re.compile(intent.pattern, re.IGNORECASE)
+        self._routes.append((compiled, skill_name, inspect.signature(func), intent))
+
+    def __len__(self):
+        return len(self._routes)
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        self.stats["requests"] += 1
+        utterance = normalize_utterance(text)
+
+        matches = []
+        for compiled, skill_name, signature, intent in self._routes:
+            found = compiled.fullmatch(utterance)
+            if not found:
+                continue
+            try:
+                args = dict(intent.args)
+                for param, value in found.groupdict().items():
+                    if value is not None and param in signature.parameters:
+                        args[param] = _coerce(value, signature.parameters[param].annotation)
+                signature.bind(**args)
+            except (TypeError, ValueError):
+                self.stats["rejected"] += 1
+                continue
+            matches.append(IntentMatch(skill=skill_name, args=args, intent=intent))
+
+        if not matches:
+            self.stats["misses"] += 1
+            return None
+        if len({(m.skill, tuple(sorted(m.args.items()))) for m in matches}) > 1:
+            self.stats["ambiguous"] += 1
+            logger.info(f"🔀 Ambiguous fast path for '{utterance}', deferring to LLM")
+            return None
+
+        self.stats["hits"] += 1
+        return matches[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "routes": len(self._routes),
+            "hit_rate": round(self.stats["hits"] / requests, 4) if requests else 0.0
+        }
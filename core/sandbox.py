@@ -0,0 +1,236 @@
+# core/sandbox.py
+"""
+Process-pool execution for skills registered with isolation="process".
+
+Such skills run in a small pool of warm worker processes instead of the backend process: a
+CPU-bound skill no longer holds the GIL in the request path, and a crashing or runaway one only
+takes down its worker, which is replaced. Each call gets a CPU-time limit, each worker a memory
+limit, and results over the size cap are refused. Code generated by skill_maker runs here.
+
+CPU and memory limits use the `resource` module (Linux/macOS). Elsewhere only the call timeout
+(which kills the worker) and the result cap apply.
+"""
+import math
+import time
+import queue
+import asyncio
+import inspect
+import signal
+import logging
+import importlib
+import threading
+import multiprocessing
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger("NOVA_SANDBOX")
+
+
+class SandboxError(RuntimeError):
+    """A sandboxed skill call failed: crash, resource limit or oversized result."""
+
+
+class SandboxTimeout(SandboxError, TimeoutError):
+    """A sandboxed skill call ran past its timeout: its worker was killed, or none came free in time."""
+
+
+def _load_skill(module: str, name: str) -> Callable:
+    from core.registry import SKILL_REGISTRY
+
+    if name not in SKILL_REGISTRY:
+        importlib.import_module(module)
+    return SKILL_REGISTRY[name]
+
+
+def _limit_cpu(seconds: float):
+    """RLIMIT_CPU is per process, so each call moves the soft limit to current usage + seconds."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_mb: int, preload: Tuple[str, ...]):
+    """Worker loop: (module, name, args, cpu_seconds, max_result_chars) in, (status, text) out."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is for the backend, which stops the pool
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass  # reported on the first call to one of its skills
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            module, name, args, cpu_seconds, max_result_chars = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            func = _load_skill(module, name)
+            if resource is not None and cpu_seconds:
+                _limit_cpu(cpu_seconds)
+            result = func(**args)
+            if inspect.iscoroutine(result):
+                result = asyncio.run(result)
+            result = str(result)
+            if max_result_chars and len(result) > max_result_chars:
+                reply = ("error", f"result too large ({len(result)} chars, limit {max_result_chars})")
+            else:
+                reply = ("ok", result)
+        except MemoryError:
+            reply = ("error", f"exceeded the {memory_mb} MB memory limit")
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        conn.send(reply)
+
+
+class _Worker:
+    def __init__(self, context, memory_mb: int, preload: Tuple[str, ...]):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, memory_mb, preload), daemon=True, name="nova-sandbox")
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def exit_reason(self) -> str:
+        self.process.join(timeout=1)
+        code = self.process.exitcode
+        if code is not None and code < 0 and -code == getattr(signal, "SIGXCPU", None):
+            return "exceeded its CPU time limit"
+        if code is not None and code < 0 and -code == signal.SIGKILL:
+            return "was killed (out of memory?)"
+        return f"crashed (exit code {code})"
+
+
+class SandboxPool:
+    """
+    Warm worker processes for isolated skills. One call per worker at a time; callers block (in
+    a tool thread, never on the event loop) until a worker is free, for at most the call's timeout.
+    """
+
+    def __init__(self, workers: int = 2, cpu_seconds: float = 10, memory_mb: int = 512, max_result_chars: int = 20000):
+        self._context = multiprocessing.get_context("spawn")  # fork is unsafe with the backend's threads
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers = 0
+        self.preload: Tuple[str, ...] = ()
+        self.configure(workers, cpu_seconds, memory_mb, max_result_chars)
+        self.stats = {"calls": 0, "errors": 0, "timeouts": 0, "crashes": 0, "restarts": 0}
+
+    def configure(self, workers: int = 2, cpu_seconds: float = 10, memory_mb: int = 512, max_result_chars: int = 20000):
+        self.size = max(1, workers)
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_result_chars = max_result_chars
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.memory_mb, self.preload)
+
+    def start(self, modules: Iterable[str] = ()):
+        """
+        Starts the workers ahead of the first call, importing the isolated skills' modules, so that
+        call does not pay for interpreter start-up and imports. Workers that are already running
+        import modules added later on their first call to them.
+        """
+        with self._lock:
+            self.preload = tuple(sorted(set(self.preload) | set(modules)))
+            started = self.size - self._workers
+            while self._workers < self.size:
+                self._idle.put(self._spawn())
+                self._workers += 1
+        if started > 0:
+            logger.info(f"🧪 Sandbox pool: {self.size} workers (cpu {self.cpu_seconds:g}s per call, memory {self.memory_mb} MB)")
+
+    def _acquire(self, deadline: Optional[float]) -> Optional[_Worker]:
+        """An idle (or newly started) worker, or None if none came free before the deadline."""
+        with self._lock:
+            if self._idle.empty() and self._workers < self.size:
+                self._workers += 1
+                return self._spawn()
+        try:
+            return self._idle.get(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            return None
+
+    def _replace(self, worker: _Worker):
+        worker.kill()
+        with self._lock:
+            self.stats["restarts"] += 1
+        self._idle.put(self._spawn())
+
+    def call(self, func: Callable, args: Dict[str, Any], timeout: Optional[float] = None) -> str:
+        """
+        Runs a registered skill in a worker. Skill errors come back as SandboxError. The timeout
+        covers waiting for a free worker as well as the call itself.
+        """
+        name = func.__name__
+        deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+        worker, ready = self._acquire(deadline), False
+        with self._lock:
+            self.stats["calls"] += 1
+            if worker is None:
+                self.stats["timeouts"] += 1
+        if worker is None:
+            raise SandboxTimeout(f"{name} timed out after {timeout:g}s waiting for a sandbox worker")
+        try:
+            worker.conn.send((func.__module__, name, args, self.cpu_seconds, self.max_result_chars))
+            ready = worker.conn.poll(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            if ready:
+                status, value = worker.conn.recv()
+        except (EOFError, OSError):
+            reason = worker.exit_reason()
+            logger.warning(f"💥 Sandbox worker running {name} {reason}, restarting it")
+            with self._lock:
+                self.stats["crashes"] += 1
+            self._replace(worker)
+            worker = None
+            raise SandboxError(f"{name} {reason}") from None
+        except BaseException:
+            self._replace(worker)  # its state is unknown
+            worker = None
+            raise
+        finally:
+            if worker is not None and ready:
+                self._idle.put(worker)
+
+        if not ready:
+            # Killing the worker is what actually stops a runaway skill.
+            with self._lock:
+                self.stats["timeouts"] += 1
+            self._replace(worker)
+            raise SandboxTimeout(f"{name} timed out after {timeout:g}s")
+        if status != "ok":
+            with self._lock:
+                self.stats["errors"] += 1
+            raise SandboxError(f"{name} failed in the sandbox: {value}")
+        return value
+
+    def shutdown(self):
+        with self._lock:
+            self._workers = 0
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                return
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"workers": self.size, "running": self._workers, "idle": self._idle.qsize(),
+                    "cpu_seconds": self.cpu_seconds, "memory_mb": self.memory_mb,
+                    "max_result_chars": self.max_result_chars, "limits_enforced": resource is not None, **self.stats}
+
+
+SANDBOX = SandboxPool()
@@ -0,0 +1,124 @@
+# core/scheduler.py
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.registry import SkillMetadata
+
+logger = logging.getLogger("NOVA_SCHEDULER")
+
+# Polling interval for coroutine skills waiting on a busy resource. The gates are thread locks
+# (sync and async skills must exclude each other), which the event loop cannot await directly.
+ASYNC_POLL_INTERVAL = 0.01
+
+
+class SkillScheduler:
+    """
+    Admission control for skill calls, from SkillMetadata: one call at a time per exclusive
+    resource group (camera, audio, display...) and at most max_concurrency calls of one skill.
+    Gates are always taken in the same order (resources by name, then the skill's own limit),
+    so two skills sharing several resources cannot deadlock.
+
+    A threaded call whose caller gave up on it (timeout) cannot be stopped and keeps its thread
+    and gates. Until it returns, new calls to that skill, or to skills sharing its resources, are
+    refused rather than queued behind it, so a hung skill cannot take over the tool threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resources: Dict[str, threading.Lock] = {}
+        self._limits: Dict[str, Tuple[int, threading.BoundedSemaphore]] = {}
+        self._abandoned: Dict[Future, SkillMetadata] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def _gates(self, meta: SkillMetadata) -> List[Any]:
+        with self._lock:
+            gates = [self._resources.setdefault(name, threading.Lock()) for name in sorted(set(meta.resources))]
+            if meta.max_concurrency > 0:
+                size, limit = self._limits.get(meta.name, (None, None))
+                if size != meta.max_concurrency:
+                    limit = threading.BoundedSemaphore(meta.max_concurrency)
+                    self._limits[meta.name] = (meta.max_concurrency, limit)
+                gates.append(limit)
+            return gates
+
+    def _record_wait(self, meta: SkillMetadata, waited: float):
+        with self._lock:
+            stats = self.stats.setdefault(meta.name, {"calls": 0, "waits": 0, "wait_ms": 0.0})
+            stats["calls"] += 1
+            if waited > 0.001:
+                stats["waits"] += 1
+                stats["wait_ms"] += waited * 1000
+        if waited > 0.5:
+            logger.info(f"🚦 {meta.name} waited {waited * 1000:.0f}ms for {', '.join(meta.resources) or 'a free slot'}")
+
+    def abandon(self, meta: SkillMetadata, future: Future):
+        """Records a threaded call nobody waits for any more; the skill is hung until it returns."""
+        with self._lock:
+            if future.done():
+                return
+            self._abandoned[future] = meta
+            stats = self.stats.setdefault(meta.name, {"calls": 0, "waits": 0, "wait_ms": 0.0})
+            stats["abandoned"] = stats.get("abandoned", 0) + 1
+        logger.warning(f"🧟 {meta.name} is still running after its timeout, refusing new calls until it returns")
+        future.add_done_callback(self._returned)
+
+    def _returned(self, future: Future):
+        with self._lock:
+            meta = self._abandoned.pop(future, None)
+        if meta is not None:
+            logger.info(f"🚦 Abandoned {meta.name} call returned, accepting calls again")
+
+    def hung_by(self, meta: SkillMetadata) -> Optional[str]:
+        """Name of the abandoned skill blocking this one (itself or one sharing a resource), or None."""
+        with self._lock:
+            for other in self._abandoned.values():
+                if other.name == meta.name or set(other.resources) & set(meta.resources):
+                    return other.name
+        return None
+
+    @contextmanager
+    def hold(self, meta: SkillMetadata):
+        """Blocks the calling thread until the skill may run."""
+        gates, acquired = self._gates(meta), []
+        started = time.perf_counter()
+        try:
+            for gate in gates:
+                gate.acquire()
+                acquired.append(gate)
+            self._record_wait(meta, time.perf_counter() - started)
+            yield
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+
+    @asynccontextmanager
+    async def hold_async(self, meta: SkillMetadata):
+        """Event-loop variant of hold(): waits without blocking the loop, and is safe to cancel."""
+        gates, acquired = self._gates(meta), []
+        started = time.perf_counter()
+        try:
+            for gate in gates:
+                while not gate.acquire(blocking=False):
+                    await asyncio.sleep(ASYNC_POLL_INTERVAL)
+                acquired.append(gate)
+            self._record_wait(meta, time.perf_counter() - started)
+            yield
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "resources": {name: {"busy": lock.locked()} for name, lock in sorted(self._resources.items())},
+                "skills": {name: {**stats, "wait_ms": round(stats["wait_ms"], 1)} for name, stats in sorted(self.stats.items())},
+                "hung": sorted({meta.name for meta in self._abandoned.values()}),
+            }
+
+
+SKILL_SCHEDULER = SkillScheduler()
@@ -0,0 +1,141 @@
+# core/sessions.py
+import os
+import re
+import json
+import time
+import shutil
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any
+
+from core.llm import AzureNovaSession, history_to_dicts, history_from_dicts
+
+logger = logging.getLogger("NOVA_SESSIONS")
+
+DEFAULT_SESSION_ID = "default"
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-]{1,64}$")
+
+
+@dataclass
+class SessionEntry:
+    session: AzureNovaSession
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+    active: int = 0
+
+
+class SessionManager:
+    """
+    Keeps one AzureNovaSession per client-supplied session id.
+    Each session is serialized by its own lock. Cold sessions (beyond max_sessions, or idle
+    for longer than idle_ttl seconds) are spilled to spill_dir and rehydrated on next use.
+    """
+
+    def __init__(self, factory: Callable[[], AzureNovaSession], max_sessions: int = 32,
+                 idle_ttl: float = 900.0, spill_dir: str = ".nova_sessions"):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.spill_dir = spill_dir
+        self._sessions: "OrderedDict[str, SessionEntry]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self.stats = {"created": 0, "evicted": 0, "rehydrated": 0}
+        # Spilled sessions only outlive eviction, not a restart.
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    @staticmethod
+    def validate_id(session_id: str) -> str:
+        if not SESSION_ID_PATTERN.match(session_id or ""):
+            raise ValueError("Session id must be 1-64 characters of letters, digits, '-' or '_'.")
+        return session_id
+
+    def _spill_path(self, session_id: str) -> str:
+        return os.path.join(self.spill_dir, f"{session_id}.json")
+
+    def _write_spill(self, session_id: str, history: list):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        tmp_path = self._spill_path(session_id) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(history, f)
+        os.replace(tmp_path, self._spill_path(session_id))
+
+    def _read_spill(self, session_id: str):
+        path = self._spill_path(session_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        os.remove(path)
+        return data
+
+    async def _load(self, session_id: str) -> SessionEntry:
+        session = self.factory()
+        try:
+            data = await asyncio.to_thread(self._read_spill, session_id)
+        except Exception as e:
+            logger.error(f"Failed to rehydrate session '{session_id}': {e}")
+            data = None
+
+        if data:
+            session.history = history_from_dicts(data)
+            self.stats["rehydrated"] += 1
+            logger.info(f"♻️ Rehydrated session '{session_id}' ({len(session.history)} messages)")
+        else:
+            self.stats["created"] += 1
+            logger.info(f"🆕 Created session '{session_id}'")
+        return SessionEntry(session=session)
+
+    async def _evict(self, session_id: str, entry: SessionEntry):
+        del self._sessions[session_id]
+        self.stats["evicted"] += 1
+        try:
+            await asyncio.to_thread(self._write_spill, session_id, history_to_dicts(entry.session.history))
+            logger.info(f"💾 Spilled session '{session_id}' to disk")
+        except Exception as e:
+            logger.error(f"Failed to spill session '{session_id}': {e}")
+
+    async def sweep(self):
+        """Evicts idle sessions and trims the in-memory set down to max_sessions (LRU first)."""
+        async with self._lock:
+            await self._sweep_locked()
+
+    async def _sweep_locked(self):
+        now = time.monotonic()
+        for session_id, entry in list(self._sessions.items()):
+            if entry.active == 0 and now - entry.last_used > self.idle_ttl:
+                await self._evict(session_id, entry)
+
+        overflow = len(self._sessions) - self.max_sessions
+        for session_id, entry in list(self._sessions.items()):
+            if overflow <= 0:
+                break
+            if entry.active == 0:
+                await self._evict(session_id, entry)
+                overflow -= 1
+
+    @asynccontextmanager
+    async def session(self, session_id: str = DEFAULT_SESSION_ID):
+        """Yields the session for session_id while holding its lock."""
+        self.validate_id(session_id)
+
+        async with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = await self._load(session_id)
+                self._sessions[session_id] = entry
+            self._sessions.move_to_end(session_id)
+            entry.active += 1
+            await self._sweep_locked()
+
+        try:
+            async with entry.lock:
+                yield entry.session
+        finally:
+            entry.active -= 1
+            entry.last_used = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"active": len(self._sessions), **self.stats}
@@ -0,0 +1,197 @@
+# core/tokens.py
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Tuple
+
+# ~4 characters per token holds well enough for English text and JSON tool schemas.
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(message: Any) -> int:
+    """Estimate for one SDK message (or any model exposing as_dict()), including per-message overhead."""
+    data = message.as_dict() if hasattr(message, "as_dict") else message
+    return MESSAGE_OVERHEAD + estimate_tokens(json.dumps(data, ensure_ascii=False))
+
+
+class TokenCounter:
+    """
+    Fast local prompt estimate. Each message's estimate is remembered while the same object stays
+    in the list, so re-counting a growing history only costs the new messages.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._known: Dict[int, Tuple[Any, int]] = {}
+
+    def count(self, messages: List[Any]) -> int:
+        with self._lock:
+            known, total = self._known, 0
+            for message in messages:
+                entry = known.get(id(message))
+                # The entry holds the object itself, so its id cannot be reused while counted.
+                if entry is None or entry[0] is not message:
+                    entry = known[id(message)] = (message, estimate_message_tokens(message))
+                total += entry[1]
+            if len(known) > 2 * len(messages) + 64:
+                # Folded or replaced messages: keep only what is still counted.
+                live = {id(message) for message in messages}
+                self._known = {key: entry for key, entry in known.items() if key in live}
+            return total
+
+
+# Tool definitions are shared by every session.
+TOOL_TOKENS = TokenCounter()
+
+
+class TokenBudgetExceeded(ValueError):
+    """A request was refused before sending because it would exceed a token budget."""
+
+
+@dataclass
+class Usage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    calls: int = 0
+    estimated_calls: int = 0  # calls whose response carried no usage, counted from the local estimate
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @classmethod
+    def from_response(cls, usage: Any, prompt_estimate: int = 0) -> "Usage":
+        if not usage or not hasattr(usage, "get"):
+            return cls(prompt_tokens=prompt_estimate, calls=1, estimated_calls=1)
+        details = usage.get("prompt_tokens_details") or {}
+        return cls(
+            prompt_tokens=int(usage.get("prompt_tokens") or 0),
+            completion_tokens=int(usage.get("completion_tokens") or 0),
+            cached_tokens=int(details.get("cached_tokens") or 0),
+            calls=1,
+        )
+
+    def add(self, other: "Usage"):
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.calls += other.calls
+        self.estimated_calls += other.estimated_calls
+        self.cost += other.cost
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "total_tokens": self.total_tokens, "cost": round(self.cost, 6)}
+
+
+def parse_pricing(spec: str) -> Dict[str, Tuple[float, float, float]]:
+    """
+    NOVA_PRICING: comma-separated `model=input/output[/cached input]`, USD per 1M tokens.
+        "gpt-4o=2.50/10.00/1.25, gpt-4o-mini=0.15/0.60"
+    Cached input defaults to the input price.
+    """
+    pricing = {}
+    for entry in (spec or "").split(","):
+        model, _, prices = entry.strip().partition("=")
+        if not prices:
+            continue
+        values = [float(price) for price in prices.split("/")]
+        input_price, output_price = values[0], values[1] if len(values) > 1 else values[0]
+        pricing[model.strip()] = (input_price, output_price, values[2] if len(values) > 2 else input_price)
+    return pricing
+
+
+class UsageLedger:
+    """
+    Token usage and cost aggregated in total and per model, purpose ("chat", or background work
+    such as "history_summary"), session and tool (skill results).
+    """
+
+    def __init__(self, pricing: Dict[str, Tuple[float, float, float]] = None, session_token_budget: int = 0,
+                 max_sessions: int = 256):
+        self.pricing = pricing or {}
+        self.session_token_budget = session_token_budget
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.total = Usage()
+            self.models: Dict[str, Usage] = {}
+            self.purposes: Dict[str, Usage] = {}
+            self.sessions: "OrderedDict[str, Usage]" = OrderedDict()
+            self.tools: Dict[str, Dict[str, int]] = {}
+
+    def configure(self, pricing: Dict[str, Tuple[float, float, float]], session_token_budget: int = 0):
+        self.pricing = pricing
+        self.session_token_budget = session_token_budget
+
+    def price(self, model: str, usage: Usage) -> float:
+        prices = self.pricing.get(model)
+        if prices is None:
+            return 0.0
+        input_price, output_price, cached_price = prices
+        uncached = usage.prompt_tokens - usage.cached_tokens
+        return (uncached * input_price + usage.cached_tokens * cached_price + usage.completion_tokens * output_price) / 1_000_000
+
+    def record_call(self, model: str, usage: Usage, purpose: str = "chat") -> Usage:
+        """One LLM call. Returns the usage with its cost filled in."""
+        usage.cost = self.price(model, usage)
+        with self._lock:
+            self.total.add(usage)
+            self.models.setdefault(model, Usage()).add(usage)
+            self.purposes.setdefault(purpose, Usage()).add(usage)
+        return usage
+
+    def record_tool(self, name: str, result: str):
+        """A skill result, which is sent back as prompt tokens on every later call of the conversation."""
+        with self._lock:
+            stats = self.tools.setdefault(name, {"calls": 0, "result_tokens": 0})
+            stats["calls"] += 1
+            stats["result_tokens"] += estimate_tokens(result)
+
+    def record_request(self, session_id: str, usage: Usage):
+        with self._lock:
+            session = self.sessions.pop(session_id, None) or Usage()
+            session.add(usage)
+            self.sessions[session_id] = session
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+
+    def session_tokens(self, session_id: str) -> int:
+        with self._lock:
+            session = self.sessions.get(session_id)
+            return session.total_tokens if session else 0
+
+    def check_session(self, session_id: str):
+        """Raises TokenBudgetExceeded once a session has used its token budget (0 = unlimited)."""
+        if self.session_token_budget and self.session_tokens(session_id) >= self.session_token_budget:
+            raise TokenBudgetExceeded(f"Session '{session_id}' has used its {self.session_token_budget} token budget")
+
+    def get_stats(self, session_id: str = None) -> Dict[str, Any]:
+        with self._lock:
+            if session_id is not None:
+                session = self.sessions.get(session_id)
+                return {"session_id": session_id, **(session or Usage()).as_dict()}
+            return {
+                **self.total.as_dict(),
+                "session_token_budget": self.session_token_budget,
+                "priced_models": sorted(self.pricing),
+                "models": {model: usage.as_dict() for model, usage in self.models.items()},
+                "purposes": {purpose: usage.as_dict() for purpose, usage in self.purposes.items()},
+                "sessions": {session_id: usage.as_dict() for session_id, usage in self.sessions.items()},
+                "tools": {name: dict(stats) for name, stats in sorted(self.tools.items())},
+            }
+
+
+USAGE_LEDGER = UsageLedger()
@@ -0,0 +1,162 @@
+# core/tool_index.py
+import re
+import math
+import logging
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+from azure.ai.inference.models import ChatCompletionsToolDefinition
+
+from core.tokens import estimate_message_tokens
+
+logger = logging.getLogger("NOVA_TOOLS")
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "is", "it", "my", "me", "i",
+    "this", "that", "with", "by", "be", "as", "at", "e", "g", "eg", "use", "when", "user", "says",
+    "str", "int", "float", "bool", "optional", "args", "returns", "parameter", "parameters", "you", "your",
+    "what", "how", "do", "does", "have", "has", "much", "can", "could", "please", "nova", "are", "there",
+}
+
+# Everyday words mapped to the vocabulary the skill docstrings use.
+SYNONYMS = {
+    "ram": "memory", "storage": "disk", "space": "disk", "processor": "cpu", "load": "cpu",
+    "dollar": "currency", "euro": "currency", "rupee": "currency", "exchange": "currency",
+    "folder": "directory", "todo": "task", "url": "website", "site": "website", "browser": "website",
+    "sound": "volume", "audio": "volume", "internet": "wifi", "app": "application",
+    "forecast": "weather", "charge": "battery", "running": "process",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower().replace("_", " "))
+    # Cheap plural folding so 'tasks' matches 'task' and 'files' matches 'file'.
+    words = [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+             for w in words if len(w) > 1 and w not in STOPWORDS]
+    return [SYNONYMS.get(w, w) for w in words]
+
+
+class ToolIndex:
+    """
+    BM25 index over tool names, docstrings and parameter descriptions.
+    select() returns the top_k most relevant tool definitions for a query, plus pinned tools.
+
+    Any change to the tool list invalidates the provider's prompt cache, so given the session's
+    previous selection, select() keeps sending that same list while it already covers the new
+    query, and otherwise adds to it (up to max_tools) rather than swapping tools out.
+    """
+
+    def __init__(self, top_k: int = 8, pinned: Iterable[str] = (), k1: float = 1.5, b: float = 0.75,
+                 max_tools: int = None):
+        self.top_k = top_k
+        self.max_tools = max_tools or 2 * top_k
+        self.pinned = set(pinned)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._definitions: Dict[str, ChatCompletionsToolDefinition] = {}
+        self._order: List[str] = []
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._idf: Dict[str, float] = {}
+        self._avg_len = 0.0
+        self._tokens: Dict[str, int] = {}
+        self.stats = {"requests": 0, "tools_sent": 0, "tools_available": 0, "tokens_saved": 0, "reused": 0}
+
+    def rebuild(self, definitions: List[ChatCompletionsToolDefinition], pinned: Iterable[str] = None):
+        """(Re)indexes the given tool definitions. Call again whenever the skill set changes."""
+        doc_terms, doc_len, tokens, order = {}, {}, {}, []
+        for definition in definitions:
+            function = definition.function
+            name = function.name
+            param_text = " ".join(
+                f"{param} {spec.get('description', '')}"
+                for param, spec in (function.parameters or {}).get("properties", {}).items()
+            )
+            # The name is the strongest signal, so it counts three times.
+            terms = tokenize(" ".join([name] * 3 + [function.description or "", param_text]))
+            doc_terms[name] = Counter(terms)
+            doc_len[name] = len(terms)
+            tokens[name] = estimate_message_tokens(definition)
+            order.append(name)
+
+        document_frequency = Counter(term for terms in doc_terms.values() for term in terms)
+        total = len(doc_terms)
+        idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_frequency.items()
+        }
+
+        with self._lock:
+            self._definitions = {d.function.name: d for d in definitions}
+            self._order = order
+            self._doc_terms = doc_terms
+            self._doc_len = doc_len
+            self._idf = idf
+            self._avg_len = (sum(doc_len.values()) / total) if total else 0.0
+            self._tokens = tokens
+            if pinned is not None:
+                self.pinned = set(pinned)
+
+        logger.info(f"🧰 Tool index built over {total} tools (top_k={self.top_k}, pinned={sorted(self.pinned)})")
+
+    def score(self, query: str) -> Dict[str, float]:
+        terms = tokenize(query)
+        scores = {}
+        for name, counts in self._doc_terms.items():
+            score = 0.0
+            length_norm = self.k1 * (1 - self.b + self.b * self._doc_len[name] / (self._avg_len or 1))
+            for term in terms:
+                freq = counts.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + length_norm)
+            if score > 0:
+                scores[name] = score
+        return scores
+
+    def select(self, query: str, always_include: Iterable[str] = (),
+               previous: Optional[List[ChatCompletionsToolDefinition]] = None) -> List[ChatCompletionsToolDefinition]:
+        """
+        Top-k relevant tools plus pinned/always_include ones, in index order (canonical: pinned
+        first, then by name). previous: what this session was sent last time; returned as is
+        when it still covers the selection and the index has not been rebuilt since.
+        """
+        with self._lock:
+            if len(self._order) <= self.top_k:
+                chosen = set(self._order)
+            else:
+                scores = self.score(query)
+                ranked = sorted(scores, key=scores.get, reverse=True)[:self.top_k]
+                chosen = set(ranked) | (self.pinned | set(always_include)) & set(self._definitions)
+
+            # Rebuilt definitions are new objects, so an identity check tells whether previous is current.
+            current = previous is not None and all(self._definitions.get(d.function.name) is d for d in previous)
+            kept = {d.function.name for d in previous} if current else set()
+            if current and chosen <= kept:
+                self.stats["reused"] += 1
+                chosen = kept
+            elif current and len(chosen | kept) <= self.max_tools:
+                chosen |= kept
+
+            selected = [self._definitions[name] for name in self._order if name in chosen]
+            saved = sum(self._tokens[name] for name in self._order if name not in chosen)
+
+            self.stats["requests"] += 1
+            self.stats["tools_sent"] += len(selected)
+            self.stats["tools_available"] += len(self._order)
+            self.stats["tokens_saved"] += saved
+
+        logger.info(f"🧰 Sending {len(selected)}/{len(self._order)} tools (~{saved} prompt tokens saved)")
+        return selected
+
+    def get_stats(self) -> Dict[str, float]:
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "indexed": len(self._order),
+            "top_k": self.top_k,
+            "max_tools": self.max_tools,
+            "pinned": sorted(self.pinned),
+            "avg_tokens_saved": round(self.stats["tokens_saved"] / requests, 1) if requests else 0.0,
+        }
@@ -0,0 +1,135 @@
+# core/tool_plans.py
+import json
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.registry import get_skill_metadata
+from core.router import normalize_utterance
+from core.response_cache import CONTEXT_DEPENDENT
+
+logger = logging.getLogger("NOVA_TOOL_PLANS")
+
+PLAN_REPLY_MODES = ("llm", "template")
+
+
+def signature_of(func: Callable) -> str:
+    return str(inspect.signature(func))
+
+
+def _plannable(name: str, tools_map: Dict[str, Callable]) -> bool:
+    """Only side-effect free skills may be replayed without the model (a learned "yes" must not delete a file again)."""
+    meta = get_skill_metadata(name)
+    return name in tools_map and meta is not None and meta.idempotent
+
+
+def _canonical_arguments(arguments: str) -> str:
+    try:
+        return json.dumps(json.loads(arguments or "{}"), sort_keys=True)
+    except ValueError:
+        return arguments
+
+
+@dataclass
+class ToolPlan:
+    calls: Tuple[Tuple[str, str], ...]  # (skill, JSON arguments), in the order the model issued them
+    signatures: Dict[str, str] = field(default_factory=dict)  # skill -> signature when it was observed
+    observations: int = 1
+    hits: int = 0
+
+    @property
+    def skills(self) -> List[str]:
+        return [name for name, _ in self.calls]
+
+
+class ToolPlanCache:
+    """
+    Learns which tool calls an utterance leads to. Once the model's first turn for the same
+    normalized utterance has picked the same calls (skills and arguments) min_observations times
+    in a row, the plan is trusted: later requests run those calls straight away, with fresh
+    results, and skip that LLM round trip. The reply is then phrased by the LLM as usual
+    (reply="llm") or built from the tool results (reply="template").
+
+    Only plans made of idempotent skills are learned or replayed: the key carries no
+    conversation context, so a call with side effects must always come from the model.
+    Follow-ups ("what about tomorrow") are never planned, a different choice by the model starts
+    the count again, and a plan is dropped as soon as one of its skills' signatures changes.
+    Shared by every session.
+    """
+
+    def __init__(self, min_observations: int = 3, max_entries: int = 512, reply: str = "llm"):
+        if reply not in PLAN_REPLY_MODES:
+            raise ValueError(f"Unknown tool plan reply mode '{reply}' (expected one of {PLAN_REPLY_MODES})")
+        self.min_observations = max(1, min_observations)
+        self.max_entries = max_entries
+        self.reply = reply
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[str, ToolPlan]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "learned": 0, "changed": 0, "invalidated": 0}
+
+    @staticmethod
+    def make_key(text: str) -> Optional[str]:
+        """The normalized utterance, or None when it depends on the conversation so far."""
+        utterance = normalize_utterance(text)
+        if not utterance or CONTEXT_DEPENDENT.search(utterance):
+            return None
+        return utterance
+
+    def lookup(self, key: Optional[str], tools_map: Dict[str, Callable]) -> Optional[ToolPlan]:
+        if key is None:
+            return None
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None or plan.observations < self.min_observations:
+                self.stats["misses"] += 1
+                return None
+            current = {name: signature_of(tools_map[name]) for name in plan.signatures if name in tools_map}
+            if current != plan.signatures or not all(_plannable(name, tools_map) for name in plan.signatures):
+                del self._plans[key]
+                self.stats["invalidated"] += 1
+                logger.info(f"🗺️ Tool plan for '{key}' dropped: {', '.join(plan.signatures)} changed")
+                return None
+            self._plans.move_to_end(key)
+            plan.hits += 1
+            self.stats["hits"] += 1
+            return plan
+
+    def observe(self, key: Optional[str], tool_calls, tools_map: Dict[str, Callable]):
+        """Records the model's first-turn choice for an utterance (no tool_calls: it answered directly)."""
+        if key is None:
+            return
+        calls = tuple((call.function.name, _canonical_arguments(call.function.arguments)) for call in tool_calls or ())
+        with self._lock:
+            plan = self._plans.get(key)
+            if not calls or not all(_plannable(name, tools_map) for name, _ in calls):
+                if plan is not None:
+                    del self._plans[key]
+                    self.stats["changed"] += 1
+                return
+
+            signatures = {name: signature_of(tools_map[name]) for name, _ in calls}
+            if plan is not None and plan.calls == calls and plan.signatures == signatures:
+                plan.observations += 1
+                if plan.observations == self.min_observations:
+                    self.stats["learned"] += 1
+                    logger.info(f"🗺️ Tool plan learned for '{key}': {', '.join(plan.skills)}")
+            else:
+                if plan is not None:
+                    self.stats["changed"] += 1
+                self._plans[key] = ToolPlan(calls=calls, signatures=signatures)
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            trusted = sum(1 for plan in self._plans.values() if plan.observations >= self.min_observations)
+            return {**self.stats, "plans": trusted, "candidates": len(self._plans) - trusted,
+                    "min_observations": self.min_observations, "reply": self.reply}
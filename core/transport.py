@@ -0,0 +1,220 @@
+# core/transport.py
+import time
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
+from azure.ai.inference import ChatCompletionsClient
+from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+
+from core.ratelimit import RATE_LIMITER, RateLimiter, RateLimitPolicy, AsyncRateLimitPolicy
+from core.encoding import EncodedChatCompletionsClient, AsyncEncodedChatCompletionsClient
+
+logger = logging.getLogger("NOVA_TRANSPORT")
+
+
+class _ManagedAioHttpTransport(AioHttpTransport):
+    """AioHttpTransport that borrows the manager's pooled session and never closes it."""
+
+    def __init__(self, manager: "TransportManager"):
+        super().__init__()
+        self._session_owner = False  # the session is created lazily on the running loop, see open()
+        self._manager = manager
+
+    async def open(self):
+        if self.session is None:
+            self.session = self._manager.async_session()
+        await super().open()
+
+
+class TransportManager:
+    """
+    One pooled, keep-alive HTTP stack shared by every Azure inference client in the process:
+    a requests.Session for sync clients and an aiohttp.ClientSession for async ones.
+    warm_up() pre-opens connections and keep_warm() pings the endpoint after idle periods so
+    DNS/TCP/TLS setup stays off the user-visible path. skill_http() is the pooled client for
+    async skills.
+    """
+
+    def __init__(self, pool_size: int = 20, keepalive: float = 120.0, idle_ping: float = 90.0):
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.idle_ping = idle_ping
+        self._sync_session: Optional[requests.Session] = None
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        self._skill_session: Optional[aiohttp.ClientSession] = None
+        self._skill_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._last_activity = time.monotonic()
+        self.stats = {"async_requests": 0, "async_new_connections": 0, "async_reused_connections": 0,
+                      "skill_requests": 0, "skill_private_sessions": 0, "warmups": 0, "last_warmup_ms": None}
+
+    def configure(self, pool_size: int = None, keepalive: float = None, idle_ping: float = None):
+        if pool_size is not None:
+            self.pool_size = pool_size
+        if keepalive is not None:
+            self.keepalive = keepalive
+        if idle_ping is not None:
+            self.idle_ping = idle_ping
+
+    def _touch(self, *_, **__):
+        self._last_activity = time.monotonic()
+
+    def sync_session(self) -> requests.Session:
+        with self._lock:
+            if self._sync_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.hooks["response"].append(self._touch)
+                self._sync_session = session
+            return self._sync_session
+
+    def async_session(self) -> aiohttp.ClientSession:
+        if self._async_session is None or self._async_session.closed:
+            trace = aiohttp.TraceConfig()
+
+            async def on_request_end(session, context, params):
+                self.stats["async_requests"] += 1
+                self._touch()
+
+            async def on_connection_create_end(session, context, params):
+                self.stats["async_new_connections"] += 1
+
+            async def on_connection_reuseconn(session, context, params):
+                self.stats["async_reused_connections"] += 1
+
+            trace.on_request_end.append(on_request_end)
+            trace.on_connection_create_end.append(on_connection_create_end)
+            trace.on_connection_reuseconn.append(on_connection_reuseconn)
+
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive, ttl_dns_cache=300),
+                trace_configs=[trace],
+                cookie_jar=aiohttp.DummyCookieJar(),
+                auto_decompress=False,  # azure-core decompresses responses itself
+                trust_env=True
+            )
+        return self._async_session
+
+    def bind_loop(self):
+        """Marks the running loop as the backend's: async skills awaited on it share one session."""
+        self._skill_loop = asyncio.get_running_loop()
+
+    @asynccontextmanager
+    async def skill_http(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        HTTP client for async skills. On the backend loop every skill shares one keep-alive pool.
+        An aiohttp session belongs to the loop that created it, so a skill awaited anywhere else
+        (asyncio.run on the blocking tool path, a sandbox worker) gets a session of its own.
+        """
+        self.stats["skill_requests"] += 1
+        if asyncio.get_running_loop() is self._skill_loop:
+            if self._skill_session is None or self._skill_session.closed:
+                self._skill_session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive, ttl_dns_cache=300),
+                    cookie_jar=aiohttp.DummyCookieJar(),
+                    trust_env=True
+                )
+            yield self._skill_session
+            return
+        self.stats["skill_private_sessions"] += 1
+        async with aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar(), trust_env=True) as session:
+            yield session
+
+    def sync_transport(self) -> RequestsTransport:
+        return RequestsTransport(session=self.sync_session(), session_owner=False)
+
+    def async_transport(self) -> AioHttpTransport:
+        return _ManagedAioHttpTransport(self)
+
+    @staticmethod
+    def _origin(endpoint: str) -> str:
+        parts = urlsplit(endpoint)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+    async def warm_up(self, endpoint: str) -> float:
+        """Opens (or refreshes) pooled connections to the endpoint. Any HTTP status counts as warm."""
+        origin = self._origin(endpoint)
+        start = time.perf_counter()
+
+        async def ping_async():
+            async with self.async_session().head(origin, allow_redirects=False) as response:
+                await response.read()
+
+        def ping_sync():
+            self.sync_session().head(origin, allow_redirects=False, timeout=10)
+
+        results = await asyncio.gather(ping_async(), asyncio.to_thread(ping_sync), return_exceptions=True)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            logger.warning(f"Transport warm-up incomplete: {errors[0]}")
+        self.stats["warmups"] += 1
+        self.stats["last_warmup_ms"] = round(elapsed_ms, 1)
+        return elapsed_ms
+
+    async def keep_warm(self, endpoints: List[str]):
+        """Background loop: pings every endpoint whenever the pool has been idle for idle_ping seconds."""
+        while True:
+            idle = time.monotonic() - self._last_activity
+            if idle >= self.idle_ping:
+                await asyncio.gather(*(self.warm_up(endpoint) for endpoint in endpoints))
+                idle = 0
+            await asyncio.sleep(max(1.0, self.idle_ping - idle))
+
+    def _sync_pool_stats(self) -> dict:
+        connections = requests_made = 0
+        if self._sync_session is not None:
+            for adapter in set(self._sync_session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools[key]
+                    connections += pool.num_connections
+                    requests_made += pool.num_requests
+        return {"sync_requests": requests_made, "sync_new_connections": connections,
+                "sync_reused_connections": max(0, requests_made - connections)}
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            **self._sync_pool_stats(),
+            "idle_seconds": round(time.monotonic() - self._last_activity, 1),
+            "pool_size": self.pool_size,
+        }
+
+    async def close(self):
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        if self._skill_session is not None and not self._skill_session.closed:
+            await self._skill_session.close()
+        self._skill_session = None
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+
+
+TRANSPORT = TransportManager()
+
+
+# Status retries belong to the rate limit policy (backoff, shared pauses, deadline);
+# the SDK's own RetryPolicy keeps handling connection errors only.
+def create_sync_client(endpoint: str, key: str, limiter: RateLimiter = None) -> ChatCompletionsClient:
+    return EncodedChatCompletionsClient(endpoint=endpoint, credential=AzureKeyCredential(key), transport=TRANSPORT.sync_transport(),
+                                 per_call_policies=[RateLimitPolicy(limiter or RATE_LIMITER)], retry_status=0)
+
+
+def create_async_client(endpoint: str, key: str, limiter: RateLimiter = None) -> AsyncChatCompletionsClient:
+    return AsyncEncodedChatCompletionsClient(endpoint=endpoint, credential=AzureKeyCredential(key), transport=TRANSPORT.async_transport(),
+                                      per_call_policies=[AsyncRateLimitPolicy(limiter or RATE_LIMITER)], retry_status=0)
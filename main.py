@@ -1,27 +1,43 @@
 import os
+import json
+import time
+import asyncio
 import pkgutil
 import importlib
 import logging
 import traceback
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from typing import Any, Optional
+
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from azure.core.exceptions import HttpResponseError, ClientAuthenticationError
+from azure.core.exceptions import HttpResponseError, ClientAuthenticationError, ServiceRequestError, ServiceResponseError
 
 
 import skills  
-from core.registry import get_all_skills
-from core.llm import initialize_brain # Renamed from initialize_gemini
+from core.registry import get_all_skills, get_skill_metadata
+from core.llm import initialize_brain, shutdown_brain, warm_up_brain, keep_brain_warm, InvalidArguments # Renamed from initialize_gemini
+from core.sessions import SessionManager, DEFAULT_SESSION_ID
+from core.cache import SKILL_CACHE
+from core.transport import TRANSPORT
+from core.ratelimit import RATE_LIMITER
+from core.prefix import PREFIX_MONITOR
+from core.tokens import USAGE_LEDGER, TokenBudgetExceeded
+from core.sandbox import SANDBOX
+from core.scheduler import SKILL_SCHEDULER
+import core.llm
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("NOVA")
 
-chat_session = None
+session_manager = None
+skill_session = None  # runs direct /skills/{name}/invoke calls; its history is never used
 
 def load_plugins():
     logger.info("🔌 Loading Plugins...")
@@ -35,11 +51,18 @@ def load_plugins():
         except Exception as e:
             logger.error(f"❌ Failed to load {name}: {e}")
 
+async def sweep_sessions():
+    while True:
+        await asyncio.sleep(60)
+        if session_manager:
+            await session_manager.sweep()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global chat_session
+    global session_manager, skill_session
     logger.info("🚀 System Boot Sequence Initiated...")
-    load_dotenv(override=True)
+    # Benchmarks set NOVA_DOTENV_OVERRIDE=false so their fake endpoint is not replaced by the real one in .env
+    load_dotenv(override=os.getenv("NOVA_DOTENV_OVERRIDE", "true").lower() == "true")
     
     # 1. Load Skills
     load_plugins()
@@ -49,13 +72,26 @@ async def lifespan(app: FastAPI):
     # 2. Initialize Brain (Azure)
     try:
         chat_session = initialize_brain(tools_list=tools)
+        skill_session = chat_session.fork()
+        session_manager = SessionManager(
+            factory=chat_session.fork,
+            max_sessions=int(os.getenv("NOVA_MAX_SESSIONS", 32)),
+            idle_ttl=float(os.getenv("NOVA_SESSION_TTL", 900))
+        )
+        await warm_up_brain()
         logger.info("🧠 Azure Brain Connected Successfully.")
     except Exception as e:
         logger.critical(f"🔥 Failed to connect to Azure AI: {e}")
         traceback.print_exc()
+
+    sweeper = asyncio.create_task(sweep_sessions())
+    keep_warm = asyncio.create_task(keep_brain_warm())
         
     yield
     logger.info("💤 System Shutting Down...")
+    sweeper.cancel()
+    keep_warm.cancel()
+    await shutdown_brain()
 
 app = FastAPI(title="N.O.V.A Backend", lifespan=lifespan)
 
@@ -69,52 +105,361 @@ app.add_middleware(
 
 class UserInput(BaseModel):
     text: str
+    session_id: str = DEFAULT_SESSION_ID
+    use_cache: bool = True
 
 class AIResponse(BaseModel):
     response: str
     action_taken: bool = False
+    session_id: str = DEFAULT_SESSION_ID
+    usage: Optional[dict] = None
 
+class SkillInvocation(BaseModel):
+    args: dict = {}
+    use_cache: bool = True
 
-@app.post("/chat", response_model=AIResponse)
-async def chat_endpoint(payload: UserInput):
-    global chat_session
-    
-    if not chat_session:
+class SkillResult(BaseModel):
+    skill: str
+    status: str  # ok | error | timeout
+    result: Any = None
+    error: Optional[str] = None
+    cached: bool = False
+    elapsed_ms: float
+
+
+def azure_error_message(e: HttpResponseError) -> str:
+    error_msg = str(e)
+    logger.error(f"☁️ AZURE ERROR: {error_msg}")
+
+    if e.status_code == 429:
+        return "I have reached my processing limit. Please wait a moment."
+    elif e.status_code == 401:
+        return "My authentication credentials seem to be invalid."
+    else:
+        return "I'm having trouble connecting to the cloud."
+
+
+def require_session(payload: UserInput):
+    if not session_manager:
         raise HTTPException(status_code=503, detail="Brain not initialized.")
 
+    try:
+        SessionManager.validate_id(payload.session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def record_usage(session_id: str, usage) -> dict:
+    """Adds one request's token usage to its session total and logs it (the GUI reads this line)."""
+    USAGE_LEDGER.record_request(session_id, usage)
+    if usage.calls:
+        total = USAGE_LEDGER.get_stats()
+        logger.info(f"📊 Usage: {usage.prompt_tokens} prompt ({usage.cached_tokens} cached) + {usage.completion_tokens} completion tokens, "
+                    f"${usage.cost:.4f} | total {total['total_tokens']} tokens, ${total['cost']:.4f}")
+    return usage.as_dict()
+
+
+class ClientDisconnected(Exception):
+    """The caller closed the connection before the response was ready."""
+
+
+async def cancel_on_disconnect(request: Request, call):
+    """
+    Awaits `call`, cancelling it (LLM call, tool loop) as soon as the client closes the connection.
+    Streaming responses get the same from Starlette, which cancels the stream on disconnect.
+    """
+    task = asyncio.ensure_future(call)
+
+    async def disconnected():
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+
+    watcher = asyncio.create_task(disconnected())
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.wait({task})
+    if task.cancelled():
+        raise ClientDisconnected()
+    return task.result()
+
+
+def server_timing(stages: dict) -> str:
+    """Server-Timing header value (milliseconds), readable by browsers' dev tools and the load generator."""
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items())
+
+
+@app.post("/chat", response_model=AIResponse)
+async def chat_endpoint(payload: UserInput, request: Request, response: Response):
+    require_session(payload)
+
+    started = time.perf_counter()
+    stages = {}
+    usage = None
     try:
         logger.info(f"User: {payload.text}")
-        response_wrapper = chat_session.send_message(payload.text)
+        USAGE_LEDGER.check_session(payload.session_id)
+        async with session_manager.session(payload.session_id) as chat_session:
+            stages["session"] = time.perf_counter() - started
+            try:
+                response_wrapper = await cancel_on_disconnect(
+                    request, chat_session.send_message_async(payload.text, use_cache=payload.use_cache))
+            finally:
+                stages.update(chat_session.timings)
+                usage = record_usage(payload.session_id, chat_session.usage)
         if not response_wrapper.text:
             raise ValueError("AI returned an empty response.")
             
         logger.info(f"NOVA: {response_wrapper.text}")
+        response.headers["X-Nova-Outcome"] = "ok"
         
         return AIResponse(
             response=response_wrapper.text,
-            action_taken=response_wrapper.action_taken
+            action_taken=response_wrapper.action_taken,
+            session_id=payload.session_id,
+            usage=usage
         )
 
+    except TokenBudgetExceeded as e:
+        logger.warning(f"💸 {e}")
+        response.headers["X-Nova-Outcome"] = "over_budget"
+        return AIResponse(response="That request is over my token budget.", action_taken=False,
+                          session_id=payload.session_id, usage=usage)
+
+    except ClientDisconnected:
+        logger.info("🔌 Client disconnected, request cancelled.")
+        response.headers["X-Nova-Outcome"] = "client_closed"
+        return AIResponse(response="", action_taken=False, session_id=payload.session_id, usage=usage)
+
     except HttpResponseError as e:
-        error_msg = str(e)
-        logger.error(f"☁️ AZURE ERROR: {error_msg}")
-        
-        if "429" in error_msg:
-            friendly_error = "I have reached my processing limit. Please wait a moment."
-        elif "401" in error_msg:
-            friendly_error = "My authentication credentials seem to be invalid."
-        else:
-            friendly_error = "I'm having trouble connecting to the cloud."
-        return AIResponse(response=friendly_error, action_taken=False)
+        response.headers["X-Nova-Outcome"] = "throttled" if e.status_code == 429 else "upstream_error"
+        return AIResponse(response=azure_error_message(e), action_taken=False, session_id=payload.session_id)
 
     except Exception as e:
         logger.error(f"SERVER ERROR: {str(e)}")
         traceback.print_exc() 
+        unreachable = isinstance(e, (ServiceRequestError, ServiceResponseError))
+        response.headers["X-Nova-Outcome"] = "upstream_unreachable" if unreachable else "server_error"
         return AIResponse(
             response="I am encountering a technical issue.",
-            action_taken=False
+            action_taken=False,
+            session_id=payload.session_id
         )
 
+    finally:
+        stages["total"] = time.perf_counter() - started
+        response.headers["Server-Timing"] = server_timing(stages)
+
+
+def sse_event(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(payload: UserInput):
+    """
+    Server-sent events version of /chat. Emits 'delta', 'tool_start', 'tool_end',
+    then a single 'final' (or 'error') event.
+    """
+    require_session(payload)
+
+    async def event_source():
+        try:
+            logger.info(f"User: {payload.text}")
+            USAGE_LEDGER.check_session(payload.session_id)
+            async with session_manager.session(payload.session_id) as chat_session:
+                try:
+                    async for event in chat_session.stream_message(payload.text, use_cache=payload.use_cache):
+                        if event["type"] == "final":
+                            logger.info(f"NOVA: {event['response']}")
+                            event["session_id"] = payload.session_id
+                        yield sse_event(event)
+                finally:
+                    record_usage(payload.session_id, chat_session.usage)
+
+        except asyncio.CancelledError:
+            logger.info("🔌 Client disconnected, stream cancelled.")
+            raise
+
+        except TokenBudgetExceeded as e:
+            logger.warning(f"💸 {e}")
+            yield sse_event({"type": "error", "response": "That request is over my token budget.", "session_id": payload.session_id})
+
+        except HttpResponseError as e:
+            yield sse_event({"type": "error", "response": azure_error_message(e), "session_id": payload.session_id})
+
+        except Exception as e:
+            logger.error(f"SERVER ERROR: {str(e)}")
+            traceback.print_exc()
+            yield sse_event({"type": "error", "response": "I am encountering a technical issue.", "session_id": payload.session_id})
+
+    return StreamingResponse(event_source(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/skills")
+async def skills_endpoint():
+    """Registered skills: parameters and execution metadata, plus the scheduler's resource and wait counters."""
+    definitions = {definition.function.name: definition.function for definition in core.llm.NOVA_TOOL_DEFINITIONS}
+    skills = []
+    for func in get_all_skills():
+        definition = definitions.get(func.__name__)
+        description = (definition.description if definition else func.__doc__ or "").strip()
+        skills.append({
+            "name": func.__name__,
+            "description": description.splitlines()[0].strip() if description else "",
+            "parameters": definition.parameters if definition else None,
+            **get_skill_metadata(func.__name__).describe(),
+        })
+    return {"skills": skills, "scheduler": SKILL_SCHEDULER.get_stats()}
+
+@app.post("/skills/{name}/invoke", response_model=SkillResult)
+async def skill_invoke_endpoint(name: str, payload: SkillInvocation, request: Request, response: Response):
+    """
+    Runs one skill directly, without the LLM (GUI buttons and sliders, scripts). Only skills
+    registered with direct_call=True can be invoked. Arguments are validated against the skill's
+    signature; the result cache and timeouts apply as in /chat.
+
+    The app-wide CORS policy is open, so browser requests (which carry an Origin header) are
+    refused unless their origin is listed in NOVA_INVOKE_ORIGINS: a web page must not be able to
+    drive local skills.
+    """
+    if skill_session is None:
+        raise HTTPException(status_code=503, detail="Brain not initialized.")
+    origin = request.headers.get("origin")
+    allowed_origins = {o.strip() for o in os.getenv("NOVA_INVOKE_ORIGINS", "").split(",") if o.strip()}
+    if origin is not None and origin not in allowed_origins:
+        logger.warning(f"🚫 Direct call to {name} refused for origin {origin}")
+        raise HTTPException(status_code=403, detail="Direct skill calls are not allowed from this origin.")
+    meta = get_skill_metadata(name)
+    if name not in skill_session.tools_map or meta is None:
+        raise HTTPException(status_code=404, detail=f"Unknown skill '{name}'.")
+    if not meta.direct_call:
+        raise HTTPException(status_code=403, detail=f"Skill '{name}' does not allow direct calls.")
+    try:
+        outcome = await cancel_on_disconnect(request, skill_session.invoke_skill_async(name, payload.args, use_cache=payload.use_cache))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown skill '{name}'.")
+    except InvalidArguments as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ClientDisconnected:
+        logger.info(f"🔌 Client disconnected, {name} call cancelled.")
+        response.headers["X-Nova-Outcome"] = "client_closed"
+        return SkillResult(skill=name, status="error", error="client disconnected", elapsed_ms=0)
+
+    result = outcome["result"]
+    if not isinstance(result, (str, int, float, bool, list, dict, type(None))):
+        outcome["result"] = str(result)
+    logger.info(f"⚡ Direct: {name} -> {outcome['status']}{' (cached)' if outcome['cached'] else ''} in {outcome['elapsed_ms']:.1f}ms")
+    response.headers["X-Nova-Outcome"] = outcome["status"]
+    response.headers["Server-Timing"] = server_timing({"skill": outcome["elapsed_ms"] / 1000})
+    return SkillResult(**outcome)
+
+@app.get("/cache")
+async def cache_stats_endpoint():
+    """Per-skill result cache counters (hits, misses, collapsed concurrent calls, live entries)."""
+    return SKILL_CACHE.get_stats()
+
+
+@app.delete("/cache")
+async def cache_clear_endpoint(skill: str = None):
+    SKILL_CACHE.invalidate(skill)
+    if skill is None and core.llm.NOVA_RESPONSE_CACHE is not None:
+        core.llm.NOVA_RESPONSE_CACHE.clear()
+    return {"cleared": skill or "all"}
+
+
+@app.get("/cache/responses")
+async def response_cache_stats_endpoint():
+    """Opt-in response cache counters (NOVA_RESPONSE_CACHE=true)."""
+    if core.llm.NOVA_RESPONSE_CACHE is None:
+        return {"enabled": False}
+    return {"enabled": True, **core.llm.NOVA_RESPONSE_CACHE.get_stats()}
+
+@app.get("/router")
+async def router_stats_endpoint():
+    """Local fast-path router counters and hit rate."""
+    if core.llm.NOVA_ROUTER is None:
+        return {"enabled": False}
+    return {"enabled": True, **core.llm.NOVA_ROUTER.get_stats()}
+
+@app.get("/tools/selection")
+async def tool_selection_stats_endpoint():
+    """Relevance-based tool selection counters, including prompt tokens saved."""
+    if core.llm.NOVA_TOOL_INDEX is None:
+        return {"enabled": False}
+    return {"enabled": True, **core.llm.NOVA_TOOL_INDEX.get_stats()}
+
+@app.get("/tools/plans")
+async def tool_plans_stats_endpoint():
+    """Learned utterance -> tool plan counters (LLM turns skipped = hits)."""
+    if core.llm.NOVA_TOOL_PLANS is None:
+        return {"enabled": False}
+    return {"enabled": True, **core.llm.NOVA_TOOL_PLANS.get_stats()}
+
+@app.delete("/tools/plans")
+async def tool_plans_clear_endpoint():
+    if core.llm.NOVA_TOOL_PLANS is not None:
+        core.llm.NOVA_TOOL_PLANS.clear()
+    return {"cleared": "all"}
+
+@app.get("/transport")
+async def transport_stats_endpoint():
+    """Connection pool reuse and warm-up stats for the shared inference transport."""
+    return TRANSPORT.get_stats()
+
+@app.get("/ratelimit")
+async def rate_limit_stats_endpoint():
+    """Client-side quota pacing and 429 retry counters."""
+    return RATE_LIMITER.get_stats()
+
+@app.get("/deployments")
+async def deployments_stats_endpoint():
+    """Per-deployment latency, errors and hedging counters (single deployment: pool disabled)."""
+    stats = {"enabled": False, "deployment": core.llm.NOVA_MODEL}
+    if core.llm.NOVA_DEPLOYMENT_POOL is not None:
+        stats = {"enabled": True, **core.llm.NOVA_DEPLOYMENT_POOL.get_stats()}
+    if core.llm.NOVA_FAST_DEPLOYMENT_POOL is not None:
+        stats["fast"] = core.llm.NOVA_FAST_DEPLOYMENT_POOL.get_stats()
+    return stats
+
+@app.get("/models/routing")
+async def model_routing_stats_endpoint():
+    """Fast vs large model routing: calls, latency, prompt tokens and the reasons behind each route."""
+    if core.llm.NOVA_MODEL_ROUTER is None:
+        return {"enabled": False}
+    return {"enabled": True, **core.llm.NOVA_MODEL_ROUTER.get_stats()}
+
+@app.get("/prompt-cache")
+async def prompt_cache_stats_endpoint():
+    """Provider-side prompt caching: cached vs total prompt tokens, and how often a session's prefix changed."""
+    return PREFIX_MONITOR.get_stats()
+
+@app.get("/usage")
+async def usage_stats_endpoint(session_id: str = None):
+    """Token usage and estimated cost (NOVA_PRICING) in total and per model, session and skill; or one session's."""
+    return USAGE_LEDGER.get_stats(session_id)
+
+@app.get("/sandbox")
+async def sandbox_stats_endpoint():
+    """Process pool for isolation="process" skills: workers, limits, crashes and restarts."""
+    return SANDBOX.get_stats()
+
+@app.get("/cassette")
+async def cassette_stats_endpoint():
+    """Record/replay state of the LLM cassette (NOVA_CASSETTE_MODE=record|replay)."""
+    if core.llm.NOVA_CASSETTE is None:
+        return {"enabled": False}
+    return {"enabled": True, **core.llm.NOVA_CASSETTE.get_stats()}
+
+@app.get("/history")
+async def history_stats_endpoint():
+    """History budgeting counters (truncated tool outputs, folded turns, summaries)."""
+    if core.llm.NOVA_HISTORY_MANAGER is None:
+        return {"enabled": False}
+    return {"enabled": True, **core.llm.NOVA_HISTORY_MANAGER.get_stats()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -231,11 +231,15 @@ class NovaMainWindow(QMainWindow):
         self.card_commands = StatCard("Commands Today", "0")
         self.card_response = StatCard("Avg Response", "0.0s")
         self.card_uptime = StatCard("Uptime", "00:00:00")
+        self.card_tokens = StatCard("Tokens Used", "0")
+        self.card_cost = StatCard("Est. Cost", "$0.00")
 
         stats_grid.addWidget(self.card_skills, 0, 0)
         stats_grid.addWidget(self.card_commands, 0, 1)
         stats_grid.addWidget(self.card_response, 1, 0)
         stats_grid.addWidget(self.card_uptime, 1, 1)
+        stats_grid.addWidget(self.card_tokens, 2, 0)
+        stats_grid.addWidget(self.card_cost, 2, 1)
 
         layout.addLayout(stats_grid)
 
@@ -266,7 +270,7 @@ class NovaMainWindow(QMainWindow):
 
     def send_backend_request(self, text):
         try:
-            requests.post("http://localhost:8000/chat", json={"text": text})
+            requests.post("http://localhost:8000/chat", json={"text": text, "session_id": "gui"})
         except Exception as e:
             logging.error(f"Failed to send GUI command: {e}")
 
@@ -368,6 +372,12 @@ class NovaMainWindow(QMainWindow):
             self.status_label.setText("Waiting for Wake Word...")
             self.mic_widget.set_state("idle")
 
+        if "Usage:" in text:
+            match = re.search(r"total (\d+) tokens, \$([\d.]+)", text)
+            if match:
+                self.card_tokens.lbl_value.setText(f"{int(match.group(1)):,}")
+                self.card_cost.lbl_value.setText(f"${float(match.group(2)):.2f}")
+
         if "Listening..." in text:
             self.status_label.setText("Listening...")
             self.mic_widget.set_state("listening")
@@ -4,7 +4,7 @@ import logging
 
 logger = logging.getLogger("NOVA")
 
-@skill
+@skill(timeout=20, idempotent=False, latency="slow")
 def launch_application(app_name: str):
     """
     Opens any installed application on the Windows system by its name.
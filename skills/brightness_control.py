@@ -1,8 +1,12 @@
-from core.registry import skill
+from core.registry import skill, Intent
 from typing import Optional
 import screen_brightness_control as sbc
 
-@skill
+@skill(intents=[
+    Intent(r"(set|change) (the )?(screen )?brightness to (?P<value>\d{1,3})( ?%| percent)?", args={"action": "set"}),
+    Intent(r"(increase|raise|turn up) (the )?(screen )?brightness", args={"action": "increase"}),
+    Intent(r"(decrease|lower|reduce|turn down|dim) (the )?(screen )?brightness", args={"action": "decrease"}),
+], idempotent=False, resources=("display",), direct_call=True)
 def control_brightness(action: str, value: Optional[int] = None) -> str:
     """
     Control the Windows laptop screen brightness.
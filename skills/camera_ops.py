@@ -1,6 +1,6 @@
 from core.registry import skill
 
-@skill
+@skill(idempotent=False, resources=("camera",))
 def enable_visual_system():
     """
     Activates the camera and visual input systems. 
@@ -1,9 +1,16 @@
+import asyncio
+import aiohttp
 from core.registry import skill
-import requests
+from core.transport import TRANSPORT
 
 
-@skill
-def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
+def _is_conversion(result: str) -> bool:
+    # Failures are returned as text ("Error: ...", "Network error ..."); only conversions are cached.
+    return not result.startswith(("Error", "Network error", "Unexpected error"))
+
+
+@skill(cache_ttl=600, cache_if=_is_conversion, latency="slow", direct_call=True)
+async def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
     """
     Converts an amount from one currency to another using real-time exchange rates.
 
@@ -31,9 +38,10 @@ def convert_currency(amount: float, from_currency: str, to_currency: str) -> str
             "amount": amount
         }
 
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        async with TRANSPORT.skill_http() as http:
+            async with http.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
 
         if not data.get("success", False):
             return f"Error: Unable to fetch exchange rate for {from_currency} to {to_currency}."
@@ -52,8 +60,8 @@ def convert_currency(amount: float, from_currency: str, to_currency: str) -> str
             f"Exchange Rate: 1 {from_currency} = {rate:.6f} {to_currency}"
         )
 
-    except requests.exceptions.RequestException as e:
-        return f"Network error while fetching exchange rates: {str(e)}"
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return f"Network error while fetching exchange rates: {str(e) or type(e).__name__}"
     except ValueError:
         return "Error: Invalid numeric value provided."
     except Exception as e:
@@ -18,7 +18,7 @@ def read_file(file_path: str):
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
-@skill
+@skill(idempotent=False)
 def write_file(file_path: str, content: str):
     """
     Creates a new file or overwrites an existing one with the provided content.
@@ -38,7 +38,7 @@ def write_file(file_path: str, content: str):
     except Exception as e:
         return f"Error writing file: {str(e)}"
 
-@skill
+@skill(idempotent=False)
 def create_folder(folder_path: str):
     """
     Creates a new folder (directory).
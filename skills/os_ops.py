@@ -1,9 +1,9 @@
 import os
 import platform
 import subprocess
-from core.registry import skill
+from core.registry import skill, Intent
 
-@skill
+@skill(intents=[Intent(r"(open|launch|start) (the |my )?calc(ulator)?( app)?")], idempotent=False)
 def open_calculator():
     """
     Opens the calculator application on the user's computer.
@@ -16,15 +16,3 @@ def open_calculator():
     elif system == "Linux":
         subprocess.Popen(["gnome-calculator"])
     return "Calculator opened successfully."
-
-@skill
-def get_system_info():
-    """
-    Returns details about the current operating system, release version, and processor.
-    Useful for answering 'what computer is this' or 'specs'.
-    """
-    return {
-        "os": platform.system(),
-        "release": platform.release(),
-        "processor": platform.processor()
-    }
\ No newline at end of file
@@ -8,7 +8,7 @@ except ImportError:
     pyautogui = None
 
 
-@skill
+@skill(idempotent=False, resources=("display",))
 def capture_screenshot(file_path: str, add_timestamp: bool = False) -> str:
     """
     Capture a screenshot of the current screen and save it to the specified file path.
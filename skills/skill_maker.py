@@ -1,12 +1,14 @@
 import os
 import json
+import importlib
 import subprocess
 import core.llm
-from core.registry import skill, get_all_skills
+from core.registry import skill, get_all_skills, mark_generated
 from azure.ai.inference.models import SystemMessage, UserMessage
 from azure.core.exceptions import HttpResponseError
 
-@skill
+# Generating the code and installing its dependencies takes far longer than a regular skill.
+@skill(timeout=300, idempotent=False, max_concurrency=1, latency="slow")
 def create_new_skill(skill_description: str) -> str:
     if not core.llm.NOVA_CLIENT or not core.llm.NOVA_MODEL:
         return "AI Client not initialized."
@@ -59,9 +61,17 @@ Rules:
         backend_file = data.get("backend_filename")
         backend_code = data.get("backend_code")
         if backend_file and backend_code:
+            module = f"skills.{os.path.splitext(backend_file)[0]}"
+            # Generated code is untrusted: the registry runs its skills in the sandbox pool
+            # (core/sandbox.py), whatever isolation the code asks for.
+            mark_generated(module)
             os.makedirs("skills", exist_ok=True)
             with open(f"skills/{backend_file}", "w", encoding="utf-8") as f:
                 f.write(backend_code)
+            # Register the new skill right away so the router and tool index pick it up without a restart.
+            importlib.invalidate_caches()
+            importlib.import_module(module)
+            core.llm.refresh_tools()
                 
         ui_file = data.get("ui_filename")
         ui_code = data.get("ui_code")
@@ -1,12 +1,23 @@
-from core.registry import skill
+from core.registry import skill, Intent
 import platform
 import subprocess
 import os
 
-@skill
+@skill(intents=[
+    Intent(r"mute( the)?( system)?( volume| sound| audio)?", args={"setting": "volume", "action": "mute"}),
+    Intent(r"unmute( the)?( system)?( volume| sound| audio)?", args={"setting": "volume", "action": "unmute"}),
+    Intent(r"(set|change) (the )?(system )?volume to (?P<value>\d{1,3})( ?%| percent)?", args={"setting": "volume", "action": "set"}),
+    Intent(r"turn (?P<action>on|off) (the )?(wifi|wi-fi)", args={"setting": "wifi"}),
+    Intent(r"turn (?P<action>on|off) (the )?bluetooth", args={"setting": "bluetooth"}),
+], timeout=15, idempotent=False, max_concurrency=1)
 def control_system(setting: str, action: str, value: int | None = None) -> str:
     """
     Control essential laptop system settings.
+
+    Args:
+        setting: One of 'volume', 'wifi', 'internet' or 'bluetooth'.
+        action: 'set', 'mute' or 'unmute' for volume; 'on' or 'off' for wifi and bluetooth.
+        value: Volume percentage (0-100), only used with action 'set'.
     """
     try:
         system = platform.system().lower()
@@ -25,7 +36,7 @@ def control_system(setting: str, action: str, value: int | None = None) -> str:
                         "-Command",
                         "$wshell = New-Object -ComObject WScript.Shell; "
                         "1..50 | ForEach-Object { $wshell.SendKeys([char]174) }"
-                    ], capture_output=True)
+                    ], capture_output=True, timeout=10)
 
                     # Windows typically has ~50 volume steps
                     steps = int(value / 2)
@@ -36,7 +47,7 @@ def control_system(setting: str, action: str, value: int | None = None) -> str:
                         "-Command",
                         f"$wshell = New-Object -ComObject WScript.Shell; "
                         f"1..{steps} | ForEach-Object {{ $wshell.SendKeys([char]175) }}"
-                    ], capture_output=True)
+                    ], capture_output=True, timeout=10)
 
                     return f"System volume set to approximately {value}%."
 
@@ -45,7 +56,7 @@ def control_system(setting: str, action: str, value: int | None = None) -> str:
                         "powershell",
                         "-Command",
                         "(New-Object -ComObject WScript.Shell).SendKeys([char]173)"
-                    ], capture_output=True)
+                    ], capture_output=True, timeout=10)
                     return "System volume muted."
 
                 elif action == "unmute":
@@ -53,7 +64,7 @@ def control_system(setting: str, action: str, value: int | None = None) -> str:
                         "powershell",
                         "-Command",
                         "(New-Object -ComObject WScript.Shell).SendKeys([char]173)"
-                    ], capture_output=True)
+                    ], capture_output=True, timeout=10)
                     return "System volume unmuted."
 
                 else:
@@ -65,10 +76,10 @@ def control_system(setting: str, action: str, value: int | None = None) -> str:
         elif setting in ["wifi", "internet"]:
             if system == "windows":
                 if action == "on":
-                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"], capture_output=True)
+                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"], capture_output=True, timeout=10)
                     return "Wi-Fi turned ON."
                 elif action == "off":
-                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"], capture_output=True)
+                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"], capture_output=True, timeout=10)
                     return "Wi-Fi turned OFF."
                 else:
                     return "Unsupported Wi-Fi action."
@@ -83,14 +94,14 @@ def control_system(setting: str, action: str, value: int | None = None) -> str:
                         "powershell",
                         "-Command",
                         "Start-Service bthserv"
-                    ], capture_output=True)
+                    ], capture_output=True, timeout=10)
                     return "Bluetooth service started (may require admin privileges)."
                 elif action == "off":
                     subprocess.run([
                         "powershell",
                         "-Command",
                         "Stop-Service bthserv"
-                    ], capture_output=True)
+                    ], capture_output=True, timeout=10)
                     return "Bluetooth service stopped (may require admin privileges)."
                 else:
                     return "Unsupported Bluetooth action."
@@ -6,16 +6,17 @@ Provides detailed information about system resources and hardware.
 import psutil
 import platform
 from datetime import datetime
-from core.registry import skill
+from core.registry import skill, Intent
 
 
-@skill
+@skill(cache_ttl=15, latency="normal", direct_call=True)
 def get_system_info():
     """Get complete system information."""
     try:
         # OS Information
         os_name = platform.system()
         os_version = platform.release()
+        processor = platform.processor() or platform.machine()
         
         # CPU Information
         cpu_percent = psutil.cpu_percent(interval=1)
@@ -44,7 +45,7 @@ def get_system_info():
                 battery_info = f" Battery is at {battery_percent}% and {plugged}."
         
         response = (
-            f"System Status: Running {os_name} {os_version}. "
+            f"System Status: Running {os_name} {os_version} on {processor}. "
             f"CPU usage is at {cpu_percent}% across {cpu_count} cores. "
             f"Memory: {memory_used_gb:.1f} GB used out of {memory_total_gb:.1f} GB ({memory_percent}%). "
             f"Disk: {disk_used_gb:.1f} GB used out of {disk_total_gb:.1f} GB ({disk_percent}%)."
@@ -57,7 +58,7 @@ def get_system_info():
         return f"Unable to retrieve system information: {str(e)}"
 
 
-@skill
+@skill(cache_ttl=5, latency="normal", direct_call=True, intents=[Intent(r"((what's|what is|how's|how is|check) (my |the )?)?cpu( usage| load)?")])
 def get_cpu_usage():
     """Get CPU usage."""
     try:
@@ -77,7 +78,7 @@ def get_cpu_usage():
         return f"Unable to get CPU usage: {str(e)}"
 
 
-@skill
+@skill(direct_call=True, intents=[Intent(r"((what's|what is|how's|how is|check) (my |the )?)?(memory|ram)( usage)?")])
 def get_memory_usage():
     """Get memory usage."""
     try:
@@ -104,7 +105,7 @@ def get_memory_usage():
         return f"Unable to get memory usage: {str(e)}"
 
 
-@skill
+@skill(cache_ttl=60, direct_call=True, intents=[Intent(r"((what's|what is|how's|how is|check) (my |the )?)?(disk|storage)( usage| space)?")])
 def get_disk_usage():
     """Get disk usage."""
     try:
@@ -131,7 +132,7 @@ def get_disk_usage():
         return f"Unable to get disk usage: {str(e)}"
 
 
-@skill
+@skill(direct_call=True, intents=[Intent(r"((what's|what is|how's|how is|check) (my |the )?)?battery( level| status| percentage)?")])
 def get_battery_status():
     """Get battery information."""
     try:
@@ -181,7 +182,7 @@ def get_network_stats():
         return f"Unable to get network statistics: {str(e)}"
 
 
-@skill
+@skill(direct_call=True, intents=[Intent(r"((what's|what is|check) (my |the )?)?(system )?uptime|how long has (my |the )?(system|computer|pc) been (on|running)")])
 def get_system_uptime():
     """Get system uptime."""
     try:
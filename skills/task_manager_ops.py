@@ -1,21 +1,26 @@
-from core.registry import skill
+from core.registry import skill, Intent
 import os
 import json
-from typing import Optional
+from typing import Any, Dict, List, Optional, Union
 
 TASK_FILE = "tasks.json"
+DONE_PREFIX = "✅ "
 
-@skill
-def manage_tasks(action: str, task: Optional[str] = None) -> str:
+@skill(intents=[
+    Intent(r"((list|show)( me)? my tasks|(list|show)( me)? (the |my )?task list|what are my tasks|what's on my task list)", args={"action": "list"}),
+], idempotent=False, max_concurrency=1, direct_call=True)
+def manage_tasks(action: str, task: Optional[str] = None, format: str = "text") -> Union[str, List[Dict[str, Any]]]:
     """
     Manage a simple personal task list.
 
     Args:
-        action (str): The action to perform. Options: 'add', 'list', 'remove', 'clear'.
-        task (Optional[str]): The task description (required for 'add' and 'remove').
+        action (str): The action to perform. Options: 'add', 'list', 'remove', 'complete', 'clear'.
+        task (Optional[str]): The task description (required for 'add', 'remove' and 'complete').
+        format (str): 'text' (default). 'json' makes 'list' return the tasks as data, for the GUI.
 
     Returns:
-        str: Human-readable result of the task operation.
+        str: Human-readable result of the task operation. For 'list' with format='json', a list
+        of {"task": exact task text, "done": bool}.
     """
     try:
         # Ensure task file exists
@@ -37,6 +42,8 @@ def manage_tasks(action: str, task: Optional[str] = None) -> str:
             return f"✅ Task added: {task}"
 
         elif action == 'list':
+            if format == 'json':
+                return [{"task": t, "done": t.startswith(DONE_PREFIX)} for t in tasks]
             if not tasks:
                 return "📭 Your task list is empty."
             formatted = "\n".join([f"{i+1}. {t}" for i, t in enumerate(tasks)])
@@ -52,13 +59,23 @@ def manage_tasks(action: str, task: Optional[str] = None) -> str:
                 return f"❌ Task removed: {task}"
             return "Task not found in your list."
 
+        elif action == 'complete':
+            if not task:
+                return "Please provide the exact task to mark as done."
+            if task in tasks:
+                tasks[tasks.index(task)] = f"{DONE_PREFIX}{task}"
+                with open(TASK_FILE, 'w') as f:
+                    json.dump(tasks, f, indent=2)
+                return f"✅ Task completed: {task}"
+            return "Task not found in your list."
+
         elif action == 'clear':
             with open(TASK_FILE, 'w') as f:
                 json.dump([], f)
             return "🧹 All tasks have been cleared."
 
         else:
-            return "Invalid action. Use: add, list, remove, or clear."
+            return "Invalid action. Use: add, list, remove, complete, or clear."
 
     except Exception as e:
         return f"An error occurred while managing tasks: {str(e)}"
\ No newline at end of file
@@ -1,6 +1,6 @@
 from core.registry import skill
 
-@skill
+@skill(pinned=True, idempotent=False, resources=("display",))
 def request_user_input(reason: str) -> str:
     """
     Requests additional input, text, or file uploads from the user via a GUI popup.
@@ -1,9 +1,14 @@
 import os
-import requests
+import aiohttp
 from core.registry import skill
+from core.transport import TRANSPORT
 
-@skill
-def get_weather(city: str):
+def _is_report(result: str) -> bool:
+    # Service errors and unknown cities are returned as text; only real reports are cached.
+    return result.startswith("The current weather")
+
+@skill(cache_ttl=300, cache_if=_is_report, timeout=15, latency="slow", direct_call=True)
+async def get_weather(city: str):
     """
     Fetches the current weather for a specific city using OpenWeatherMap.
     Args:
@@ -21,20 +26,22 @@ def get_weather(city: str):
     }
 
     try:
-        response = requests.get(base_url, params=params)
-        data = response.json()
+        async with TRANSPORT.skill_http() as http:
+            async with http.get(base_url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                data = await response.json(content_type=None)
+                status = response.status
 
-        if response.status_code == 200:
+        if status == 200:
             temp = data["main"]["temp"]
             condition = data["weather"][0]["description"]
             humidity = data["main"]["humidity"]
             wind_speed = data["wind"]["speed"]
             
             return f"The current weather in {city} is {condition} with a temperature of {temp}°C. Humidity is {humidity}% and wind speed is {wind_speed} m/s."
-        elif response.status_code == 404:
+        elif status == 404:
             return f"I couldn't find weather data for '{city}'. Please check the city name."
         else:
             return f"Weather service error: {data.get('message', 'Unknown error')}"
 
     except Exception as e:
-        return f"Failed to connect to weather service: {str(e)}"
\ No newline at end of file
+        return f"Failed to connect to weather service: {str(e) or type(e).__name__}"
@@ -1,7 +1,7 @@
 import webbrowser
-from core.registry import skill
+from core.registry import skill, Intent
 
-@skill
+@skill(intents=[Intent(r"(open|go to|visit) (?P<url>(https?://)?[a-z0-9\-]+(\.[a-z0-9\-]+)*\.[a-z]{2,}(/\S*)?)")], idempotent=False)
 def open_website(url: str):
     """
     Opens a specific website URL in the default browser.
@@ -0,0 +1,15 @@
+"""Skills for tests/test_sandbox.py. Sandbox workers import this module by name to run them."""
+import time
+
+from core.registry import skill
+
+
+@skill(isolation="process")
+def sandbox_sleep(seconds: float) -> str:
+    time.sleep(seconds)
+    return f"slept {seconds:g}s"
+
+
+@skill(isolation="process")
+def sandbox_echo(text: str) -> str:
+    return text
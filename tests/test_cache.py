@@ -0,0 +1,57 @@
+import asyncio
+
+from core.cache import SkillResultCache
+from core.registry import SkillMetadata
+
+
+def make_meta(name: str) -> SkillMetadata:
+    return SkillMetadata(name=name, cache_ttl=60, cache_if=lambda result: not result.startswith("Error"))
+
+
+def test_results_rejected_by_cache_if_are_not_stored():
+    cache, meta = SkillResultCache(), make_meta("flaky")
+
+    async def scenario():
+        async def answer(text):
+            return text
+        first = await cache.get_or_run_async(meta, {}, lambda: answer("Error: service down"))
+        second = await cache.get_or_run_async(meta, {}, lambda: answer("sunny"))
+        third = await cache.get_or_run_async(meta, {}, lambda: answer("not called"))
+        return first, second, third
+
+    assert asyncio.run(scenario()) == ("Error: service down", "sunny", "sunny")
+
+
+def test_cancelled_leader_does_not_fail_collapsed_waiters():
+    cache, meta = SkillResultCache(), make_meta("slow")
+
+    async def scenario():
+        async def answer(text):
+            await asyncio.sleep(0.05)
+            return text
+        leader = asyncio.create_task(cache.get_or_run_async(meta, {}, lambda: answer("leader")))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_run_async(meta, {}, lambda: answer("waiter")))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(scenario()) == "waiter"
+
+
+def test_cancelled_waiter_does_not_break_the_leader():
+    cache, meta = SkillResultCache(), make_meta("shared")
+
+    async def scenario():
+        async def answer(text):
+            await asyncio.sleep(0.05)
+            return text
+        leader = asyncio.create_task(cache.get_or_run_async(meta, {}, lambda: answer("leader")))
+        await asyncio.sleep(0.01)
+        quitter = asyncio.create_task(cache.get_or_run_async(meta, {}, lambda: answer("unused")))
+        waiter = asyncio.create_task(cache.get_or_run_async(meta, {}, lambda: answer("unused")))
+        await asyncio.sleep(0.01)
+        quitter.cancel()
+        return await leader, await waiter
+
+    assert asyncio.run(scenario()) == ("leader", "leader")
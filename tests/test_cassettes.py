@@ -0,0 +1,80 @@
+import pytest
+
+from azure.ai.inference.models import (AssistantMessage, ChatCompletions, ChatCompletionsToolCall, FunctionCall,
+                                       SystemMessage, ToolMessage, UserMessage)
+
+from core.cassettes import Cassette, CassetteMiss, assemble_stream, request_key
+
+
+def completion(content=None, tool_calls=None):
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return ChatCompletions({"id": "live", "created": 0, "model": "fake-model",
+                            "choices": [{"index": 0, "finish_reason": "stop", "message": message}]})
+
+
+class LiveClient:
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def complete(self, messages, tools=None, model=None, stream=False, **kwargs):
+        self.calls += 1
+        return completion(self.answers.pop(0))
+
+
+def conversation(system="You are N.O.V.A.", call_id="call_1", result="Oslo: sunny"):
+    call = ChatCompletionsToolCall(id=call_id, function=FunctionCall(name="get_weather", arguments='{"city": "Oslo"}'))
+    return [SystemMessage(content=system), UserMessage(content="weather in oslo"),
+            AssistantMessage(tool_calls=[call]), ToolMessage(tool_call_id=call_id, content=result)]
+
+
+def as_dicts(messages):
+    return [message.as_dict() for message in messages]
+
+
+def test_request_key_ignores_system_prompt_tool_results_and_call_ids():
+    key = request_key(as_dicts(conversation()))
+    assert key == request_key(as_dicts(conversation(system="Edited prompt", call_id="fastpath_9", result="Oslo: rain")))
+    assert key != request_key(as_dicts(conversation()[:2] + [UserMessage(content="weather in paris")]))
+
+
+def test_recorded_calls_replay_in_order_then_repeat(tmp_path):
+    path = str(tmp_path / "cassettes" / "chat.jsonl")
+    live = LiveClient("first", "second")
+    recorder = Cassette(path, mode="record").wrap(live)
+    messages = [UserMessage(content="tell me a joke")]
+    recorder.complete(messages=messages, model="fake-model")
+    recorder.complete(messages=messages, model="fake-model")
+
+    cassette = Cassette(path, mode="replay")
+    player = cassette.wrap(None)  # replay never touches the live client
+    replies = [player.complete(messages=messages).choices[0].message.content for _ in range(3)]
+    assert replies == ["first", "second", "second"] and live.calls == 2
+
+    with pytest.raises(CassetteMiss):
+        player.complete(messages=[UserMessage(content="something new")])
+    assert cassette.get_stats()["replayed"] == 3 and cassette.get_stats()["misses"] == 1
+
+
+def test_streamed_replay_reassembles_to_the_recorded_completion(tmp_path):
+    path = str(tmp_path / "chat.jsonl")
+    call = {"id": "call_1", "type": "function", "function": {"name": "get_weather", "arguments": '{"city": "Oslo"}'}}
+    Cassette(path, mode="record").record([UserMessage(content="weather?")], None, "fake-model", False,
+                                         completion("Checking.", [call]).as_dict(), 0.01)
+
+    stream = Cassette(path).wrap(None).complete(messages=[UserMessage(content="weather?")], stream=True)
+    message = assemble_stream([update.as_dict() for update in stream])["choices"][0]["message"]
+    assert message == {"role": "assistant", "content": "Checking.", "tool_calls": [call]}
+
+
+def test_stubbed_tools_return_recorded_results(tmp_path):
+    path = str(tmp_path / "chat.jsonl")
+    Cassette(path, mode="record").record(conversation(), None, "fake-model", False, completion("Sunny.").as_dict(), 0.01)
+
+    cassette = Cassette(path, stub_tools=True)
+    same = ChatCompletionsToolCall(id="other", function=FunctionCall(name="get_weather", arguments='{ "city":"Oslo" }'))
+    other = ChatCompletionsToolCall(id="other", function=FunctionCall(name="get_weather", arguments='{"city": "Rome"}'))
+    assert cassette.tool_result(same) == "Oslo: sunny"
+    assert cassette.tool_result(other).startswith("Error: no recorded result")
@@ -0,0 +1,73 @@
+import time
+import asyncio
+
+from azure.core.exceptions import HttpResponseError
+
+from core.deployments import Deployment, DeploymentPool, parse_deployments
+from core.ratelimit import RateLimiter
+
+
+def http_error(status: int) -> HttpResponseError:
+    error = HttpResponseError(message=f"HTTP {status}")
+    error.status_code = status
+    return error
+
+
+class FakeClient:
+    def __init__(self, name: str, delay: float = 0.0, error: Exception = None):
+        self.name, self.delay, self.error = name, delay, error
+
+    def complete(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return self.name
+
+
+class FakeAsyncClient(FakeClient):
+    async def complete(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return super().complete(**kwargs)
+
+
+def deployment(name: str, delay: float = 0.0, error: Exception = None) -> Deployment:
+    return Deployment(name, "https://example.invalid", FakeClient(name, delay, error), FakeAsyncClient(name, delay, error), RateLimiter())
+
+
+def test_parse_deployments_defaults_the_endpoint():
+    assert parse_deployments("gpt-4o, gpt-4o-eu@https://eu.example/models/", "https://main.example") == [
+        ("gpt-4o", "https://main.example"), ("gpt-4o-eu", "https://eu.example/models")]
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled():
+    primary, backup = deployment("primary", delay=5), deployment("backup", delay=0.01)
+    pool = DeploymentPool([primary, backup], hedge_default_delay=0.05)
+
+    started = time.perf_counter()
+    assert asyncio.run(pool.complete_async(messages=[])) == "backup"
+    assert time.perf_counter() - started < 1
+    assert pool.stats == {"hedges": 1, "backup_wins": 1, "failovers": 0}
+    assert primary.stats["cancelled"] == 1 and backup.stats["wins"] == 1
+
+
+def test_fast_primary_is_not_hedged():
+    primary, backup = deployment("primary", delay=0.01), deployment("backup")
+    pool = DeploymentPool([primary, backup], hedge_default_delay=1)
+    assert asyncio.run(pool.complete_async(messages=[])) == "primary"
+    assert pool.stats["hedges"] == 0 and backup.stats["requests"] == 0
+
+
+def test_failing_deployment_cools_down_and_is_skipped():
+    primary, backup = deployment("primary", error=http_error(503)), deployment("backup")
+    pool = DeploymentPool([primary, backup], error_cooldown=30)
+
+    assert asyncio.run(pool.complete_async(messages=[])) == "backup"
+    assert pool.stats["failovers"] == 1 and not primary.healthy(time.monotonic())
+    assert [d.name for d in pool.ranked()] == ["backup"]
+    assert pool.complete(messages=[]) == "backup" and primary.stats["requests"] == 1
+
+
+def test_bad_requests_do_not_cool_a_deployment_down():
+    primary = deployment("primary", error=http_error(400))
+    pool = DeploymentPool([primary, deployment("backup")])
+    assert pool.complete(messages=[]) == "backup"
+    assert primary.healthy(time.monotonic())
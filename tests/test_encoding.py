@@ -0,0 +1,46 @@
+import json
+
+from azure.ai.inference.models import AssistantMessage, SystemMessage, UserMessage
+
+from core.encoding import EncodedMessages, FragmentCache, encode_body
+from core.llm import function_to_schema
+
+
+def get_weather(city: str) -> str:
+    """Current weather for a city."""
+
+
+def plain(items):
+    return [item.as_dict(exclude_readonly=True) for item in items]
+
+
+def decoded(cache, items):
+    return json.loads(b"[" + cache.join(items) + b"]")
+
+
+def test_growing_history_encodes_only_new_messages():
+    cache = FragmentCache()
+    history = [SystemMessage(content="system"), UserMessage(content="hi")]
+    assert decoded(cache, history) == plain(history)
+
+    for turn in range(3):
+        history = history + [AssistantMessage(content=f"reply {turn}"), UserMessage(content=f"question {turn}")]
+        assert decoded(cache, history) == plain(history)
+    assert cache.stats["encoded"] == 8  # each message once, however many times it was sent
+
+
+def test_replaced_message_is_re_encoded_not_served_stale():
+    cache = FragmentCache()
+    history = [SystemMessage(content="system"), UserMessage(content="old"), AssistantMessage(content="reply")]
+    cache.join(history)
+
+    folded = [history[0], UserMessage(content="summary of earlier turns"), history[2]]
+    assert decoded(cache, folded) == plain(folded)
+    assert cache.stats["encoded"] == 4
+
+
+def test_encoded_body_matches_a_plain_json_body():
+    messages = EncodedMessages([SystemMessage(content="system"), UserMessage(content="weather in oslo?")], FragmentCache())
+    tools = [function_to_schema(get_weather)]
+    body = json.loads(encode_body(messages, tools, model="fake-model", stream=True))
+    assert body == {"messages": plain(messages), "tools": plain(tools), "model": "fake-model", "stream": True}
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from azure.ai.inference.models import AssistantMessage, UserMessage
+
+from core.history import SUMMARY_PREFIX, HistoryManager
+from core.llm import SYSTEM_PROMPT, AzureNovaSession
+from core.model_routing import ModelRoute, ModelRouter
+from core.tokens import USAGE_LEDGER
+
+
+def summary(text: str):
+    message = SimpleNamespace(content=text)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage={"prompt_tokens": 120, "completion_tokens": 30})
+
+
+class FakeClient:
+    def __init__(self, text: str = "the user likes tea"):
+        self.text = text
+        self.models = []
+
+    def complete(self, messages, model=None, **kwargs):
+        self.models.append(model)
+        return summary(self.text)
+
+
+def make_session(client=None, model_router=None):
+    session = AzureNovaSession(client, "large-model", {}, [], model_router=model_router)
+    session.history = [SYSTEM_PROMPT, UserMessage(content="earlier"), AssistantMessage(content="reply")]
+    return session
+
+
+def store(manager, session, state, text: str):
+    manager._store_summary(state, session.background_route(), [], summary(text))
+
+
+def test_summary_finished_mid_turn_waits_for_the_next_compaction():
+    manager = HistoryManager()
+    session = make_session()
+    state = manager._session_state(session)
+
+    session._begin_turn("new question")
+    store(manager, session, state, "the user likes tea")
+    assert session.history[1].role == "user"
+
+    session._abandon_turn()
+    assert [message.content for message in session.history[1:]] == ["earlier", "reply"]
+
+    manager.compact(session)
+    assert session.history[1].content == f"{SUMMARY_PREFIX} the user likes tea"
+    assert [message.content for message in session.history[2:]] == ["earlier", "reply"]
+
+
+def test_next_summary_builds_on_the_one_not_yet_installed():
+    manager = HistoryManager()
+    session = make_session()
+    state = manager._session_state(session)
+
+    store(manager, session, state, "the user likes tea")
+    request = manager._summary_request(session, state, [UserMessage(content="and biscuits")])
+    assert "the user likes tea" in request[1].content
+
+
+def test_summaries_run_on_the_fast_model_and_are_accounted():
+    USAGE_LEDGER.reset()
+    large, fast = FakeClient(), FakeClient()
+    router = ModelRouter(ModelRoute("fast", "fast-model", fast, None))
+    session = make_session(client=large, model_router=router)
+    manager = HistoryManager()
+    state = manager._session_state(session)
+    state["pending"].extend(session.history[1:])
+    state["running"] = True
+
+    manager._drain_sync(session, state)
+    assert fast.models == ["fast-model"] and large.models == []
+    assert USAGE_LEDGER.get_stats()["purposes"]["history_summary"]["total_tokens"] == 150
+
+    manager.compact(session)
+    assert session.usage.total_tokens == 150  # charged to the session's next request
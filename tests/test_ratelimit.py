@@ -0,0 +1,66 @@
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from core import ratelimit
+from core.ratelimit import RateLimiter, RateLimitExceeded, RateLimitPolicy, parse_duration, retry_after
+
+
+def test_retry_after_reads_every_header_form():
+    assert retry_after({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+    assert retry_after({"retry-after": "3"}) == 3.0
+    assert 8 <= retry_after({"retry-after": formatdate(time.time() + 10, usegmt=True)}) <= 10
+    assert retry_after({"x-ratelimit-reset-requests": "20ms", "x-ratelimit-reset-tokens": "6m0s"}) == 360.0
+    assert retry_after({}) is None and retry_after(None) is None
+    assert parse_duration("1h2m3.5s") == 3723.5 and parse_duration("soon") is None
+
+
+def test_throttling_pauses_every_caller_for_the_requested_time():
+    limiter = RateLimiter()
+    delay = limiter.backoff(429, {"retry-after": "2"}, attempt=0)
+    assert 2.0 <= delay <= 2.2
+    assert limiter.reserve(100, deadline=time.monotonic() + 30) == pytest.approx(delay, abs=0.05)
+    with pytest.raises(RateLimitExceeded):
+        limiter.reserve(100, deadline=time.monotonic() + 1)
+    assert limiter.get_stats()["throttled"] == 1 and limiter.get_stats()["deadline_exceeded"] == 1
+
+
+def test_server_errors_back_off_without_pausing_others():
+    limiter = RateLimiter(base_delay=0.5)
+    assert 0.25 <= limiter.backoff(503, {}, attempt=0) <= 0.5
+    assert limiter.paused_for() == 0
+
+
+class FakeHttpResponse:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.closed = False
+
+    def text(self):
+        return '{"usage": {"total_tokens": 40}}'
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTransport:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def send(self, request):
+        return SimpleNamespace(http_response=self.responses.pop(0))
+
+
+def test_policy_retries_a_429_after_its_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(ratelimit.time, "sleep", sleeps.append)
+    throttled = FakeHttpResponse(429, {"retry-after": "1"})
+    policy = RateLimitPolicy(RateLimiter(max_retries=2))
+    policy.next = FakeTransport(throttled, FakeHttpResponse(200))
+
+    response = policy.send(SimpleNamespace(http_request=SimpleNamespace(body=b'{"messages": []}')))
+    assert response.http_response.status_code == 200 and throttled.closed
+    assert len(sleeps) == 1 and 1.0 <= sleeps[0] <= 1.1  # the retry waited out the service's pause
@@ -0,0 +1,57 @@
+import types
+import inspect
+
+import pytest
+
+from core import registry
+from core.registry import get_skill_metadata, mark_generated, skill
+
+
+@pytest.fixture
+def generated_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "GENERATED_SKILLS_FILE", str(tmp_path / "skills" / "generated.json"))
+    monkeypatch.setattr(registry, "_GENERATED_MODULES", None)
+    yield
+    for name in ("escape_hatch", "plain_skill"):
+        registry.SKILL_REGISTRY.pop(name, None)
+        registry.SKILL_METADATA.pop(name, None)
+
+
+def define(module_name: str, source: str):
+    module = types.ModuleType(module_name)
+    module.__dict__["skill"] = skill
+    exec(source, module.__dict__)
+    return module
+
+
+def test_generated_module_cannot_opt_out_of_the_sandbox(generated_file):
+    mark_generated("skills.generated_escape")
+    define("skills.generated_escape", (
+        'SKILL_ISOLATION = "thread"\n'
+        '@skill(isolation="thread")\n'
+        'def escape_hatch():\n'
+        '    return "ran in the backend"\n'
+    ))
+    assert get_skill_metadata("escape_hatch").execution == "process"
+
+
+def test_generated_modules_are_remembered_across_restarts(generated_file, monkeypatch):
+    mark_generated("skills.generated_escape")
+    monkeypatch.setattr(registry, "_GENERATED_MODULES", None)
+    assert registry.generated_modules() == {"skills.generated_escape"}
+
+    define("skills.handwritten", '@skill\ndef plain_skill():\n    return "ok"\n')
+    assert get_skill_metadata("plain_skill").execution == "thread"
+
+
+def test_decorated_skill_is_the_function_itself():
+    async def fetch_feed(url: str) -> str:
+        return url
+
+    try:
+        decorated = skill(fetch_feed)
+        assert decorated is fetch_feed and inspect.iscoroutinefunction(decorated)
+        assert get_skill_metadata("fetch_feed").execution == "loop"
+    finally:
+        registry.SKILL_REGISTRY.pop("fetch_feed", None)
+        registry.SKILL_METADATA.pop("fetch_feed", None)
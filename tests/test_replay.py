@@ -0,0 +1,71 @@
+"""
+Replays the recorded conversations in benchmarks/cassettes through the real session dispatch path
+(fast path, tool selection, routing, history) with no live LLM calls. Skill results come from
+the cassette too, so the outcome of every turn is fixed. benchmarks/replay_suite.py times the
+same replay.
+"""
+import os
+import asyncio
+
+import pytest
+
+from benchmarks.replay_suite import BENCH_DIR, boot, conversations
+from core.cassettes import Cassette
+
+SAMPLE = os.path.join(BENCH_DIR, "cassettes", "sample.jsonl")
+
+# (user message, skills called in that turn, reply) per recorded conversation.
+EXPECTED = [
+    [
+        ("How much memory is this machine using right now?", ["get_memory_usage"], "You are using about half of your memory."),
+        ("how much RAM is free?", ["get_memory_usage"], "You are using about half of your memory."),
+        ("Is my disk getting full?", ["get_disk_usage"], "Your disk still has plenty of free space."),
+    ],
+    [
+        ("check the disk space please", ["get_disk_usage"], "Disk usage: 17.6 GB used out of 252.0 GB total."),
+        ("Run a quick health check of the system", ["get_memory_usage", "get_disk_usage", "get_system_uptime"],
+         "Memory, disk and uptime all look healthy."),
+        ("Since when has the computer been running?", ["get_system_uptime"], "The system has been up for a few hours."),
+    ],
+    [
+        ("Tell me a joke", [], "Here you go: a short, friendly answer."),
+        ("What's a good name for a cat?", [], "Here you go: a short, friendly answer."),
+        ("thanks, that's all", [], "Here you go: a short, friendly answer."),
+    ],
+]
+
+
+@pytest.fixture(scope="module")
+def base():
+    from core.llm import shutdown_brain
+
+    environ = dict(os.environ)
+    session = boot("http://127.0.0.1:9")  # never contacted: every LLM call is answered from the cassette
+    yield session
+    asyncio.run(shutdown_brain())
+    os.environ.clear()
+    os.environ.update(environ)
+
+
+def turn_calls(session):
+    start = max(index for index, message in enumerate(session.history) if message.role == "user")
+    return [call.function.name for message in session.history[start:] for call in getattr(message, "tool_calls", None) or []]
+
+
+def test_sample_cassette_replays_without_misses(base):
+    cassette = Cassette(SAMPLE, mode="replay", stub_tools=True)
+    corpus = conversations(cassette)
+    assert [[text for text, _, _ in turns] for turns in EXPECTED] == [list(turns) for turns in corpus]
+
+    async def replay():
+        for turns in EXPECTED:
+            session = base.with_cassette(cassette)
+            for text, calls, reply in turns:
+                response = await session.send_message_async(text, use_cache=False)
+                assert turn_calls(session) == calls, text
+                assert response.text.startswith(reply), text
+                assert response.action_taken == bool(calls), text
+
+    asyncio.run(replay())
+    assert cassette.stats["misses"] == 0
+    assert cassette.stats["replayed"] == len(cassette.interactions)
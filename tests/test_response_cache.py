@@ -0,0 +1,44 @@
+import pytest
+
+from core import registry
+from core.registry import skill
+from core.response_cache import ResponseCache
+
+
+@pytest.fixture
+def weather_skill():
+    @skill(cache_ttl=60)
+    def cached_weather(city: str) -> str:
+        return f"{city}: sunny"
+    yield "cached_weather"
+    registry.SKILL_REGISTRY.pop("cached_weather", None)
+    registry.SKILL_METADATA.pop("cached_weather", None)
+
+
+def test_answers_from_the_model_alone_stay_with_their_conversation():
+    cache = ResponseCache()
+    alice = cache.make_key("what's my name?", "gpt", history=b'[{"role": "user", "content": "I am Alice"}]')
+    cache.put(alice, "You are Alice.", False, [])
+
+    assert cache.get(alice).text == "You are Alice."
+    bob = cache.make_key("what's my name?", "gpt", history=b'[{"role": "user", "content": "I am Bob"}]')
+    assert cache.get(bob) is None
+
+
+def test_tool_backed_answers_are_shared_across_conversations(weather_skill):
+    cache = ResponseCache()
+    first = cache.make_key("weather in oslo", "gpt", history=b"first session")
+    cache.put(first, "Sunny in Oslo.", False, [weather_skill])
+
+    other = cache.make_key("weather in oslo", "gpt", history=b"another session")
+    assert cache.get(other).text == "Sunny in Oslo."
+
+
+def test_disk_tier_keeps_conversation_keys(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    key = ResponseCache.make_key("what did I ask you to remember?", "gpt", history=b"session a")
+    ResponseCache(disk_path=path).put(key, "Milk.", False, [])
+
+    restarted = ResponseCache(disk_path=path)
+    assert restarted.get(key).text == "Milk."
+    assert restarted.get(ResponseCache.make_key("what did I ask you to remember?", "gpt", history=b"session b")) is None
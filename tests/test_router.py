@@ -0,0 +1,66 @@
+from typing import Optional
+
+from core.registry import Intent
+from core.router import IntentRouter, normalize_utterance
+
+
+def set_volume(value: int) -> str:
+    return f"Volume set to {value}%"
+
+
+def set_brightness(action: str, value: Optional[int] = None) -> str:
+    return f"BRIGHTNESS_CONTROL_UI: {action} {value}"
+
+
+def make_router() -> IntentRouter:
+    router = IntentRouter()
+    router.add("set_volume", set_volume, Intent(r"(set|change) (the )?volume to (?P<value>\d{1,3})( ?%| percent)?",
+                                                reply="Volume at {value}%."))
+    router.add("set_brightness", set_brightness, Intent(r"(set|change) (the )?brightness to (?P<value>\d{1,3})", args={"action": "set"}))
+    router.add("set_brightness", set_brightness, Intent(r"dim (the )?(screen|brightness)", args={"action": "decrease"}))
+    return router
+
+
+def test_normalize_strips_fillers_and_punctuation():
+    assert normalize_utterance("Nova, could you set the volume to 40, please?") == "set the volume to 40"
+
+
+def test_full_match_coerces_captured_arguments():
+    match = make_router().match("Please set the volume to 40%")
+    assert (match.skill, match.args) == ("set_volume", {"value": 40})
+    assert match.render_reply("Volume set to 40%") == "Volume at 40%."
+
+
+def test_optional_annotations_are_coerced_and_trigger_codes_not_spoken():
+    match = make_router().match("change brightness to 70")
+    assert match.args == {"action": "set", "value": 70}
+    assert match.render_reply("BRIGHTNESS_CONTROL_UI: set 70") == "set 70"
+
+
+def test_partial_matches_fall_through_to_the_llm():
+    router = make_router()
+    assert router.match("set the volume to 40 and dim the screen") is None
+    assert router.match("what would happen if I set the volume to 40") is None
+    assert router.get_stats()["misses"] == 2
+
+
+def test_ambiguous_matches_are_rejected():
+    router = make_router()
+    router.add("set_brightness", set_brightness, Intent(r"dim (the )?screen", args={"action": "set", "value": 10}))
+    assert router.match("dim the screen") is None
+    assert router.get_stats()["ambiguous"] == 1
+
+
+def test_captures_that_do_not_bind_are_rejected():
+    router = IntentRouter()
+    router.add("set_volume", set_volume, Intent(r"volume (?P<level>\d+)"))
+    assert router.match("volume 30") is None
+    assert router.get_stats()["rejected"] == 1
+
+
+def test_destructive_task_actions_are_left_to_the_llm():
+    from skills.task_manager_ops import manage_tasks
+
+    router = IntentRouter.from_tools({"manage_tasks": manage_tasks})
+    assert router.match("list my tasks").args == {"action": "list"}
+    assert router.match("clear all my tasks") is None
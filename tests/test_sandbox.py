@@ -0,0 +1,49 @@
+import time
+import threading
+
+import pytest
+
+from core import registry
+from core.sandbox import SandboxPool, SandboxTimeout
+from sandbox_skills import sandbox_echo, sandbox_sleep
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(workers=1, cpu_seconds=5)
+    pool.start(["sandbox_skills"])
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def unregister():
+    yield
+    for name in ("sandbox_sleep", "sandbox_echo"):
+        registry.SKILL_REGISTRY.pop(name, None)
+        registry.SKILL_METADATA.pop(name, None)
+
+
+def test_overrunning_call_kills_and_replaces_its_worker(pool):
+    assert pool.call(sandbox_echo, {"text": "warm"}, timeout=30) == "warm"
+
+    with pytest.raises(SandboxTimeout):
+        pool.call(sandbox_sleep, {"seconds": 30}, timeout=0.5)
+    assert pool.get_stats()["restarts"] == 1
+
+    assert pool.call(sandbox_echo, {"text": "still serving"}, timeout=30) == "still serving"
+
+
+def test_waiting_for_a_busy_worker_counts_against_the_timeout(pool):
+    assert pool.call(sandbox_echo, {"text": "warm"}, timeout=30) == "warm"
+    busy = threading.Thread(target=pool.call, args=(sandbox_sleep, {"seconds": 2}, 30))
+    busy.start()
+    while pool.get_stats()["idle"]:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    with pytest.raises(SandboxTimeout, match="waiting for a sandbox worker"):
+        pool.call(sandbox_echo, {"text": "queued"}, timeout=0.3)
+    assert time.monotonic() - started < 1.5
+    busy.join()
+    assert pool.get_stats()["restarts"] == 0  # the busy worker was left to finish its call
@@ -0,0 +1,70 @@
+import time
+import asyncio
+import threading
+
+from core.registry import SkillMetadata
+from core.scheduler import SkillScheduler
+
+
+def peak_concurrency(scheduler, metas, hold_for=0.05):
+    """Runs one thread per SkillMetadata through the scheduler and returns the most that overlapped."""
+    lock, running, peak = threading.Lock(), [0], [0]
+
+    def call(meta):
+        with scheduler.hold(meta):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(hold_for)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=call, args=(meta,)) for meta in metas]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not any(thread.is_alive() for thread in threads), "scheduler deadlocked"
+    return peak[0]
+
+
+def test_exclusive_resource_admits_one_call_across_skills():
+    scheduler = SkillScheduler()
+    photo = SkillMetadata(name="take_photo", resources=("camera",))
+    scan = SkillMetadata(name="scan_qr", resources=("camera",))
+    assert peak_concurrency(scheduler, [photo, scan, photo, scan]) == 1
+    assert scheduler.get_stats()["skills"]["scan_qr"]["calls"] == 2
+
+
+def test_max_concurrency_caps_calls_of_one_skill():
+    scheduler = SkillScheduler()
+    fetch = SkillMetadata(name="fetch_page", max_concurrency=2)
+    assert peak_concurrency(scheduler, [fetch] * 5) == 2
+
+
+def test_shared_resources_declared_in_any_order_do_not_deadlock():
+    scheduler = SkillScheduler()
+    record = SkillMetadata(name="record_clip", resources=("camera", "audio"))
+    call = SkillMetadata(name="video_call", resources=("audio", "camera"))
+    assert peak_concurrency(scheduler, [record, call] * 4, hold_for=0.01) == 1
+
+
+def test_async_skill_waits_for_a_sync_one_and_can_be_cancelled():
+    scheduler = SkillScheduler()
+    sync_meta = SkillMetadata(name="speak", resources=("audio",))
+    async_meta = SkillMetadata(name="play_sound", resources=("audio",), kind="async")
+
+    async def run():
+        with scheduler.hold(sync_meta):
+            waiter = asyncio.ensure_future(enter(async_meta))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()  # blocked behind the sync call, without blocking the loop
+            waiter.cancel()
+        assert await enter(async_meta) == "ran"  # the cancelled waiter left no gate behind
+
+    async def enter(meta):
+        async with scheduler.hold_async(meta):
+            return "ran"
+
+    asyncio.run(run())
+    assert scheduler.get_stats()["resources"] == {"audio": {"busy": False}}
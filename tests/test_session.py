@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from azure.ai.inference.models import ChatCompletionsToolCall, FunctionCall
+
+from core.llm import AzureNovaSession, InvalidArguments, function_to_schema, validate_arguments
+from core.scheduler import SKILL_SCHEDULER
+
+
+def lookup(city: str) -> str:
+    """Looks a city up."""
+    return f"{city}: sunny"
+
+
+TOOL_CALL = {"id": "call_1", "type": "function", "function": {"name": "lookup", "arguments": '{"city": "Oslo"}'}}
+
+
+def answered(messages) -> bool:
+    return any(message.role == "tool" for message in messages)
+
+
+class FakeStream:
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        if answered(self.messages):
+            delta = SimpleNamespace(content="Sunny in Oslo.", tool_calls=None)
+        else:
+            delta = SimpleNamespace(content=None, tool_calls=[TOOL_CALL])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], get=lambda key: None)
+
+
+def respond(messages):
+    """Asks for the tool first, answers once its result is in the history."""
+    if answered(messages):
+        message = SimpleNamespace(content="Sunny in Oslo.", tool_calls=None)
+    else:
+        call = ChatCompletionsToolCall(id="call_1", function=FunctionCall(name="lookup", arguments='{"city": "Oslo"}'))
+        message = SimpleNamespace(content=None, tool_calls=[call])
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+class FakeClient:
+    def complete(self, messages, tools=None, model=None, **kwargs):
+        return respond(messages)
+
+
+class FakeAsyncClient:
+    async def complete(self, messages, tools=None, model=None, stream=False, **kwargs):
+        return FakeStream(messages) if stream else respond(messages)
+
+
+def make_session():
+    return AzureNovaSession(FakeClient(), "fake-model", {"lookup": lookup}, [function_to_schema(lookup)],
+                            async_client=FakeAsyncClient())
+
+
+def roles(session):
+    return [message.role for message in session.history]
+
+
+def test_sync_async_and_stream_share_one_exchange():
+    sync_session, async_session, stream_session = make_session(), make_session(), make_session()
+
+    sync_response = sync_session.send_message("weather in oslo")
+    async_response = asyncio.run(async_session.send_message_async("weather in oslo"))
+
+    async def consume():
+        return [event async for event in stream_session.stream_message("weather in oslo")]
+    events = asyncio.run(consume())
+
+    assert sync_response == async_response
+    assert sync_response.text == "Sunny in Oslo." and sync_response.action_taken
+    assert [event["type"] for event in events] == ["tool_start", "tool_end", "delta", "final"]
+    assert events[1]["result"] == "Oslo: sunny"
+    assert events[-1]["response"] == sync_response.text and "usage" in events[-1]
+    assert roles(sync_session) == roles(async_session) == roles(stream_session) == ["system", "user", "assistant", "tool", "assistant"]
+
+
+def test_send_message_works_inside_a_running_loop():
+    session = make_session()
+
+    async def call_blocking():
+        return session.send_message("weather in oslo")
+
+    assert asyncio.run(call_blocking()).text == "Sunny in Oslo."
+
+
+def set_volume(level: int | None = None, gain: float | None = None) -> str:
+    return "ok"
+
+
+def test_pep_604_optionals_are_advertised_and_validated_as_their_type():
+    properties = function_to_schema(set_volume).function.parameters["properties"]
+    assert properties["level"]["type"] == "integer" and properties["gain"]["type"] == "number"
+    assert validate_arguments(set_volume, {"level": 40, "gain": None}) == {"level": 40, "gain": None}
+    with pytest.raises(InvalidArguments):
+        validate_arguments(set_volume, {"level": "40"})
+
+
+def test_a_hung_skill_is_refused_until_its_abandoned_call_returns():
+    release = threading.Event()
+
+    def stuck() -> str:
+        release.wait()
+        return "finally"
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    session = AzureNovaSession(FakeClient(), "fake-model", {"stuck": stuck}, [function_to_schema(stuck)],
+                               async_client=FakeAsyncClient(), tool_executor=executor, tool_timeout=0.2)
+
+    async def calls():
+        first = await session.invoke_skill_async("stuck", {})
+        second = await session.invoke_skill_async("stuck", {})
+        return first, second
+    first, second = asyncio.run(calls())
+    assert first["status"] == second["status"] == "timeout"
+    assert "has not returned yet" in second["error"]
+    assert SKILL_SCHEDULER.get_stats()["hung"] == ["stuck"]
+
+    release.set()
+    executor.shutdown(wait=True)
+    assert SKILL_SCHEDULER.get_stats()["hung"] == []
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from azure.ai.inference.models import UserMessage
+
+from core.llm import AzureNovaSession
+from core.sessions import SessionManager
+
+
+def make_manager(tmp_path, **kwargs):
+    return SessionManager(lambda: AzureNovaSession(None, "fake-model", {}, []), spill_dir=str(tmp_path / "spill"), **kwargs)
+
+
+async def say(manager, session_id, text):
+    async with manager.session(session_id) as session:
+        session.history.append(UserMessage(content=text))
+        return session
+
+
+def test_least_recently_used_session_is_spilled_and_rehydrated(tmp_path):
+    manager = make_manager(tmp_path, max_sessions=2)
+
+    async def run():
+        first = await say(manager, "alice", "remember the milk")
+        await say(manager, "bob", "hello")
+        await say(manager, "alice", "and the eggs")  # alice is now the most recent
+        await say(manager, "carol", "hi")
+        assert (tmp_path / "spill" / "bob.json").exists()
+
+        bob = await say(manager, "bob", "I'm back")
+        assert [message.content for message in bob.history[1:]] == ["hello", "I'm back"]
+        assert not (tmp_path / "spill" / "bob.json").exists()
+
+        alice = await say(manager, "alice", "anything else?")
+        assert alice is not first  # evicted when bob came back, rebuilt from disk
+        return alice
+
+    alice = asyncio.run(run())
+    assert [message.content for message in alice.history[1:]] == ["remember the milk", "and the eggs", "anything else?"]
+    assert manager.get_stats() == {"active": 2, "created": 3, "evicted": 3, "rehydrated": 2}
+
+
+def test_idle_sessions_are_spilled_but_busy_ones_are_kept(tmp_path):
+    manager = make_manager(tmp_path, idle_ttl=0)
+
+    async def run():
+        await say(manager, "idle", "hello")
+        async with manager.session("busy"):
+            await asyncio.sleep(0.01)
+            await manager.sweep()
+            assert manager.get_stats()["active"] == 1
+        await manager.sweep()
+
+    asyncio.run(run())
+    assert manager.get_stats()["active"] == 0
+    assert sorted(path.name for path in (tmp_path / "spill").iterdir()) == ["busy.json", "idle.json"]
+
+
+def test_session_ids_cannot_name_paths(tmp_path):
+    manager = make_manager(tmp_path)
+    with pytest.raises(ValueError):
+        manager.validate_id("../../etc/passwd")
@@ -0,0 +1,15 @@
+from skills.task_manager_ops import manage_tasks
+
+
+def test_list_as_json_gives_the_gui_exact_tasks_and_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manage_tasks("add", "buy milk")
+    manage_tasks("add", "call the dentist")
+    manage_tasks("complete", "buy milk")
+
+    tasks = manage_tasks("list", format="json")
+    assert tasks == [{"task": "✅ buy milk", "done": True}, {"task": "call the dentist", "done": False}]
+
+    manage_tasks("remove", tasks[0]["task"])
+    assert manage_tasks("list", format="json") == [{"task": "call the dentist", "done": False}]
+    assert manage_tasks("list") == "📝 Your Tasks:\n1. call the dentist"
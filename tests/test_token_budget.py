@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.llm import AzureNovaSession
+from core.tokens import TokenBudgetExceeded
+
+
+class FakeStream:
+    """One text update, shaped like the SDK's streaming response."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        delta = SimpleNamespace(content="ok", tool_calls=None)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], get=lambda key: None)
+
+
+class FakeAsyncClient:
+    """Answers every request with plain text; counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, messages, tools=None, model=None, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return FakeStream()
+        message = SimpleNamespace(content="ok", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_session(budget_margin: int):
+    client = FakeAsyncClient()
+    session = AzureNovaSession(None, "fake-model", {}, [], async_client=client)
+    session.request_token_budget = session.tokens.count(session.history) + budget_margin
+    return session, client
+
+
+def test_refused_message_is_rolled_back_and_session_recovers():
+    session, client = make_session(budget_margin=50)
+
+    with pytest.raises(TokenBudgetExceeded):
+        asyncio.run(session.send_message_async("word " * 2000))
+    assert [message.role for message in session.history] == ["system"]
+    assert client.calls == 0
+
+    response = asyncio.run(session.send_message_async("hello"))
+    assert response.text == "ok"
+    assert [message.role for message in session.history] == ["system", "user", "assistant"]
+
+
+def test_refused_stream_is_rolled_back():
+    session, _ = make_session(budget_margin=50)
+
+    async def consume(text):
+        return [event async for event in session.stream_message(text)]
+
+    with pytest.raises(TokenBudgetExceeded):
+        asyncio.run(consume("word " * 2000))
+    assert [message.role for message in session.history] == ["system"]
+    assert asyncio.run(consume("hello"))[-1]["type"] == "final"
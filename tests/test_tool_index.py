@@ -0,0 +1,93 @@
+from core.llm import function_to_schema
+from core.prefix import canonical_tool_order
+from core.tool_index import ToolIndex, tokenize
+
+
+def get_weather(city: str) -> str:
+    """Current weather and forecast for a city."""
+
+
+def convert_currency(amount: float, source: str, target: str) -> str:
+    """Convert an amount between currencies using the exchange rate."""
+
+
+def get_battery_status() -> str:
+    """Battery charge level and whether the laptop is plugged in."""
+
+
+def get_disk_usage() -> str:
+    """Disk usage and free storage space."""
+
+
+def manage_tasks(action: str, task: str = None) -> str:
+    """Manage the personal task list: add, list, remove or clear tasks."""
+
+
+def take_screenshot() -> str:
+    """Capture the screen to an image file."""
+
+
+SKILLS = [get_weather, convert_currency, get_battery_status, get_disk_usage, manage_tasks, take_screenshot]
+
+
+def make_index(top_k: int = 2, max_tools: int = None, pinned=("manage_tasks",)) -> ToolIndex:
+    index = ToolIndex(top_k=top_k, max_tools=max_tools)
+    index.rebuild(canonical_tool_order([function_to_schema(func) for func in SKILLS], pinned), pinned=pinned)
+    return index
+
+
+def names(definitions):
+    return [d.function.name for d in definitions]
+
+
+def test_tokenize_folds_plurals_stopwords_and_synonyms():
+    assert tokenize("Show my tasks and the free storage space") == ["show", "task", "free", "disk", "disk"]
+
+
+def test_bm25_ranks_the_matching_skill_first():
+    index = make_index()
+    assert max(index.score("convert 20 dollars to euros").items(), key=lambda item: item[1])[0] == "convert_currency"
+    assert max(index.score("is the laptop charge low").items(), key=lambda item: item[1])[0] == "get_battery_status"
+
+
+def test_select_sends_top_k_plus_pinned_tools():
+    index = make_index(top_k=1)
+    assert names(index.select("how much disk space is left")) == ["manage_tasks", "get_disk_usage"]
+    assert names(index.select("sing me a song")) == ["manage_tasks"]  # nothing relevant: pinned only
+    assert index.get_stats()["tokens_saved"] > 0
+
+
+def test_small_tool_sets_are_sent_whole():
+    index = make_index(top_k=len(SKILLS))
+    assert len(index.select("anything")) == len(SKILLS)
+
+
+def test_session_keeps_its_tool_list_while_it_covers_the_query():
+    index = make_index()
+    first = index.select("what's the weather in paris")
+    again = index.select("weather forecast for oslo", previous=first)
+
+    assert again == first
+    assert names(first)[0] == "manage_tasks"  # pinned tools lead the canonical order
+    assert index.get_stats()["reused"] == 1
+
+
+def test_new_tools_are_added_rather_than_swapped():
+    index = make_index(max_tools=6)
+    first = index.select("what's the weather in paris")
+    grown = index.select("how much is my battery charged", previous=first)
+
+    assert set(names(first)) < set(names(grown))
+    assert "get_battery_status" in names(grown)
+    assert names(grown) == names(canonical_tool_order(grown, ["manage_tasks"]))
+
+
+def test_selection_starts_over_past_max_tools_or_after_a_rebuild():
+    index = make_index(max_tools=2)
+    first = index.select("what's the weather in paris")
+    fresh = index.select("how much disk storage space is free", previous=first)
+    assert "get_weather" not in names(fresh)
+
+    rebuilt = make_index()
+    rebuilt.select("weather in oslo", previous=first)
+    assert rebuilt.get_stats()["reused"] == 0
@@ -1,10 +1,13 @@
 import pkgutil
 import importlib
 import inspect
-from typing import Dict, Type, Optional
+import requests
+from typing import Any, Callable, Dict, Type, Optional
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt6.QtWidgets import QWidget
 
 UI_SKILL_REGISTRY: Dict[str, "UISkillMetadata"] = {}
+BACKEND_URL = "http://localhost:8000"
 
 class UISkillMetadata:
     def __init__(self, cls: Type[QWidget], title: str, icon: str, description: str, trigger_signal: Optional[str] = None):
@@ -35,5 +38,45 @@ def load_ui_skills(package_path="ui.skills"):
     except Exception as e:
         print(f"Error loading UI skills: {e}")
 
+def invoke_skill(name: str, timeout: float = 30, **args) -> Dict[str, Any]:
+    """
+    Calls a backend skill directly (no LLM round trip) and returns its structured result:
+    {"skill", "status", "result", "error", "cached", "elapsed_ms"}. Raises on HTTP errors.
+    """
+    response = requests.post(f"{BACKEND_URL}/skills/{name}/invoke", json={"args": args}, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+class _SkillCallSignals(QObject):
+    finished = pyqtSignal(dict)
+
+class _SkillCall(QRunnable):
+    def __init__(self, name: str, args: Dict[str, Any]):
+        super().__init__()
+        self.name = name
+        self.args = args
+        self.signals = _SkillCallSignals()
+
+    def run(self):
+        try:
+            outcome = invoke_skill(self.name, **self.args)
+        except Exception as e:
+            outcome = {"skill": self.name, "status": "error", "result": None, "error": str(e), "cached": False, "elapsed_ms": 0.0}
+        self.signals.finished.emit(outcome)
+
+_PENDING_CALLS = set()  # keeps each call (and its signals) alive until it reports back
+
+def invoke_skill_later(name: str, on_done: Callable[[Dict[str, Any]], None] = None, **args) -> None:
+    """
+    invoke_skill() on a pool thread, so the GUI thread never waits on the backend. on_done gets
+    the structured result on the GUI thread; connection errors arrive as status "error".
+    """
+    call = _SkillCall(name, args)
+    if on_done is not None:
+        call.signals.finished.connect(on_done)
+    call.signals.finished.connect(lambda _: _PENDING_CALLS.discard(call))
+    _PENDING_CALLS.add(call)
+    QThreadPool.globalInstance().start(call)
+
 def get_all_ui_skills() -> Dict[str, UISkillMetadata]:
     return UI_SKILL_REGISTRY
\ No newline at end of file
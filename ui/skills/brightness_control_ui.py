@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSlider
-from PyQt6.QtCore import Qt
-from ui.registry import register_ui_skill
+from PyQt6.QtCore import Qt, QTimer
+from ui.registry import register_ui_skill, invoke_skill_later
 import screen_brightness_control as sbc
 
 @register_ui_skill(
@@ -28,14 +28,24 @@ class BrightnessControlUI(QWidget):
         except Exception:
             current = 50
         self.slider.setValue(current)
-        self.slider.valueChanged.connect(self.change_brightness)
+        self.slider.valueChanged.connect(self.schedule_brightness)
+
+        # Debounce: drags and key presses send one backend call once the value settles.
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(250)
+        self.debounce.timeout.connect(self.change_brightness)
 
         layout.addWidget(self.slider)
         self.setLayout(layout)
 
-    def change_brightness(self, value: int):
-        try:
-            sbc.set_brightness(value, display=0)
-            self.label.setText(f"Brightness: {value}%")
-        except Exception:
+    def schedule_brightness(self, value: int):
+        self.label.setText(f"Brightness: {value}%")
+        self.debounce.start()
+
+    def change_brightness(self):
+        invoke_skill_later("control_brightness", self.brightness_changed, action="set", value=self.slider.value())
+
+    def brightness_changed(self, outcome: dict):
+        if outcome["status"] != "ok" or str(outcome["result"]).startswith("Error"):
             self.label.setText("Error adjusting brightness")
@@ -1,13 +1,9 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QListWidget, QLineEdit, QLabel, QMessageBox
+    QListWidget, QListWidgetItem, QLineEdit, QLabel, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from ui.registry import register_ui_skill
-import json
-import os
-
-TASK_FILE = "tasks.json"
+from ui.registry import register_ui_skill, invoke_skill_later
 
 @register_ui_skill(
     title="Task Manager",
@@ -56,43 +52,54 @@ class TaskManagerUI(QWidget):
 
         self.layout.addLayout(button_layout)
 
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: #ff6b6b;")
+        self.layout.addWidget(self.status)
+
         self.setLayout(self.layout)
         self.refresh_tasks()
 
-    def load_tasks(self):
-        if not os.path.exists(TASK_FILE):
-            return []
-        with open(TASK_FILE, 'r') as f:
-            return json.load(f)
+    # All reads and writes go through the backend's manage_tasks skill (POST /skills/manage_tasks/invoke),
+    # so the panel and the assistant share one task list and its locking.
+    def run_task_action(self, action, task=None):
+        args = {"action": action} if task is None else {"action": action, "task": task}
+        invoke_skill_later("manage_tasks", self.task_action_done, **args)
 
-    def save_tasks(self, tasks):
-        with open(TASK_FILE, 'w') as f:
-            json.dump(tasks, f, indent=2)
+    def task_action_done(self, outcome):
+        if outcome["status"] != "ok":
+            self.status.setText(f"Backend error: {outcome['error']}")
+            return
+        self.status.setText("")
+        self.refresh_tasks()
 
     def refresh_tasks(self):
+        invoke_skill_later("manage_tasks", self.show_tasks, action="list", format="json")
+
+    def show_tasks(self, outcome):
         self.task_list.clear()
-        tasks = self.load_tasks()
-        for task in tasks:
-            self.task_list.addItem(task)
+        if outcome["status"] != "ok":
+            self.status.setText(f"Backend error: {outcome['error']}")
+            return
+        for entry in outcome["result"] or []:
+            item = QListWidgetItem(entry["task"])
+            item.setData(Qt.ItemDataRole.UserRole, entry)
+            self.task_list.addItem(item)
+
+    def selected_entry(self):
+        item = self.task_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item is not None else None
 
     def add_task(self):
         task = self.task_input.text().strip()
         if not task:
             return
-        tasks = self.load_tasks()
-        tasks.append(task)
-        self.save_tasks(tasks)
         self.task_input.clear()
-        self.refresh_tasks()
+        self.run_task_action("add", task)
 
     def remove_task(self):
-        selected = self.task_list.currentRow()
-        if selected < 0:
-            return
-        tasks = self.load_tasks()
-        tasks.pop(selected)
-        self.save_tasks(tasks)
-        self.refresh_tasks()
+        entry = self.selected_entry()
+        if entry is not None:
+            self.run_task_action("remove", entry["task"])
 
     def clear_tasks(self):
         reply = QMessageBox.question(
@@ -102,14 +109,9 @@ class TaskManagerUI(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            self.save_tasks([])
-            self.refresh_tasks()
+            self.run_task_action("clear")
 
     def mark_completed(self):
-        selected = self.task_list.currentRow()
-        if selected < 0:
-            return
-        tasks = self.load_tasks()
-        tasks[selected] = f"✅ {tasks[selected]}"
-        self.save_tasks(tasks)
-        self.refresh_tasks()
+        entry = self.selected_entry()
+        if entry is not None and not entry["done"]:
+            self.run_task_action("complete", entry["task"])
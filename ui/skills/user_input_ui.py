@@ -51,7 +51,8 @@ class UserInputWindow(QWidget):
         if self.file_path:
             payload_text += f" [Attached File Path: {self.file_path}]"
         try:
-            requests.post("http://localhost:8000/chat", json={"text": payload_text})
+            # Input requests are raised mid-conversation by the voice assistant, so answer in that session.
+            requests.post("http://localhost:8000/chat", json={"text": payload_text, "session_id": "voice"})
         except Exception:
             pass
         self.close()
\ No newline at end of file